@@ -0,0 +1,49 @@
+import logging
+import multiprocessing
+
+import pandas
+
+from benchmarks.utils import time_call, generate_categorical, generate_numerical, generate_text
+from keras_pandas.Automater import Automater
+
+
+def generate_observations(num_rows, num_numerical, num_categorical, num_text):
+    """
+    Generate a wide DataFrame, with a mix of numerical, categorical and text variables
+    """
+    columns = dict()
+    data_type_dict = {'numerical': [], 'categorical': [], 'text': []}
+    for i in range(num_numerical):
+        columns['numerical_{}'.format(i)] = generate_numerical(num_rows, seed=i)
+        data_type_dict['numerical'].append('numerical_{}'.format(i))
+    for i in range(num_categorical):
+        columns['categorical_{}'.format(i)] = generate_categorical(num_rows, cardinality=1000, seed=i)
+        data_type_dict['categorical'].append('categorical_{}'.format(i))
+    for i in range(num_text):
+        columns['text_{}'.format(i)] = generate_text(num_rows, seed=i)
+        data_type_dict['text'].append('text_{}'.format(i))
+    return pandas.DataFrame(columns), data_type_dict
+
+
+def main():
+    num_rows = 100000
+    observations, data_type_dict = generate_observations(num_rows, num_numerical=200, num_categorical=150,
+                                                         num_text=50)
+
+    # Scale from one core, up to all available cores
+    n_jobs_list = [1]
+    while n_jobs_list[-1] * 2 <= multiprocessing.cpu_count():
+        n_jobs_list.append(n_jobs_list[-1] * 2)
+
+    for n_jobs in n_jobs_list:
+        auto = Automater(data_type_dict=data_type_dict, n_jobs=n_jobs)
+        _, fit_seconds = time_call(auto.fit, observations)
+        _, transform_seconds = time_call(auto.transform, observations)
+
+        print('n_jobs: {}, num_rows: {}, num_variables: {}, fit_seconds: {:.3f}, transform_seconds: {:.3f}'.format(
+            n_jobs, num_rows, len(auto.input_vars), fit_seconds, transform_seconds))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,69 @@
+import logging
+
+import numpy
+import pandas
+from keras import Model
+from keras.layers import Dense
+
+from benchmarks.utils import time_call, generate_numerical, generate_text
+from keras_pandas.Automater import Automater
+from keras_pandas.data_types.Text import Text
+from keras_pandas.sequences import AutomaterSequence, BucketedSequence
+
+
+def generate_skewed_text(num_rows, seed=0):
+    """
+    Generate documents w/ geometrically distributed lengths, so that most documents are short and a few are long
+    """
+    random_state = numpy.random.RandomState(seed)
+    documents = generate_text(num_rows, mean_num_tokens=200, seed=seed)
+    lengths = random_state.geometric(0.05, size=num_rows)
+    return numpy.array([' '.join(document.split(' ')[:length]) for document, length in zip(documents, lengths)],
+                       dtype=object)
+
+
+def padded_steps(sequence, variable_index=0):
+    """
+    Count the sequence steps (including padding) fed to the model, over all of a sequence's batches
+    """
+    total_steps = 0
+    for index in range(len(sequence)):
+        X, _ = sequence[index]
+        total_steps += X[variable_index].size
+    return total_steps
+
+
+def train_epoch(auto, sequence):
+    x = auto.input_nub
+    x = Dense(1)(x)
+    model = Model(auto.input_layers, x)
+    model.compile(optimizer='adam', loss='mse')
+    model.fit_generator(sequence, epochs=1, verbose=0)
+
+
+def main():
+    num_rows = 5000
+    batch_size = 64
+
+    observations = pandas.DataFrame({'text': generate_skewed_text(num_rows),
+                                     'response': numpy.nan_to_num(generate_numerical(num_rows))})
+    data_type_dict = {'text': ['text'], 'numerical': ['response']}
+
+    for name, mask_padding in [('AutomaterSequence', False), ('BucketedSequence', True)]:
+        auto = Automater(data_type_dict=data_type_dict, output_var='response',
+                         datatype_handlers={'text': Text(max_vocab_size=10000, mask_padding=mask_padding)})
+        auto.fit(observations)
+
+        if mask_padding:
+            sequence = BucketedSequence(auto, observations, batch_size=batch_size, num_buckets=10, seed=0)
+        else:
+            sequence = AutomaterSequence(auto, observations, batch_size=batch_size, seed=0)
+
+        total_steps = padded_steps(sequence)
+        _, epoch_seconds = time_call(train_epoch, auto, sequence)
+        print('sequence: {}, total_steps: {}, epoch_seconds: {:.3f}'.format(name, total_steps, epoch_seconds))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
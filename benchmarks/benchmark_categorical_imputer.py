@@ -0,0 +1,32 @@
+import logging
+import tracemalloc
+
+from benchmarks.utils import time_call, generate_categorical
+from keras_pandas.transformations import CategoricalImputer
+
+
+def main():
+    num_rows = 10000000
+    cardinality = 1000
+
+    # Training data only contains half of the levels, so that the transform step has to fill unknown labels
+    train_observations = generate_categorical(num_rows, cardinality // 2, seed=0).reshape(-1, 1)
+    test_observations = generate_categorical(num_rows, cardinality, seed=1).reshape(-1, 1)
+
+    for copy in [True, False]:
+        imputer = CategoricalImputer(strategy='constant', fill_value='UNK', fill_unknown_labels=True, copy=copy)
+        imputer.fit(train_observations)
+
+        # Measure peak memory allocated during transform, relative to the memory already in use
+        tracemalloc.start()
+        _, transform_seconds = time_call(imputer.transform, test_observations.copy())
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print('copy: {}, num_rows: {}, transform_seconds: {:.3f}, transform_peak_mb: {:.1f}'.format(
+            copy, num_rows, transform_seconds, peak_bytes / 1e6))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    main()
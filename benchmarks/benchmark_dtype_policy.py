@@ -0,0 +1,32 @@
+import logging
+
+import pandas
+
+from benchmarks.utils import time_call, generate_categorical, generate_numerical, generate_text
+from keras_pandas.Automater import Automater
+
+
+def main():
+    num_rows = 200000
+
+    observations = pandas.DataFrame({'numerical_{}'.format(i): generate_numerical(num_rows, seed=i) for i in range(10)})
+    for i in range(10):
+        observations['categorical_{}'.format(i)] = generate_categorical(num_rows, cardinality=1000, seed=i)
+    observations['boolean'] = observations['numerical_0'] > 0
+    observations['text'] = generate_text(num_rows)
+    data_type_dict = {'numerical': ['numerical_{}'.format(i) for i in range(10)],
+                      'categorical': ['categorical_{}'.format(i) for i in range(10)],
+                      'boolean': ['boolean'],
+                      'text': ['text']}
+
+    for dtype_policy in [None, 'compact']:
+        auto = Automater(data_type_dict=data_type_dict, dtype_policy=dtype_policy)
+        auto.fit(observations)
+        (X, _), transform_seconds = time_call(auto.transform, observations)
+        print('dtype_policy: {}, X_bytes: {}, transform_seconds: {:.3f}'.format(
+            dtype_policy, sum(variable_X.nbytes for variable_X in X), transform_seconds))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,31 @@
+import logging
+import multiprocessing
+
+import numpy
+
+from benchmarks.utils import time_call, generate_text
+from keras_pandas.transformations import EmbeddingVectorizer
+
+
+def main():
+    num_rows = 1000000
+
+    observations = generate_text(num_rows, vocabulary_size=50000, mean_num_tokens=20).reshape(-1, 1)
+
+    # Number of tokens in the raw text (before truncation), for throughput
+    num_tokens = int(numpy.sum([len(document.split()) for document in observations[:, 0]]))
+
+    for n_jobs in sorted({1, 2, multiprocessing.cpu_count()}):
+        vectorizer = EmbeddingVectorizer(n_jobs=n_jobs)
+        _, fit_seconds = time_call(vectorizer.fit, observations)
+        transformed, transform_seconds = time_call(vectorizer.transform, observations)
+
+        print('n_jobs: {}, num_rows: {}, num_tokens: {}, max_sequence_length: {}, fit_seconds: {:.3f}, '
+              'fit_tokens_per_second: {:.0f}, transform_seconds: {:.3f}, transform_tokens_per_second: {:.0f}'.format(
+                  n_jobs, num_rows, num_tokens, vectorizer.max_sequence_length, fit_seconds, num_tokens / fit_seconds,
+                  transform_seconds, num_tokens / transform_seconds))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
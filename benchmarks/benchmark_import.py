@@ -0,0 +1,59 @@
+import json
+import logging
+import subprocess
+import sys
+
+import numpy
+
+# Modules to import, each in a fresh interpreter
+MODULES = ['keras_pandas.transformations', 'keras_pandas.inference', 'keras_pandas.serialization',
+           'keras_pandas.Automater', 'keras_pandas.layers']
+
+# Heavy frameworks, which should only be imported when needed
+FRAMEWORKS = ['keras', 'tensorflow', 'sklearn_pandas', 'gensim', 'requests']
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                   'frameworks': [framework for framework in {frameworks} if framework in sys.modules]}}))
+"""
+
+# Fit and transform, w/o using nubs, which should not import Keras
+TRANSFORM_SCRIPT = """
+import json, sys, time
+import numpy, pandas
+start = time.perf_counter()
+from keras_pandas.Automater import Automater
+observations = pandas.DataFrame({{'numerical': numpy.arange(100.), 'categorical': ['a', 'b'] * 50}})
+auto = Automater(data_type_dict={{'numerical': ['numerical'], 'categorical': ['categorical']}})
+auto.fit_transform(observations)
+print(json.dumps({{'seconds': time.perf_counter() - start,
+                   'frameworks': [framework for framework in {frameworks} if framework in sys.modules]}}))
+"""
+
+
+def run_script(script, **kwargs):
+    """
+    Run a script in a fresh interpreter, and parse the JSON it prints
+    """
+    output = subprocess.check_output([sys.executable, '-c', script.format(frameworks=FRAMEWORKS, **kwargs)])
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def main():
+    num_repeats = 5
+
+    scripts = [(module, IMPORT_SCRIPT, {'module': module}) for module in MODULES]
+    scripts.append(('Automater.fit_transform', TRANSFORM_SCRIPT, dict()))
+
+    for name, script, kwargs in scripts:
+        results = [run_script(script, **kwargs) for _ in range(num_repeats)]
+        print('name: {}, median_seconds: {:.3f}, frameworks_imported: {}'.format(
+            name, numpy.median([result['seconds'] for result in results]), results[0]['frameworks']))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
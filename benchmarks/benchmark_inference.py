@@ -0,0 +1,53 @@
+import logging
+import time
+
+import numpy
+import pandas
+
+from benchmarks.utils import generate_categorical, generate_numerical, generate_text
+from keras_pandas.Automater import Automater
+
+
+def measure_latencies(function, observations, num_calls):
+    """
+    Call `function` repeatedly, and record each call's latency. `time.perf_counter` is used, rather than `time.time`,
+    because latencies are in microseconds
+    """
+    latencies = numpy.empty(num_calls)
+    for call_index in range(num_calls):
+        start = time.perf_counter()
+        function(observations)
+        latencies[call_index] = time.perf_counter() - start
+    return latencies
+
+
+def main():
+    num_rows = 100000
+    num_calls = 1000
+
+    observations = pandas.DataFrame({'numerical_{}'.format(i): generate_numerical(num_rows, seed=i) for i in range(10)})
+    for i in range(10):
+        observations['categorical_{}'.format(i)] = generate_categorical(num_rows, cardinality=1000, seed=i)
+    observations['text'] = generate_text(num_rows)
+    data_type_dict = {'numerical': ['numerical_{}'.format(i) for i in range(10)],
+                      'categorical': ['categorical_{}'.format(i) for i in range(10)],
+                      'text': ['text']}
+
+    auto = Automater(data_type_dict=data_type_dict)
+    auto.fit(observations)
+    compiled_transform = auto.compile_transform()
+
+    for batch_size in [1, 10, 50]:
+        batch = observations.iloc[:batch_size]
+        records = batch.to_dict(orient='records')
+
+        for name, function, batch_observations in [('transform', lambda df: auto.transform(df), batch),
+                                                   ('compile_transform', compiled_transform, records)]:
+            latencies = measure_latencies(function, batch_observations, num_calls) * 1e6
+            print('method: {}, batch_size: {}, p50_microseconds: {:.0f}, p99_microseconds: {:.0f}'.format(
+                name, batch_size, numpy.percentile(latencies, 50), numpy.percentile(latencies, 99)))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,27 @@
+import logging
+
+from benchmarks.utils import time_call, generate_categorical
+from keras_pandas.transformations import LabelEncoder
+
+
+def main():
+    num_rows = 1000000
+    cardinalities = [10, 100, 1000, 10000, 100000, 1000000]
+
+    for cardinality in cardinalities:
+        # Training data only contains half of the levels, so that the transform step has to handle unseen levels
+        train_observations = generate_categorical(num_rows, max(cardinality // 2, 1), seed=0)
+        test_observations = generate_categorical(num_rows, cardinality, seed=1)
+
+        encoder = LabelEncoder()
+        _, fit_seconds = time_call(encoder.fit, train_observations)
+        _, transform_seconds = time_call(encoder.transform, test_observations)
+
+        print('cardinality: {}, num_rows: {}, fit_seconds: {:.3f}, transform_seconds: {:.3f}, '
+              'transform_rows_per_second: {:.0f}'.format(cardinality, num_rows, fit_seconds, transform_seconds,
+                                                         num_rows / transform_seconds))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.INFO)
+    main()
@@ -0,0 +1,60 @@
+import logging
+import os
+import pickle
+import shutil
+
+import pandas
+
+from benchmarks.utils import time_call, generate_categorical, generate_numerical, generate_text
+from keras_pandas import lib
+from keras_pandas.Automater import Automater
+from keras_pandas.serialization import read_bundle
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, file_name)) for file_name in os.listdir(path))
+
+
+def main():
+    num_rows = 200000
+
+    observations = pandas.DataFrame({'numerical_{}'.format(i): generate_numerical(num_rows, seed=i) for i in range(10)})
+    for i in range(10):
+        observations['categorical_{}'.format(i)] = generate_categorical(num_rows, cardinality=10000, seed=i)
+    observations['text'] = generate_text(num_rows, vocabulary_size=200000)
+    data_type_dict = {'numerical': ['numerical_{}'.format(i) for i in range(10)],
+                      'categorical': ['categorical_{}'.format(i) for i in range(10)],
+                      'text': ['text']}
+
+    auto = Automater(data_type_dict=data_type_dict)
+    auto.fit(observations)
+
+    # Keras layers can not be pickled, so the baseline pickles the Automater's fitted mapper
+    pickle_path = os.path.join(lib.get_temp_dir(), 'benchmark_serialization.pkl')
+    bundle_path = os.path.join(lib.get_temp_dir(), 'benchmark_serialization')
+    shutil.rmtree(bundle_path, ignore_errors=True)
+
+    def dump_pickle():
+        with open(pickle_path, 'wb') as pickle_file:
+            pickle.dump(auto.input_mapper, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_pickle():
+        with open(pickle_path, 'rb') as pickle_file:
+            return pickle.load(pickle_file)
+
+    _, pickle_save_seconds = time_call(dump_pickle)
+    _, bundle_save_seconds = time_call(auto.save, bundle_path)
+    _, pickle_load_seconds = time_call(load_pickle)
+    _, bundle_read_seconds = time_call(read_bundle, bundle_path)
+    _, automater_load_seconds = time_call(Automater.load, bundle_path)
+
+    print('format: pickle, bytes: {}, save_seconds: {:.3f}, load_seconds: {:.3f}'.format(
+        os.path.getsize(pickle_path), pickle_save_seconds, pickle_load_seconds))
+    print('format: bundle, bytes: {}, save_seconds: {:.3f}, load_seconds: {:.3f}, '
+          'load_seconds_w_nubs: {:.3f}'.format(directory_size(bundle_path), bundle_save_seconds, bundle_read_seconds,
+                                               automater_load_seconds))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,32 @@
+import logging
+
+import pandas
+
+from benchmarks.utils import time_call, generate_categorical
+from keras_pandas.Automater import Automater
+
+
+def main():
+    num_rows = 200000
+    num_variables = 20
+
+    # Variables from the same domain (e.g. airports), w/ the same levels
+    variables = ['airport_{}'.format(i) for i in range(num_variables)]
+    observations = pandas.DataFrame({variable: generate_categorical(num_rows, cardinality=5000, seed=i)
+                                     for i, variable in enumerate(variables)})
+
+    for name, data_type_dict in [('separate', {'categorical': variables}),
+                                 ('grouped', {'categorical': [{'airport': variables}]})]:
+        auto = Automater(data_type_dict=data_type_dict)
+        _, fit_seconds = time_call(auto.fit, observations)
+        (X, _), transform_seconds = time_call(auto.transform, observations)
+
+        # Each vocabulary is one embedding's rows
+        num_classes = sum(len(pipeline.steps[-1][1].classes_) for _, pipeline, _ in auto.input_mapper.built_features)
+        print('variables: {}, fit_seconds: {:.3f}, transform_seconds: {:.3f}, num_inputs: {}, '
+              'num_embedding_rows: {}'.format(name, fit_seconds, transform_seconds, len(X), num_classes))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
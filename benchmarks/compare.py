@@ -0,0 +1,81 @@
+"""
+Compare two benchmark suite results (from `benchmarks.suite`), and report regressions.
+
+Usage, from the repository root:
+
+    python -m benchmarks.compare benchmark_results/baseline.json benchmark_results/candidate.json --threshold 0.1
+
+Exits w/ status 1 if any benchmark is slower, or uses more memory, than the baseline by more than `threshold`.
+"""
+import argparse
+import json
+import logging
+import sys
+
+import pandas
+
+KEY_FIELDS = ['benchmark', 'phase', 'num_rows']
+
+
+def load_results(path):
+    """
+    Load a benchmark suite result file
+
+    :param path: Path to a JSON file, written by `benchmarks.suite`
+    :type path: str
+    :return: A tuple, containing the commit the results were measured at, and a DataFrame w/ one row per result
+    :rtype: (str, pandas.DataFrame)
+    """
+    with open(path) as results_file:
+        report = json.load(results_file)
+    return report.get('commit'), pandas.DataFrame(report['results'])
+
+
+def compare(baseline, candidate, threshold=0.1):
+    """
+    Compare matching results (same benchmark, phase and number of rows)
+
+    :param baseline: Baseline results, from `load_results`
+    :type baseline: pandas.DataFrame
+    :param candidate: Candidate results, from `load_results`
+    :type candidate: pandas.DataFrame
+    :param threshold: Relative increase in time or memory that is considered a regression, e.g. 0.1 for 10%
+    :type threshold: float
+    :return: A DataFrame, w/ one row per matched result, and the candidate / baseline ratio of time and peak memory
+    :rtype: pandas.DataFrame
+    """
+    comparison = pandas.merge(baseline[KEY_FIELDS + ['seconds', 'peak_bytes']],
+                              candidate[KEY_FIELDS + ['seconds', 'peak_bytes']],
+                              on=KEY_FIELDS, suffixes=('_baseline', '_candidate'))
+    comparison['seconds_ratio'] = comparison['seconds_candidate'] / comparison['seconds_baseline']
+    comparison['peak_bytes_ratio'] = comparison['peak_bytes_candidate'] / comparison['peak_bytes_baseline']
+    comparison['regression'] = ((comparison['seconds_ratio'] > 1 + threshold) |
+                                (comparison['peak_bytes_ratio'] > 1 + threshold))
+    return comparison
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Compare two keras-pandas benchmark suite results')
+    parser.add_argument('baseline', help='Path to the baseline results JSON file')
+    parser.add_argument('candidate', help='Path to the candidate results JSON file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative increase in time or memory that is considered a regression')
+    args = parser.parse_args(args)
+
+    baseline_commit, baseline = load_results(args.baseline)
+    candidate_commit, candidate = load_results(args.candidate)
+    comparison = compare(baseline, candidate, threshold=args.threshold)
+
+    print('Baseline: {}, candidate: {}'.format(baseline_commit, candidate_commit))
+    print(comparison[KEY_FIELDS + ['seconds_ratio', 'peak_bytes_ratio', 'regression']].to_string(index=False))
+
+    num_regressions = int(comparison['regression'].sum())
+    if num_regressions > 0:
+        print('Found {} regression(s), w/ threshold: {}'.format(num_regressions, args.threshold))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,210 @@
+"""
+Benchmark suite, covering every datatype handler's default transformation pipeline, and the Automater end-to-end on a
+wide, mixed schema. Fit and transform throughput and peak memory are written to a JSON file, so that results can be
+compared across commits w/ `benchmarks.compare`.
+
+Usage, from the repository root:
+
+    python -m benchmarks.suite --sizes 10000 100000 1000000 10000000 --output benchmark_results/candidate.json
+"""
+import argparse
+import copy
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from collections import OrderedDict
+
+import numpy
+import pandas
+from sklearn_pandas.pipeline import make_transformer_pipeline
+
+from benchmarks.utils import time_call, generate_boolean, generate_categorical, generate_numerical, generate_text, \
+    generate_timeseries
+from keras_pandas.Automater import Automater
+from keras_pandas.data_types.Boolean import Boolean
+from keras_pandas.data_types.Categorical import Categorical
+from keras_pandas.data_types.Numerical import Numerical
+from keras_pandas.data_types.Text import Text
+from keras_pandas.data_types.TimeSeries import TimeSeries
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+# Datatype handler, and a generator for synthetic observations, for each datatype
+DATATYPES = OrderedDict([
+    ('numerical', (Numerical, lambda num_rows, seed: generate_numerical(num_rows, seed=seed))),
+    ('categorical', (Categorical, lambda num_rows, seed: generate_categorical(num_rows, cardinality=1000, seed=seed))),
+    ('boolean', (Boolean, lambda num_rows, seed: generate_boolean(num_rows, seed=seed))),
+    ('text', (Text, lambda num_rows, seed: generate_text(num_rows, seed=seed))),
+    ('timeseries', (TimeSeries, lambda num_rows, seed: generate_timeseries(num_rows, seed=seed)))
+])
+
+# Number of variables of each datatype, for the Automater's wide, mixed schema
+WIDE_SCHEMA = OrderedDict([('numerical', 40), ('categorical', 30), ('boolean', 20), ('text', 5), ('timeseries', 5)])
+
+
+def measure(function, repeats):
+    """
+    Measure a function's wall time and peak memory. The function is timed `repeats` times, and called once more w/
+    `tracemalloc` tracing, because tracing slows down allocations.
+
+    :param function: A callable, w/o arguments. It is called `repeats + 1` times, so it should build any state it needs
+    :type function: callable
+    :param repeats: Number of timed calls. The fastest is reported, as it is the least affected by other processes
+    :type repeats: int
+    :return: A tuple, containing the fastest wall time in seconds, and the peak memory allocated, in bytes
+    :rtype: (float, int)
+    """
+    seconds = min(time_call(function)[1] for _ in range(repeats))
+
+    tracemalloc.start()
+    function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak_bytes
+
+
+def benchmark_datatype(datatype, num_rows, repeats):
+    """
+    Benchmark fitting and transforming a datatype handler's default transformation pipeline
+
+    :param datatype: A key of `DATATYPES`
+    :type datatype: str
+    :param num_rows: Number of observations
+    :type num_rows: int
+    :param repeats: Number of timed repeats
+    :type repeats: int
+    :return: A list of results, one for each phase
+    :rtype: [dict]
+    """
+    handler_class, generator = DATATYPES[datatype]
+    observations = generator(num_rows, 0).reshape(-1, 1)
+
+    def build_pipeline():
+        return make_transformer_pipeline(*map(copy.deepcopy, handler_class().default_transformation_pipeline))
+
+    fitted_pipeline = build_pipeline().fit(observations)
+
+    fit_seconds, fit_peak_bytes = measure(lambda: build_pipeline().fit(observations), repeats)
+    transform_seconds, transform_peak_bytes = measure(lambda: fitted_pipeline.transform(observations), repeats)
+
+    return [format_result(datatype, 'fit', num_rows, fit_seconds, fit_peak_bytes),
+            format_result(datatype, 'transform', num_rows, transform_seconds, transform_peak_bytes)]
+
+
+def benchmark_automater(num_rows, repeats, n_jobs=1):
+    """
+    Benchmark `Automater.fit_transform` and `Automater.transform`, on a wide, mixed schema (see `WIDE_SCHEMA`)
+
+    :param num_rows: Number of observations
+    :type num_rows: int
+    :param repeats: Number of timed repeats
+    :type repeats: int
+    :param n_jobs: Number of pipelines to run concurrently
+    :type n_jobs: int
+    :return: A list of results, one for each phase
+    :rtype: [dict]
+    """
+    columns = OrderedDict()
+    data_type_dict = OrderedDict()
+    for datatype, num_variables in WIDE_SCHEMA.items():
+        _, generator = DATATYPES[datatype]
+        data_type_dict[datatype] = list()
+        for variable_index in range(num_variables):
+            variable = '{}_{}'.format(datatype, variable_index)
+            columns[variable] = generator(num_rows, variable_index)
+            data_type_dict[datatype].append(variable)
+    observations = pandas.DataFrame(columns)
+
+    fitted_auto = Automater(data_type_dict=data_type_dict, n_jobs=n_jobs)
+    fitted_auto.fit(observations)
+
+    benchmark = 'automater_wide_n_jobs_{}'.format(n_jobs)
+    fit_transform_seconds, fit_transform_peak_bytes = measure(
+        lambda: Automater(data_type_dict=data_type_dict, n_jobs=n_jobs).fit_transform(observations), repeats)
+    transform_seconds, transform_peak_bytes = measure(lambda: fitted_auto.transform(observations), repeats)
+
+    return [format_result(benchmark, 'fit_transform', num_rows, fit_transform_seconds, fit_transform_peak_bytes),
+            format_result(benchmark, 'transform', num_rows, transform_seconds, transform_peak_bytes)]
+
+
+def format_result(benchmark, phase, num_rows, seconds, peak_bytes):
+    """
+    Format one benchmark result, for the results JSON file
+    """
+    result = OrderedDict([('benchmark', benchmark),
+                          ('phase', phase),
+                          ('num_rows', num_rows),
+                          ('seconds', seconds),
+                          ('rows_per_second', num_rows / seconds if seconds > 0 else None),
+                          ('peak_bytes', peak_bytes)])
+    logging.info('Benchmark result: {}'.format(dict(result)))
+    return result
+
+
+def environment():
+    """
+    Describe the commit and environment that results were measured in, so that results are comparable offline
+    """
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.STDOUT).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return OrderedDict([('commit', commit),
+                        ('timestamp', datetime.datetime.utcnow().isoformat()),
+                        ('python', platform.python_version()),
+                        ('platform', platform.platform()),
+                        ('cpu_count', multiprocessing.cpu_count()),
+                        ('numpy', numpy.__version__),
+                        ('pandas', pandas.__version__)])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Run the keras-pandas benchmark suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Numbers of rows to benchmark, e.g. 10000 100000 1000000 10000000')
+    parser.add_argument('--datatypes', nargs='+', default=list(DATATYPES.keys()), choices=list(DATATYPES.keys()),
+                        help='Datatype handlers to benchmark')
+    parser.add_argument('--automater-max-rows', type=int, default=1000000,
+                        help='Largest size to benchmark the Automater at, as the wide schema is memory intensive')
+    parser.add_argument('--n-jobs', type=int, default=1, help='n_jobs for the Automater benchmark')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of timed repeats, the fastest is reported')
+    parser.add_argument('--output', default=None,
+                        help='Path to the results JSON file. Defaults to benchmark_results/<commit>.json')
+    args = parser.parse_args(args)
+
+    results = list()
+    for num_rows in sorted(args.sizes):
+        for datatype in args.datatypes:
+            logging.info('Benchmarking datatype: {}, num_rows: {}'.format(datatype, num_rows))
+            results += benchmark_datatype(datatype, num_rows, args.repeats)
+
+        if num_rows <= args.automater_max_rows:
+            logging.info('Benchmarking Automater, num_rows: {}'.format(num_rows))
+            results += benchmark_automater(num_rows, args.repeats, n_jobs=args.n_jobs)
+
+    report = environment()
+    report['results'] = results
+
+    output_path = args.output
+    if output_path is None:
+        output_path = os.path.join('benchmark_results', '{}.json'.format(report['commit'] or 'unknown'))
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(output_path, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+
+    print(pandas.DataFrame(results).to_string(index=False))
+    print('Wrote results to: {}'.format(output_path))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+"""
+Helper functions for keras-pandas benchmarks
+"""
+import time
+
+import numpy
+
+
+def time_call(function, *args, **kwargs):
+    """
+    Call `function`, and measure how long it takes to run
+
+    :param function: A callable to be timed
+    :return: A tuple, containing the return value of `function`, and the wall time in seconds
+    :rtype: (object, float)
+    """
+    start = time.time()
+    result = function(*args, **kwargs)
+    elapsed_seconds = time.time() - start
+    return result, elapsed_seconds
+
+
+def generate_categorical(num_rows, cardinality, seed=0):
+    """
+    Generate a categorical column, with levels drawn uniformly from `cardinality` distinct strings
+
+    :param num_rows: Number of observations to generate
+    :type num_rows: int
+    :param cardinality: Number of distinct levels
+    :type cardinality: int
+    :param seed: Random seed, so that benchmarks are reproducible
+    :type seed: int
+    :return: A 1d object array of strings
+    :rtype: numpy.ndarray
+    """
+    random_state = numpy.random.RandomState(seed)
+    levels = numpy.array(['level_{}'.format(i) for i in range(cardinality)], dtype=object)
+    return levels[random_state.randint(0, cardinality, size=num_rows)]
+
+
+def generate_numerical(num_rows, null_fraction=0.1, seed=0):
+    """
+    Generate a numerical column, with normally distributed values and a fraction of nulls
+
+    :param num_rows: Number of observations to generate
+    :type num_rows: int
+    :param null_fraction: Fraction of observations that are null
+    :type null_fraction: float
+    :param seed: Random seed, so that benchmarks are reproducible
+    :type seed: int
+    :return: A 1d float array
+    :rtype: numpy.ndarray
+    """
+    random_state = numpy.random.RandomState(seed)
+    observations = random_state.normal(size=num_rows)
+    observations[random_state.uniform(size=num_rows) < null_fraction] = numpy.nan
+    return observations
+
+
+def generate_text(num_rows, vocabulary_size=10000, mean_num_tokens=20, seed=0):
+    """
+    Generate a text column, with documents made of tokens drawn from a Zipf-like distribution over
+    `vocabulary_size` distinct words
+
+    :param num_rows: Number of observations to generate
+    :type num_rows: int
+    :param vocabulary_size: Number of distinct tokens
+    :type vocabulary_size: int
+    :param mean_num_tokens: Average number of tokens per document
+    :type mean_num_tokens: int
+    :param seed: Random seed, so that benchmarks are reproducible
+    :type seed: int
+    :return: A 1d object array of strings
+    :rtype: numpy.ndarray
+    """
+    random_state = numpy.random.RandomState(seed)
+    vocabulary = numpy.array(['word{}'.format(_to_letters(i)) for i in range(vocabulary_size)], dtype=object)
+
+    # Zipf-like token frequencies, so that a few tokens are common and most are rare
+    frequencies = 1. / numpy.arange(1, vocabulary_size + 1)
+    frequencies = frequencies / frequencies.sum()
+
+    lengths = random_state.poisson(mean_num_tokens, size=num_rows)
+    tokens = vocabulary[random_state.choice(vocabulary_size, size=lengths.sum(), p=frequencies)]
+    offsets = numpy.concatenate([[0], numpy.cumsum(lengths)])
+    documents = [' '.join(tokens[offsets[i]:offsets[i + 1]]) for i in range(num_rows)]
+    return numpy.array(documents, dtype=object)
+
+
+def _to_letters(number):
+    """
+    Convert a number to a string of lowercase letters (e.g. 0 -> 'a', 27 -> 'bb'), so that generated tokens are
+    valid words for tokenizers that drop digits
+    """
+    letters = ''
+    while True:
+        number, remainder = divmod(number, 26)
+        letters = chr(ord('a') + remainder) + letters
+        if number == 0:
+            return letters
+
+
+def generate_boolean(num_rows, true_fraction=0.5, seed=0):
+    """
+    Generate a boolean column
+
+    :param num_rows: Number of observations to generate
+    :type num_rows: int
+    :param true_fraction: Fraction of observations that are True
+    :type true_fraction: float
+    :param seed: Random seed, so that benchmarks are reproducible
+    :type seed: int
+    :return: A 1d bool array
+    :rtype: numpy.ndarray
+    """
+    random_state = numpy.random.RandomState(seed)
+    return random_state.uniform(size=num_rows) < true_fraction
+
+
+def generate_timeseries(num_rows, mean_sequence_length=20, seed=0):
+    """
+    Generate a time series column, with variable length sequences of normally distributed values
+
+    :param num_rows: Number of observations to generate
+    :type num_rows: int
+    :param mean_sequence_length: Average number of values per sequence
+    :type mean_sequence_length: int
+    :param seed: Random seed, so that benchmarks are reproducible
+    :type seed: int
+    :return: A 1d object array of lists
+    :rtype: numpy.ndarray
+    """
+    random_state = numpy.random.RandomState(seed)
+    lengths = random_state.poisson(mean_sequence_length, size=num_rows) + 1
+    values = random_state.normal(size=lengths.sum())
+    offsets = numpy.concatenate([[0], numpy.cumsum(lengths)])
+    sequences = numpy.empty(num_rows, dtype=object)
+    sequences[:] = [values[offsets[i]:offsets[i + 1]].tolist() for i in range(num_rows)]
+    return sequences
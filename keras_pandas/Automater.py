@@ -1,16 +1,37 @@
 import copy
+import itertools
+import json
 import logging
+import os
+import numpy
 import pandas
 from functools import reduce
+from numpy.lib.format import open_memmap
 
-from keras.layers import Concatenate
-from sklearn_pandas import DataFrameMapper
+from joblib import Parallel, delayed
+from sklearn.base import clone
 
+from keras_pandas import lib
+from keras_pandas.cache import fingerprint_dataframe, fingerprint_state
 from keras_pandas.data_types.Boolean import Boolean
 from keras_pandas.data_types.Categorical import Categorical
 from keras_pandas.data_types.Numerical import Numerical
 from keras_pandas.data_types.Text import Text
 from keras_pandas.data_types.TimeSeries import TimeSeries
+from keras_pandas.inference import CompiledTransform
+from keras_pandas.profiling import profile_pipeline
+from keras_pandas.serialization import read_bundle, write_bundle
+from keras_pandas.transformations import compact_dtype
+
+
+# Number of observations retained from fit (or from the first partial_fit chunk), for creating nubs
+NUB_SAMPLE_SIZE = 1000
+
+# File name of a transformed store's manifest, from Automater.transform_to_store
+STORE_MANIFEST_NAME = 'manifest.json'
+
+# Supported output dtype policies. See Automater's dtype_policy
+DTYPE_POLICIES = [None, 'compact']
 
 
 class Automater():
@@ -22,23 +43,53 @@ class Automater():
      - A cleaned, transformed and correctly formatted X and y (good for keras, sklearn or any other ML platform)
      - An `input_nub`, without the hassle of worrying about input shapes or data types
      - An `nub`, correctly formatted for the kind of response variable provided
+
+    Keras is only imported when nubs are first used (e.g. `input_nub`), so fitting and transforming do not import it.
     """
 
-    def __init__(self, data_type_dict=dict(), output_var=None, datatype_handlers=dict()):
+    def __init__(self, data_type_dict=dict(), output_var=None, datatype_handlers=dict(), n_jobs=1,
+                 transform_cache=None, profiler=None, dtype_policy=None):
         """
-        :param data_type_dict: A dictionary, in the format {'datatype': ['variable_name_1', 'variable_name_2']}
+        :param data_type_dict: A dictionary, in the format {'datatype': ['variable_name_1', 'variable_name_2']}.
+            Variables from the same domain can be grouped, as {'group_name': ['variable_name_3', 'variable_name_4']}
+            (e.g. {'categorical': ['carrier', {'airport': ['origin_airport', 'dest_airport']}]}). Each group is
+            one Keras input, w/ one shared vocabulary and one shared embedding for all of its variables
         :type data_type_dict: {str:[str]}
         :param output_var: The name of the response variable
         :type output_var: str
         :param datatype_handlers: Any custom or external datatype handlers, in the format {'datatype': DataTypeClass}
         :type datatype_handlers: {str:class}
+        :param n_jobs: Number of variable transformation pipelines to fit and transform concurrently, in a process
+            pool. `1` runs pipelines serially, and `-1` uses all available cores
+        :type n_jobs: int
+        :param transform_cache: An optional cache of transformed variables. If provided, each variable's transformed
+            output is cached, keyed by its raw data and fitted pipeline, and only variables whose data has changed
+            are re-transformed
+        :type transform_cache: keras_pandas.cache.TransformCache
+        :param profiler: An optional profiler. If provided, the wall time, throughput and memory use of each variable's
+            transformation pipeline steps are recorded, whenever the Automater is fit or transforms
+        :type profiler: keras_pandas.profiling.Profiler
+        :param dtype_policy: The dtypes of transformed outputs. If None, each pipeline's output dtype is kept (e.g.
+            `int64` indices and `float64` numerics). If `'compact'`, outputs are cast to the narrowest dtype Keras
+            can use w/o losing information: `int16` or `int32` indices (sized from each variable's largest index),
+            `float32` numerics and `uint8` booleans. See `transformations.compact_dtype`
+        :type dtype_policy: str
         """
 
         # Dictionary of the format {'datatype': ['variable_name_1', 'variable_name_2']}
         self.datatype_variable_dict = data_type_dict
 
-        # Set up a list of all input variables
-        self.input_vars = copy.copy(reduce(lambda x, y: x + y, self.datatype_variable_dict.values()))
+        # Dictionary of the format {'group_name': ['variable_name_3', 'variable_name_4']}. Each group is transformed
+        # and fed to Keras as one variable, w/ one column for each of its variables
+        self.variable_groups = dict()
+        for variable_list in self.datatype_variable_dict.values():
+            for variable in variable_list:
+                if isinstance(variable, dict):
+                    self.variable_groups.update(variable)
+
+        # Set up a list of all input variables (and groups)
+        self.input_vars = copy.copy(reduce(lambda x, y: x + y, map(self._variable_names,
+                                                                   self.datatype_variable_dict.values())))
 
         # If there's an output_var, remove it from from input_vars
         if (output_var is not None) and (output_var in self.input_vars):
@@ -48,6 +99,20 @@ class Automater():
         self.output_var = output_var
         self.supervised = self.output_var is not None
 
+        # Set up parallelism
+        self.n_jobs = n_jobs
+
+        # Set up caching. Pipeline fingerprints are computed lazily, and reset whenever pipelines are (re)fit
+        self.transform_cache = transform_cache
+        self._pipeline_fingerprints = dict()
+
+        # Set up profiling
+        self.profiler = profiler
+
+        # Set up output dtypes. Each variable's compact dtype is determined when the Automater is fit
+        self.dtype_policy = dtype_policy
+        self.variable_dtypes = None
+
         # Set up datatype handlers
         self.datatype_handlers = {'numerical': Numerical(),
                                   'categorical': Categorical(),
@@ -61,7 +126,7 @@ class Automater():
         # Dictionary of the format {'variable_name_1': DataTypeClass}
         self.variable_datatype_dict = dict()
         for datatype_name, variable_list in self.datatype_variable_dict.items():
-            for variable in variable_list:
+            for variable in self._variable_names(variable_list):
                 if datatype_name in self.datatype_handlers:
                     handler = self.datatype_handlers.get(datatype_name, None)
                     self.variable_datatype_dict[variable] = handler
@@ -78,22 +143,57 @@ class Automater():
 
         # Attributes
         self.fitted = False
-        self.input_layers = None
-        self.input_nub = None
-        self.output_nub = None
+        self.input_variable_slices = None
+        self.output_variable_slices = None
+
+        # Nubs are created lazily, from transformed samples, when first used
+        self._input_layers = None
+        self._input_nub = None
+        self._output_nub = None
+        self._nub_arrays = None
+
+        # Incremental fitting state, from partial_fit
+        self._partial_fit_started = False
+        self._partial_fit_sample = None
 
         # Exit checks
         self._valid_configurations_check()
 
+    @property
+    def input_layers(self):
+        """
+        A list, containing one Keras Input layer for each input variable. None if the Automater has not been fit
+        """
+        self._build_nubs()
+        return self._input_layers
+
+    @property
+    def input_nub(self):
+        """
+        A Keras layer, joining every input variable's nub. None if the Automater has not been fit
+        """
+        self._build_nubs()
+        return self._input_nub
+
+    @property
+    def output_nub(self):
+        """
+        A Keras layer, formatted for the output_var. None if the Automater has not been fit, or is not supervised
+        """
+        self._build_nubs()
+        return self._output_nub
+
     def fit(self, observations):
         """
 
          - Fit input mapper
-         - Create input layer and nub
          - Create output mapper (if supervised)
-         - Create output nub (if supervised)
+         - Index each variable's transformed columns, and prepare to create input and output nubs on first use
         - Set `self.fitted` to `True`
 
+        Nubs are created from a sample of observations, plus rows containing each index encoded variable's largest
+        encoding (see `finalize_fit`).
+
         :param observations: A pandas DataFrame, containing the relevant variables
         :type observations: pandas.DataFrame
         :return: self, now in a fitted state. The Automater now has initialized input layers, output layer(s) (if
@@ -102,27 +202,112 @@ class Automater():
         """
         # Setup checks
         self._check_input_df(observations)
+        self._partial_fit_started = False
+        self._pipeline_fingerprints = dict()
 
-        # Fit input mapper, and transform data for layer creation
-        input_observations_transformed = self.input_mapper.fit_transform(observations)
+        # Fit input and output mappers
+        self._fit_mapper(self.input_mapper, observations)
+        if self.supervised:
+            self._fit_mapper(self.output_mapper, observations)
 
-        # Create input layer and nub
+        # Prepare input and output nubs
+        self._create_nubs(observations.iloc[:NUB_SAMPLE_SIZE], append_exemplars=True)
 
-        input_layers, input_nub = self._create_input_nub(input_observations_transformed)
-        self.input_layers = input_layers
-        self.input_nub = input_nub
+        # Update fitted to True
+        self.fitted = True
+        return self
+
+    def partial_fit(self, observations):
+        """
+        Incrementally fit the transformation pipelines w/ one chunk of observations. This allows fitting on data sets
+        that are larger than memory. Each transformer accumulates running statistics (e.g. means and variances, level
+        counts, token counts, and sequence lengths) across chunks.
 
+        The first call starts a new fit, discarding any previous fit. After the last chunk, call `finalize_fit` to
+        create the input and output nubs, before transforming. `fit_stream` does both.
+
+        Because chunks are fed through a pipeline's earlier steps as they are fit, later steps see the earlier steps'
+        statistics as of that chunk. For example, `StandardScaler` sees missing values imputed w/ `MeanImputer`'s
+        running mean, rather than the final mean, so numerical variables w/ missing values are scaled slightly
+        differently than by `fit` (w/ 1 in 7 values missing, and chunks of 100 observations, standardized values
+        typically differ by less than 0.05). Variables w/o missing values match `fit`.
+
+        :param observations: A chunk of observations, containing the relevant variables
+        :type observations: pandas.DataFrame
+        :return: self
+        :rtype: Automater
+        """
+        self._check_input_df(observations)
+
+        if not self._partial_fit_started:
+            logging.info('Starting partial fit')
+            self._build_features(self.input_mapper)
+            if self.supervised:
+                self._build_features(self.output_mapper)
+            self._partial_fit_started = True
+            self._partial_fit_sample = None
+
+        # Partially fit pipelines must be finalized before transforming
+        self.fitted = False
+        self._partial_fit_mapper(self.input_mapper, observations)
         if self.supervised:
-            # Fit output mapper, and transform data for layer creation
-            output_transformed_dataframe = self.output_mapper.fit_transform(observations, )
+            self._partial_fit_mapper(self.output_mapper, observations)
+        self._pipeline_fingerprints = dict()
 
-            # Create output nub
-            self.output_nub = self._create_output_nub(output_transformed_dataframe)
+        # Retain a small sample of observations, for creating nubs
+        if self._partial_fit_sample is None and observations.shape[0] > 0:
+            self._partial_fit_sample = observations.iloc[:NUB_SAMPLE_SIZE].copy()
 
-        # Update fitted to True
+        return self
+
+    def finalize_fit(self):
+        """
+        Finalize each transformer's `partial_fit` state (e.g. `EmbeddingVectorizer.finalize_partial_fit`), prepare the
+        input and output nubs after one or more calls to `partial_fit`, and set `self.fitted` to `True`.
+
+        Nubs are created (when first used) from a sample of the first chunk, plus rows containing each index encoded
+        variable's largest encoding (e.g. the last `LabelEncoder` class), so that embeddings and output layers are
+        sized for all levels seen in any chunk.
+
+        :return: self, now in a fitted state
+        :rtype: Automater
+        """
+        if not self._partial_fit_started or self._partial_fit_sample is None:
+            raise AssertionError('Automater.partial_fit() has not been called w/ any observations. Please call to '
+                                 'Automater.partial_fit() before Automater.finalize_fit()')
+
+        # Incorporate every transformer's pending partial_fit chunks (e.g. rebuild vocabularies), so that compiling
+        # and exporting never change fitted state
+        for mapper in [self.input_mapper] + ([self.output_mapper] if self.supervised else []):
+            for _, pipeline, _ in mapper.built_features:
+                for _, transformer in pipeline.steps:
+                    if hasattr(transformer, 'finalize_partial_fit'):
+                        transformer.finalize_partial_fit()
+
+        self._create_nubs(self._partial_fit_sample, append_exemplars=True)
+        self._pipeline_fingerprints = dict()
         self.fitted = True
         return self
 
+    def fit_stream(self, chunks):
+        """
+        Fit on an iterable of DataFrames, one chunk at a time, w/ `partial_fit`, and then `finalize_fit`. Only one
+        chunk is held in memory at once.
+
+        For example, `chunks` could be `pandas.read_csv(path, chunksize=100000)`.
+
+        :param chunks: An iterable of pandas DataFrames, each containing the relevant variables
+        :type chunks: iterable of pandas.DataFrame
+        :return: self, now in a fitted state
+        :rtype: Automater
+        """
+        self._partial_fit_started = False
+        for chunk_index, chunk in enumerate(chunks):
+            logging.debug('Partially fitting chunk: {}, with {} observations'.format(chunk_index, chunk.shape[0]))
+            self.partial_fit(chunk)
+
+        return self.finalize_fit()
+
     def transform(self, observations, df_out=False):
         """
          - Transform the keras input columns
@@ -143,47 +328,295 @@ class Automater():
         self._check_fitted()
         self._check_input_df(observations)
 
-        # Transform input variables
-        input_observations_transformed = self.input_mapper.transform(observations)
-
-        # Transform output_var if supervised and available
-        if self.supervised and self.output_var in observations:
-            # Transform output variable
-            output_observations_transformed = self.output_mapper.transform(observations)
-        else:
-            output_observations_transformed = None
+        # Whether to transform output_var (if supervised and available)
+        transform_output = self.supervised and self.output_var in observations
 
         # Format data and return
         if df_out:
             # Return correctly formatted DF
-            if output_observations_transformed is not None:
+            input_observations_transformed = self._transform_mapper(self.input_mapper, observations)
+            if transform_output:
+                output_observations_transformed = self._transform_mapper(self.output_mapper, observations)
                 output = pandas.concat([input_observations_transformed, output_observations_transformed], axis=1)
             else:
                 output = input_observations_transformed
             return output
         else:
-            # Return correctly formatted Numpy objects as X, y
+            # Return correctly formatted Numpy objects as X, y. Each variable's pipeline output is placed directly in
+            # X, w/o building an intermediate DataFrame
 
             # Format X as a list of arrays, consistent w/ Keras's input formatting
-            X = list()
-            for variable in self.input_vars:
-                logging.info('Adding keras input variable: {} to X'.format(variable))
-                if variable in input_observations_transformed.columns:
-                    data = input_observations_transformed[variable].values
-                else:
-                    logging.info('Checking for derived variables')
-                    variable_name_prefix = variable + '_'
-                    derived_variable_list = list(filter(lambda x: x.startswith(variable_name_prefix),
-                                                        input_observations_transformed.columns))
-                    logging.debug('Derived variable list: {}'.format(derived_variable_list))
-                    data = input_observations_transformed[derived_variable_list].values
-                X.append(data)
-
-            if output_observations_transformed is not None:
-                return X, output_observations_transformed[self.output_var].values
+            X = self._format_arrays(self.input_mapper, self.input_variable_slices,
+                                    self._compact_arrays(self.input_mapper,
+                                                         self._transform_arrays(self.input_mapper, observations)))
+
+            if transform_output:
+                y = self._format_arrays(self.output_mapper, self.output_variable_slices,
+                                        self._compact_arrays(self.output_mapper,
+                                                             self._transform_arrays(self.output_mapper,
+                                                                                    observations)))[0]
+                return X, y
             else:
                 return X, None
 
+    def transform_chunks(self, chunks, df_out=False):
+        """
+        Transform an iterable of DataFrames, one chunk at a time. Only one chunk (and its transformed output) is held
+        in memory at once, so this can be used for data sets that are larger than memory.
+
+        For example, `chunks` could be `pandas.read_csv(path, chunksize=100000)`, or a generator over parquet row
+        groups, such as `(parquet_file.read_row_group(i).to_pandas() for i in range(parquet_file.num_row_groups))`.
+
+        :param chunks: An iterable of pandas DataFrames, each containing all keras input layers
+        :type chunks: iterable of pandas.DataFrame
+        :param df_out: Whether to yield Pandas DataFrames. See `transform` for details
+        :type df_out: bool
+        :return: A generator, yielding the output of `transform` for each chunk (`(X, y)` tuples, if
+            `df_out = False`)
+        """
+        # Check here, rather than in the generator, so that unfitted Automaters fail when called, not when iterated
+        self._check_fitted()
+        return self._transform_chunks(chunks, df_out=df_out)
+
+    def _transform_chunks(self, chunks, df_out=False):
+        for chunk_index, chunk in enumerate(chunks):
+            logging.debug('Transforming chunk: {}, with {} observations'.format(chunk_index, chunk.shape[0]))
+            yield self.transform(chunk, df_out=df_out)
+
+    def transform_iter(self, observations, chunk_size=10000, df_out=False):
+        """
+        Transform `observations` in chunks of `chunk_size` rows. This bounds the peak memory used by the
+        transformation pipelines to one chunk at a time.
+
+        :param observations: A pandas dataframe, containing all keras input layers
+        :type observations: pandas.DataFrame
+        :param chunk_size: The maximum number of observations in each chunk
+        :type chunk_size: int
+        :param df_out: Whether to yield Pandas DataFrames. See `transform` for details
+        :type df_out: bool
+        :return: A generator, yielding the output of `transform` for each chunk (`(X, y)` tuples, if
+            `df_out = False`)
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be a positive integer, got: {}'.format(chunk_size))
+
+        chunks = (observations.iloc[start:start + chunk_size] for start in range(0, observations.shape[0], chunk_size))
+        return self.transform_chunks(chunks, df_out=df_out)
+
+    def transform_to_store(self, observations, path, chunk_size=10000):
+        """
+        Transform observations, and write `X` and `y` to a directory of `.npy` files, w/ a JSON manifest. Observations
+        are transformed in chunks of `chunk_size` rows (see `transform_iter`), and written directly into memory mapped
+        files, so the full transformed data set is never held in memory.
+
+        The store can be reloaded w/ `Automater.load_store`, w/o re-transforming. The store is written into a temporary
+        directory, and then moved to `path` (replacing any existing store), so incomplete stores are never loaded.
+
+        :param observations: A pandas dataframe, containing all keras input layers
+        :type observations: pandas.DataFrame
+        :param path: Path to a directory, which will be created (or replaced, if it exists)
+        :type path: str
+        :param chunk_size: The maximum number of observations to transform at once
+        :type chunk_size: int
+        :return: The path to the store's manifest
+        :rtype: str
+        """
+        self._check_fitted()
+
+        # Transform the first chunk, to determine each array's dtype and shape
+        batches = self.transform_iter(observations, chunk_size=chunk_size)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            first_batch = self.transform(observations)
+        batch_X, batch_y = first_batch
+
+        # Write into a staged directory, which replaces any existing store only once every file is complete
+        num_observations = observations.shape[0]
+        with lib.staged_directory(path) as staged_path:
+            # Create one memory mapped file for each entry of X, and for y
+            X_entries = list()
+            X_arrays = list()
+            for variable, variable_X in zip(self.input_vars, batch_X):
+                entry = {'variable': variable, 'file': 'X_{}.npy'.format(len(X_entries))}
+                X_arrays.append(self._open_store_array(staged_path, entry, variable_X, num_observations))
+                X_entries.append(entry)
+
+            y_entry = None
+            y_array = None
+            if batch_y is not None:
+                y_entry = {'variable': self.output_var, 'file': 'y.npy'}
+                y_array = self._open_store_array(staged_path, y_entry, batch_y, num_observations)
+
+            # Write each chunk into its rows
+            start = 0
+            for batch_X, batch_y in itertools.chain([(batch_X, batch_y)], batches):
+                stop = min(start + chunk_size, num_observations)
+                for array, variable_X in zip(X_arrays, batch_X):
+                    array[start:stop] = variable_X
+                if y_array is not None:
+                    y_array[start:stop] = batch_y
+                start = stop
+
+            for array in X_arrays + [y_array]:
+                if array is not None:
+                    array.flush()
+
+            manifest = {'num_observations': num_observations, 'X': X_entries, 'y': y_entry}
+            with open(os.path.join(staged_path, STORE_MANIFEST_NAME), 'w') as manifest_file:
+                json.dump(manifest, manifest_file, indent=2)
+
+        manifest_path = os.path.join(path, STORE_MANIFEST_NAME)
+        logging.info('Wrote transformed store w/ {} observations to: {}'.format(num_observations, path))
+
+        return manifest_path
+
+    @staticmethod
+    def load_store(path, mmap_mode='r'):
+        """
+        Load `X` and `y` from a store written by `transform_to_store`. Arrays are memory mapped, rather than read into
+        memory, so loading is nearly instant, and processes loading the same store share pages.
+
+        :param path: Path to a store's directory
+        :type path: str
+        :param mmap_mode: Memory map mode, passed to `numpy.load`. `'r'` is read only, and `'c'` is copy on write
+        :type mmap_mode: str
+        :return: `(X, y)`, in the same format as `transform`. `y` is None if the store does not contain the
+            output_var
+        :rtype: ([numpy.memmap], numpy.memmap)
+        """
+        manifest_path = os.path.join(path, STORE_MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            raise ValueError('No transformed store manifest at: {}'.format(manifest_path))
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        X = [numpy.load(os.path.join(path, entry['file']), mmap_mode=mmap_mode) for entry in manifest['X']]
+        y = None
+        if manifest['y'] is not None:
+            y = numpy.load(os.path.join(path, manifest['y']['file']), mmap_mode=mmap_mode)
+        return X, y
+
+    @staticmethod
+    def _open_store_array(path, entry, example, num_observations):
+        """
+        Create a memory mapped `.npy` file, w/ `num_observations` rows and the same dtype and row shape as `example`.
+        The entry is updated w/ the array's dtype and shape, for the store's manifest.
+        """
+        shape = (num_observations,) + tuple(example.shape[1:])
+        entry['dtype'] = str(example.dtype)
+        entry['shape'] = list(shape)
+        return open_memmap(os.path.join(path, entry['file']), mode='w+', dtype=example.dtype, shape=shape)
+
+    def compile_transform(self):
+        """
+        Compile the fitted input pipelines into a lightweight callable, for low latency transformation of small batches
+        (e.g. single rows, for online scoring). The callable takes a dict of columns, or a list of records, and returns
+        the same `X` as `transform`, w/o building DataFrames. See `inference.CompiledTransform`
+
+        :return: A callable, which transforms observations into Keras-ready inputs
+        :rtype: keras_pandas.inference.CompiledTransform
+        """
+        self._check_fitted()
+        return CompiledTransform(self)
+
+    def export_preprocessing_model(self, model=None):
+        """
+        Export the fitted input pipelines as Keras layers (see `layers`), so that preprocessing runs inside the model
+        graph, w/o pandas or sklearn in the serving process. The exported model has one raw input for each input
+        variable, w/ shape `(1,)`: a string input for variables whose pipeline begins w/ a string conversion (e.g.
+        `Categorical` and `Text`, which should be fed `str(value)`), and a float input otherwise.
+
+        :param model: An optional model, built on `input_layers`. If provided, the preprocessing layers are prepended
+            to it, and the combined model is returned
+        :type model: keras.Model
+        :return: A model, from raw inputs to either Keras-ready inputs (consistent w/ `transform`), or `model`'s outputs
+        :rtype: keras.Model
+        """
+        from keras import Model
+        from keras import backend as K
+
+        from keras_pandas.layers import TypeConversion, export_pipeline, initialize_tables
+
+        self._check_fitted()
+
+        raw_inputs = list()
+        preprocessed = list()
+        for (columns, pipeline, options), input_layer in zip(self.input_mapper.built_features, self.input_layers):
+            variable = options.get('alias', '_'.join(columns))
+            raw_input, x = export_pipeline(pipeline, variable, num_columns=len(columns))
+
+            # Match the dtype of the variable's input layer
+            x = TypeConversion(K.dtype(input_layer), name=lib.namespace_conversion('cast_{}'.format(variable)))(x)
+            raw_inputs.append(raw_input)
+            preprocessed.append(x)
+
+        # Lookup tables are not variables, so they are not initialized by Keras
+        initialize_tables()
+
+        if model is None:
+            return Model(raw_inputs, preprocessed)
+        return Model(raw_inputs, model(preprocessed))
+
+    def save(self, path):
+        """
+        Save the fitted Automater to a directory, in a compact, array backed format (see `serialization`).
+        Vocabularies are written as string tables, and scaler parameters as float arrays, rather than pickled.
+
+        The Automater can be reloaded w/ `Automater.load`, w/o re-fitting. Caches and profilers are not saved.
+
+        :param path: Path to a directory, which will be created (or replaced, if it exists)
+        :type path: str
+        :return: The path to the saved Automater's manifest
+        :rtype: str
+        """
+        self._check_fitted()
+
+        state = {'data_type_dict': self.datatype_variable_dict,
+                 'output_var': self.output_var,
+                 'n_jobs': self.n_jobs,
+                 'dtype_policy': self.dtype_policy,
+                 'variable_dtypes': self.variable_dtypes,
+                 'datatype_handlers': {datatype: self.datatype_handlers[datatype]
+                                       for datatype in self.datatype_variable_dict.keys()},
+                 'input_features': self._get_feature_state(self.input_mapper),
+                 'input_variable_slices': self.input_variable_slices}
+        if self.supervised:
+            state['output_features'] = self._get_feature_state(self.output_mapper)
+            state['output_variable_slices'] = self.output_variable_slices
+
+        return write_bundle(path, state)
+
+    @staticmethod
+    def load(path, mmap_mode='r'):
+        """
+        Load an Automater saved by `save`. Large arrays are memory mapped, rather than read into memory, and the input
+        and output nubs are re-created from the fitted pipelines, w/o observations.
+
+        :param path: Path to a saved Automater's directory
+        :type path: str
+        :param mmap_mode: Memory map mode for large arrays, passed to `numpy.load`. `'r'` is read only, `'c'` is copy
+            on write, and None reads arrays into memory
+        :type mmap_mode: str
+        :return: A fitted Automater
+        :rtype: Automater
+        """
+        state = read_bundle(path, mmap_mode=mmap_mode)
+
+        auto = Automater(data_type_dict=state['data_type_dict'], output_var=state['output_var'],
+                         datatype_handlers=state['datatype_handlers'], n_jobs=state['n_jobs'],
+                         dtype_policy=state.get('dtype_policy'))
+        auto.variable_dtypes = state.get('variable_dtypes')
+        auto._set_feature_state(auto.input_mapper, state['input_features'])
+        auto.input_variable_slices = state['input_variable_slices']
+        if auto.supervised:
+            auto._set_feature_state(auto.output_mapper, state['output_features'])
+            auto.output_variable_slices = state['output_variable_slices']
+
+        auto._restore_nubs()
+        auto.fitted = True
+        logging.info('Loaded fitted Automater from: {}'.format(path))
+        return auto
+
     def fit_transform(self, observations):
         """
         Perform a `fit`, and then a `transform`. See `transform` for return documentation
@@ -240,6 +673,103 @@ class Automater():
 
         pass
 
+    def _create_nubs(self, observations, append_exemplars=False):
+        """
+        Transform observations w/ the fitted mappers, index each variable's transformed columns, and prepare to create
+        the input and output nubs (see `_prepare_nubs`)
+
+        :param observations: A pandas DataFrame, containing the relevant variables
+        :type observations: pandas.DataFrame
+        :param append_exemplars: Whether to append rows containing each variable's largest encoding, before creating
+            nubs. See `_append_exemplars`
+        :type append_exemplars: bool
+        :return: None
+        """
+        # Transform data for layer creation, and index each variable's columns in the transformed data, for
+        # formatting X w/o an intermediate DataFrame
+        input_arrays = self._transform_arrays(self.input_mapper, observations, use_cache=False)
+        self.input_variable_slices = self._create_variable_slices(self.input_mapper, input_arrays)
+
+        output_arrays = None
+        if self.supervised:
+            output_arrays = self._transform_arrays(self.output_mapper, observations, use_cache=False)
+            self.output_variable_slices = self._create_variable_slices(self.output_mapper, output_arrays)
+
+        # Determine each variable's output dtype, from its fitted pipeline and transformed sample
+        self.variable_dtypes = None
+        if self.dtype_policy is not None:
+            self.variable_dtypes = self._create_variable_dtypes(self.input_mapper, input_arrays)
+            if self.supervised:
+                self.variable_dtypes.update(self._create_variable_dtypes(self.output_mapper, output_arrays))
+
+        self._prepare_nubs(input_arrays, output_arrays, append_exemplars=append_exemplars)
+
+    def _restore_nubs(self):
+        """
+        Prepare to re-create the input and output nubs from the fitted mappers and variable slices, w/o observations
+        (e.g. after `load`). Each variable's transformed data is stood in for by a row of zeros, w/ the variable's
+        transformed width, and its exemplars (see `_append_exemplars`)
+
+        :return: None
+        """
+        input_arrays = self._placeholder_arrays(self.input_mapper, self.input_variable_slices)
+        output_arrays = None
+        if self.supervised:
+            output_arrays = self._placeholder_arrays(self.output_mapper, self.output_variable_slices)
+
+        self._prepare_nubs(input_arrays, output_arrays, append_exemplars=True)
+
+    def _prepare_nubs(self, input_arrays, output_arrays, append_exemplars=False):
+        """
+        Retain transformed samples, from the output of `_transform_arrays`, for creating the input and output nubs when
+        they are first used (see `_build_nubs`). Any previously created nubs are discarded
+
+        :param input_arrays: The input mapper's transformed arrays
+        :type input_arrays: [numpy.ndarray]
+        :param output_arrays: The output mapper's transformed arrays, or None if the Automater is not supervised
+        :type output_arrays: [numpy.ndarray]
+        :param append_exemplars: Whether to append rows containing each variable's largest encoding, before creating
+            nubs. See `_append_exemplars`
+        :type append_exemplars: bool
+        :return: None
+        """
+        if append_exemplars:
+            input_arrays = self._append_exemplars(self.input_mapper, input_arrays)
+            if self.supervised:
+                output_arrays = self._append_exemplars(self.output_mapper, output_arrays, enumerate_levels=True)
+
+        self._nub_arrays = (input_arrays, output_arrays)
+        self._input_layers = None
+        self._input_nub = None
+        self._output_nub = None
+
+    def _build_nubs(self):
+        """
+        Create the input and output nubs from the samples retained by `_prepare_nubs`, if they have not been created
+        yet. This is the first point at which Keras is imported
+
+        :return: None
+        """
+        if self._nub_arrays is None:
+            return
+        input_arrays, output_arrays = self._nub_arrays
+
+        input_observations_transformed = self._format_dataframe(self.input_mapper,
+                                                                pandas.RangeIndex(len(input_arrays[0])), input_arrays)
+
+        # Create input layer and nub
+        self._input_layers, self._input_nub = self._create_input_nub(input_observations_transformed)
+
+        if self.supervised:
+            output_transformed_dataframe = self._format_dataframe(self.output_mapper,
+                                                                  pandas.RangeIndex(len(output_arrays[0])),
+                                                                  output_arrays)
+
+            # Create output nub
+            self._output_nub = self._create_output_nub(output_transformed_dataframe)
+
+        self._nub_arrays = None
+
     def _create_input_nub(self, transformed_observations):
         """
         Generate a nub, appropriate for feeding all input variables into a Keras model. Each input variable has one
@@ -255,6 +785,8 @@ class Automater():
         :return: A Keras layer, which can be fed into future layers
         :rtype: ([keras,Input], Layer)
         """
+        from keras.layers import Concatenate
+
         # Initialize input_layer_list
         input_layer_list = list()
 
@@ -307,6 +839,8 @@ class Automater():
         return output_nub
 
     def _create_mapper(self, variable_list):
+        from sklearn_pandas import DataFrameMapper
+
         transformation_list = list()
         logging.info('Creating mapper for variables: {}'.format(variable_list))
         for variable in variable_list:
@@ -317,8 +851,18 @@ class Automater():
             # Copy the default pipeline, so each variable has its own learned parameters
             variable_pipeline = list(map(copy.deepcopy, default_pipeline))
 
-            # Add to the aggregator
-            transformation_list.append(([variable], variable_pipeline))
+            # Add to the aggregator. Groups read each of their variables' columns, and datatypes may read additional
+            # columns (e.g. grouping and ordering keys), in which case the feature is aliased to the variable's name
+            if variable in self.variable_groups:
+                columns = list(self.variable_groups[variable])
+            elif hasattr(datatype, 'input_columns'):
+                columns = datatype.input_columns(variable)
+            else:
+                columns = [variable]
+            if columns == [variable]:
+                transformation_list.append((columns, variable_pipeline))
+            else:
+                transformation_list.append((columns, variable_pipeline, {'alias': variable}))
 
             logging.info('Creating transformation pipeline for variable: {}, '
                          'with datatype: {} and transformation_list: '
@@ -329,6 +873,381 @@ class Automater():
         mapper = DataFrameMapper(transformation_list, df_out=True)
         return mapper
 
+    def _fit_mapper(self, mapper, observations):
+        """
+        Fit the mapper's transformation pipelines. If `n_jobs` is not 1, each variable's pipeline is fit concurrently,
+        in a separate process.
+
+        :param mapper: An unfitted mapper, from `_create_mapper`
+        :type mapper: DataFrameMapper
+        :param observations: A pandas DataFrame, containing the mapper's variables
+        :type observations: pandas.DataFrame
+        :return: The fitted mapper
+        :rtype: DataFrameMapper
+        """
+        if self.n_jobs == 1 and self.profiler is None:
+            return mapper.fit(observations)
+
+        built_features = self._build_features(mapper)
+
+        # Fit pipelines (in worker processes, if n_jobs is not 1). Fitted copies are returned in the same order as
+        # built_features
+        logging.info('Fitting {} transformation pipelines, with n_jobs: {}'.format(len(built_features), self.n_jobs))
+        fitted_pipelines = self._run_pipelines('fit', built_features, observations)
+
+        mapper.built_features = [(columns, fitted_pipeline, options) for (columns, _, options), fitted_pipeline
+                                 in zip(built_features, fitted_pipelines)]
+        return mapper
+
+    def _partial_fit_mapper(self, mapper, observations):
+        """
+        Incrementally fit the mapper's transformation pipelines w/ one chunk of observations. If `n_jobs` is not 1,
+        each variable's pipeline is fit concurrently, in a separate process.
+
+        :param mapper: A mapper, w/ pipelines from `_build_features`
+        :type mapper: DataFrameMapper
+        :param observations: A pandas DataFrame, containing the mapper's variables
+        :type observations: pandas.DataFrame
+        :return: The partially fitted mapper
+        :rtype: DataFrameMapper
+        """
+        fitted_pipelines = self._run_pipelines('partial_fit', mapper.built_features, observations)
+
+        mapper.built_features = [(columns, fitted_pipeline, options) for (columns, _, options), fitted_pipeline
+                                 in zip(mapper.built_features, fitted_pipelines)]
+        return mapper
+
+    @staticmethod
+    def _build_features(mapper):
+        """
+        Build new pipelines for each of the mapper's features, in the same format as `DataFrameMapper.fit`. Each
+        transformer is cloned, so the pipelines do not carry state from a previous fit
+
+        :param mapper: A mapper, from `_create_mapper`
+        :type mapper: DataFrameMapper
+        :return: The mapper's built features, a list of (columns, pipeline, options) tuples
+        :rtype: list
+        """
+        from sklearn_pandas.pipeline import make_transformer_pipeline
+
+        built_features = list()
+        for feature in mapper.features:
+            columns, transformers = feature[:2]
+            options = feature[2] if len(feature) > 2 else dict()
+            built_features.append((columns, make_transformer_pipeline(*map(clone, transformers)), options))
+
+        mapper.built_features = built_features
+        mapper.built_default = False
+        return built_features
+
+    @staticmethod
+    def _get_feature_state(mapper):
+        """
+        Describe the mapper's fitted features, for `save`. Each pipeline is described by its steps, rather than
+        pickled, so that its transformers can be written in an array backed format
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :return: A list, containing one dictionary for each of the mapper's features
+        :rtype: [dict]
+        """
+        return [{'columns': list(columns), 'steps': [list(step) for step in pipeline.steps], 'options': options}
+                for columns, pipeline, options in mapper.built_features]
+
+    @staticmethod
+    def _set_feature_state(mapper, feature_state):
+        """
+        Restore the mapper's fitted features, from the output of `_get_feature_state`
+
+        :param mapper: A mapper, from `_create_mapper`
+        :type mapper: DataFrameMapper
+        :param feature_state: The output of `_get_feature_state`
+        :type feature_state: [dict]
+        :return: The mapper's built features, a list of (columns, pipeline, options) tuples
+        :rtype: list
+        """
+        from sklearn_pandas.pipeline import TransformerPipeline
+
+        built_features = list()
+        for feature in feature_state:
+            pipeline = TransformerPipeline([tuple(step) for step in feature['steps']])
+            built_features.append((feature['columns'], pipeline, feature['options']))
+
+        mapper.built_features = built_features
+        mapper.built_default = False
+        return built_features
+
+    @staticmethod
+    def _placeholder_arrays(mapper, variable_slices):
+        """
+        Create one row of zeros for each of the mapper's features, w/ the same width as the feature's transformed
+        data, in the same format as `_transform_arrays`
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param variable_slices: The output of `_create_variable_slices`, from when the mapper was fit
+        :type variable_slices: {str: slice}
+        :return: A list, containing one array for each of the mapper's features
+        :rtype: [numpy.ndarray]
+        """
+        placeholders = list()
+        for columns, _, options in mapper.built_features:
+            variable_slice = variable_slices[options.get('alias', '_'.join(columns))]
+            placeholders.append(numpy.zeros((1, variable_slice.stop - variable_slice.start)))
+        return placeholders
+
+    def _transform_arrays(self, mapper, observations, use_cache=True):
+        """
+        Transform observations with a fitted mapper, returning each variable's pipeline output. If `n_jobs` is not 1,
+        each variable's pipeline is run concurrently, in a separate process. Outputs are always in the same order as
+        the mapper's features.
+
+        If there is a `transform_cache`, each variable's output is looked up by the fingerprint of its raw data and
+        fitted pipeline, and only variables that are not cached are transformed.
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param observations: A pandas DataFrame, containing the mapper's variables
+        :type observations: pandas.DataFrame
+        :param use_cache: Whether to use the `transform_cache`, if there is one
+        :type use_cache: bool
+        :return: A list, containing one array for each of the mapper's features
+        :rtype: [numpy.ndarray]
+        """
+        features = mapper.built_features
+
+        # Look up cached outputs, and only transform the remaining features
+        cache_keys = [None] * len(features)
+        extracted = [None] * len(features)
+        if use_cache and self.transform_cache is not None:
+            for feature_index, (columns, pipeline, options) in enumerate(features):
+                cache_keys[feature_index] = self.transform_cache.key(
+                    fingerprint_dataframe(observations[columns]),
+                    self._pipeline_fingerprint(options.get('alias', '_'.join(columns)), pipeline))
+                extracted[feature_index] = self.transform_cache.get(cache_keys[feature_index])
+        missing_indices = [feature_index for feature_index, transformed in enumerate(extracted) if transformed is None]
+
+        missing_features = [features[feature_index] for feature_index in missing_indices]
+        missing_extracted = self._run_pipelines('transform', missing_features, observations)
+
+        for feature_index, transformed in zip(missing_indices, missing_extracted):
+            extracted[feature_index] = numpy.asarray(transformed)
+            if use_cache and self.transform_cache is not None:
+                self.transform_cache.put(cache_keys[feature_index], extracted[feature_index])
+
+        return extracted
+
+    def _run_pipelines(self, phase, features, observations):
+        """
+        Fit, partially fit or transform each feature's pipeline. If `n_jobs` is not 1, each pipeline is run
+        concurrently, in a separate process. If there is a `profiler`, each pipeline is run one step at a time, and
+        the profiler collects each step's records.
+
+        :param phase: One of `fit`, `partial_fit` or `transform`
+        :type phase: str
+        :param features: A list of (columns, pipeline, options) tuples, as in `DataFrameMapper.built_features`
+        :type features: list
+        :param observations: A pandas DataFrame, containing the features' variables
+        :type observations: pandas.DataFrame
+        :return: A list, containing each feature's fitted pipeline (if fitting) or transformed output (if
+            transforming), in the same order as `features`
+        :rtype: list
+        """
+        if self.profiler is None:
+            pipeline_function = {'fit': _fit_pipeline,
+                                 'partial_fit': _partial_fit_pipeline,
+                                 'transform': _transform_pipeline}[phase]
+            calls = [delayed(pipeline_function)(pipeline, observations[columns].values)
+                     for columns, pipeline, _ in features]
+        else:
+            calls = [delayed(profile_pipeline)(pipeline, observations[columns].values, phase,
+                                               options.get('alias', '_'.join(columns)), self.profiler.trace_memory)
+                     for columns, pipeline, options in features]
+
+        if self.n_jobs == 1:
+            results = [function(*args, **kwargs) for function, args, kwargs in calls]
+        else:
+            results = Parallel(n_jobs=self.n_jobs)(calls)
+
+        if self.profiler is None:
+            return results
+
+        outputs = list()
+        for output, records in results:
+            self.profiler.add_records(records)
+            outputs.append(output)
+        return outputs
+
+    def _pipeline_fingerprint(self, variable, pipeline):
+        """
+        Fingerprint a variable's fitted pipeline, for cache keys. Fingerprints are computed once per fit.
+        """
+        if variable not in self._pipeline_fingerprints:
+            self._pipeline_fingerprints[variable] = fingerprint_state(pipeline)
+        return self._pipeline_fingerprints[variable]
+
+    def _transform_mapper(self, mapper, observations):
+        """
+        Transform observations with a fitted mapper, returning a DataFrame
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param observations: A pandas DataFrame, containing the mapper's variables
+        :type observations: pandas.DataFrame
+        :return: The transformed observations, in the same format as `DataFrameMapper.transform` w/ `df_out=True`
+        :rtype: pandas.DataFrame
+        """
+        return self._format_dataframe(mapper, observations.index,
+                                      self._compact_arrays(mapper, self._transform_arrays(mapper, observations)))
+
+    @staticmethod
+    def _format_dataframe(mapper, index, extracted):
+        """
+        Format the output of `_transform_arrays` as a DataFrame, w/ the same column names and dtypes as
+        `DataFrameMapper.transform` w/ `df_out=True`
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param index: The index of the pandas DataFrame that was transformed
+        :type index: pandas.Index
+        :param extracted: The output of `_transform_arrays`
+        :type extracted: [numpy.ndarray]
+        :return: The transformed observations
+        :rtype: pandas.DataFrame
+        """
+        transformed_names = list()
+        transformed_frames = list()
+        for (columns, pipeline, options), transformed in zip(mapper.built_features, extracted):
+            names = mapper.get_names(columns, pipeline, transformed, options.get('alias'))
+            if len(transformed.shape) == 1:
+                transformed = transformed.reshape(-1, 1)
+            transformed_names += names
+            transformed_frames.append(pandas.DataFrame(transformed, columns=names, index=index))
+
+        mapper.transformed_names_ = transformed_names
+        return pandas.concat(transformed_frames, axis=1)
+
+    @staticmethod
+    def _append_exemplars(mapper, extracted, enumerate_levels=False):
+        """
+        Append rows to the output of `_transform_arrays`, so that nubs created from a sample of observations are sized
+        for all levels. For variables whose final transformer is index encoded (has a `max_index_`), the appended
+        rows contain the largest encoding (or, if `enumerate_levels`, every encoding from 0 to the largest). Other
+        variables repeat their last transformed row.
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param extracted: The output of `_transform_arrays`, w/ at least one row
+        :type extracted: [numpy.ndarray]
+        :param enumerate_levels: Whether to append every encoding, rather than just the largest
+        :type enumerate_levels: bool
+        :return: A list, containing one array for each of the mapper's features
+        :rtype: [numpy.ndarray]
+        """
+        # Determine each variable's exemplar values, if it is index encoded
+        exemplar_values = list()
+        for _, pipeline, _ in mapper.built_features:
+            final_step = pipeline.steps[-1][1]
+            max_index = getattr(final_step, 'max_index_', None)
+            if max_index is None:
+                exemplar_values.append(None)
+            elif enumerate_levels:
+                exemplar_values.append(numpy.arange(max_index + 1))
+            else:
+                exemplar_values.append(numpy.array([max_index]))
+
+        # Append the same number of rows to every variable, padding w/ the last exemplar value (or transformed row)
+        num_exemplars = max([1] + [len(values) for values in exemplar_values if values is not None])
+        appended = list()
+        for values, transformed in zip(exemplar_values, extracted):
+            if values is None:
+                exemplars = numpy.repeat(transformed[-1:], num_exemplars, axis=0)
+            else:
+                values = numpy.concatenate([values, numpy.repeat(values[-1:], num_exemplars - len(values))])
+                exemplars = numpy.broadcast_to(values.reshape((-1,) + (1,) * (len(transformed.shape) - 1)),
+                                               (num_exemplars,) + transformed.shape[1:])
+            appended.append(numpy.concatenate([transformed, exemplars.astype(transformed.dtype)]))
+        return appended
+
+    @staticmethod
+    def _create_variable_slices(mapper, extracted):
+        """
+        Index which columns of the transformed data belong to each variable
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param extracted: The output of `_transform_arrays`
+        :type extracted: [numpy.ndarray]
+        :return: A dictionary, in the format {'variable_name': slice(first_column, last_column + 1)}
+        :rtype: {str: slice}
+        """
+        variable_slices = dict()
+        start = 0
+        for (columns, _, options), transformed in zip(mapper.built_features, extracted):
+            variable = options.get('alias', '_'.join(columns))
+            width = int(transformed.shape[1]) if len(transformed.shape) > 1 else 1
+            variable_slices[variable] = slice(start, start + width)
+            start += width
+        return variable_slices
+
+    @staticmethod
+    def _create_variable_dtypes(mapper, extracted):
+        """
+        Determine each variable's compact output dtype (see `transformations.compact_dtype`), from its transformed
+        dtype and, if its final transformer is index encoded (has a `max_index_`), its largest index
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param extracted: The output of `_transform_arrays`
+        :type extracted: [numpy.ndarray]
+        :return: A dictionary, in the format {'variable_name': 'dtype_name'}
+        :rtype: {str: str}
+        """
+        variable_dtypes = dict()
+        for (columns, pipeline, options), transformed in zip(mapper.built_features, extracted):
+            max_index = getattr(pipeline.steps[-1][1], 'max_index_', None)
+            variable_dtypes[options.get('alias', '_'.join(columns))] = str(compact_dtype(transformed.dtype, max_index))
+        return variable_dtypes
+
+    def _compact_arrays(self, mapper, extracted):
+        """
+        Cast the output of `_transform_arrays` to each variable's output dtype, if there is a `dtype_policy`
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param extracted: The output of `_transform_arrays`
+        :type extracted: [numpy.ndarray]
+        :return: A list, containing one array for each of the mapper's features
+        :rtype: [numpy.ndarray]
+        """
+        if self.variable_dtypes is None:
+            return extracted
+        return [transformed.astype(self.variable_dtypes[options.get('alias', '_'.join(columns))], copy=False)
+                for (columns, _, options), transformed in zip(mapper.built_features, extracted)]
+
+    @staticmethod
+    def _format_arrays(mapper, variable_slices, extracted):
+        """
+        Format the output of `_transform_arrays` for Keras. Variables w/ a single transformed column are formatted as a
+        1d array, and variables w/ derived columns (e.g. one column per token) as a 2d array.
+
+        :param mapper: A fitted mapper
+        :type mapper: DataFrameMapper
+        :param variable_slices: The output of `_create_variable_slices`, from when the mapper was fit
+        :type variable_slices: {str: slice}
+        :param extracted: The output of `_transform_arrays`
+        :type extracted: [numpy.ndarray]
+        :return: A list, containing one array for each variable
+        :rtype: [numpy.ndarray]
+        """
+        formatted = list()
+        for (columns, _, options), transformed in zip(mapper.built_features, extracted):
+            variable_slice = variable_slices[options.get('alias', '_'.join(columns))]
+            if variable_slice.stop - variable_slice.start == 1:
+                transformed = transformed.reshape(-1)
+            formatted.append(transformed)
+        return formatted
+
     def _check_fitted(self):
         if not self.fitted:
             raise AssertionError('Automater has not been fitted yet. Please call to Automater.fit() with appropriate '
@@ -343,6 +1262,25 @@ class Automater():
         else:
             return True
 
+    @staticmethod
+    def _variable_names(variable_list):
+        """
+        Names of the variables in one of `data_type_dict`'s variable lists, w/ each group (a dictionary, in the format
+        {'group_name': ['variable_name_3', 'variable_name_4']}) contributing its group name
+
+        :param variable_list: A list of variable names and groups
+        :type variable_list: [str or {str: [str]}]
+        :return: A list of variable and group names
+        :rtype: [str]
+        """
+        variable_names = list()
+        for variable in variable_list:
+            if isinstance(variable, dict):
+                variable_names += list(variable.keys())
+            else:
+                variable_names.append(variable)
+        return variable_names
+
     def _check_input_df(self, input_dataframe):
         # TODO Check that input_dataframe contains all variables, except for response variable
         pass
@@ -357,7 +1295,8 @@ class Automater():
                     continue
 
                 else:
-                    intersection = set(outer_variable_list).intersection(set(inner_variable_list))
+                    intersection = set(self._variable_names(outer_variable_list)).intersection(
+                        set(self._variable_names(inner_variable_list)))
                     if len(intersection) > 0:
                         raise ValueError('Datatype lists {} and {} overlap, and share variables(s): {}'.
                                          format(inner_datatype, outer_datatype, intersection))
@@ -382,4 +1321,51 @@ class Automater():
                 raise ValueError('Output variable: {} has been assigned datatype: {}. However, this datatype does not '
                                  'support being used as an output variable'.format(self.output_var, output_datatype))
 
+        # Check that groups are non-empty, supported by their datatype, and are not the response variable
+        for group, group_variables in self.variable_groups.items():
+            if len(group_variables) == 0:
+                raise ValueError('Variable group: {} does not contain any variables'.format(group))
+            if not getattr(self.variable_datatype_dict[group], 'supports_variable_groups', False):
+                raise ValueError('Variable group: {} has been assigned datatype: {}, which does not support variable '
+                                 'groups'.format(group, self.variable_datatype_dict[group]))
+            if group == self.output_var:
+                raise ValueError('Output variable: {} can not be a variable group'.format(group))
+
+        # Check that the dtype policy is supported
+        if self.dtype_policy not in DTYPE_POLICIES:
+            raise ValueError('Unknown dtype_policy: {}. Please use one of: {}'.format(self.dtype_policy,
+                                                                                    DTYPE_POLICIES))
+
         return True
+
+
+def _fit_pipeline(pipeline, observations):
+    """
+    Fit a single variable's transformation pipeline. This is a module level function, so that it can be sent to worker
+    processes.
+    """
+    return pipeline.fit(observations)
+
+
+def _partial_fit_pipeline(pipeline, observations):
+    """
+    Incrementally fit a single variable's transformation pipeline w/ one chunk of observations. Each step is partially
+    fit, and then transforms the chunk for the next step. This is a module level function, so that it can be sent to
+    worker processes.
+    """
+    transformed = observations
+    for step_index, (name, transformer) in enumerate(pipeline.steps):
+        if not hasattr(transformer, 'partial_fit'):
+            raise ValueError('Transformer: {} does not support partial_fit'.format(name))
+        transformer.partial_fit(transformed)
+        if step_index < len(pipeline.steps) - 1:
+            transformed = transformer.transform(transformed)
+    return pipeline
+
+
+def _transform_pipeline(pipeline, observations):
+    """
+    Transform a single variable w/ its fitted transformation pipeline. This is a module level function, so that it can
+    be sent to worker processes.
+    """
+    return pipeline.transform(observations)
@@ -0,0 +1,224 @@
+"""
+Content addressed, on disk cache for transformed variables
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+import numpy
+import pandas
+
+
+class TransformCache(object):
+    """
+    A local disk cache of transformed variables, for use w/ `Automater(transform_cache=...)`.
+
+    Each entry is one variable's transformed array, keyed by a fingerprint of the variable's raw data (see
+    `fingerprint_dataframe`) and a fingerprint of its fitted transformation pipeline (see `fingerprint_state`). When
+    the same fitted Automater transforms the same data again, each variable is loaded from the cache, and only
+    variables whose data (or pipeline) changed are re-transformed.
+
+    Entries are evicted least recently used first, when the cache holds more than `max_bytes` bytes or more than
+    `max_entries` entries.
+    """
+
+    def __init__(self, path=None, max_bytes=None, max_entries=None):
+        """
+        :param path: Path to the cache directory, which will be created if it does not exist. If None, a temporary
+            directory is created
+        :type path: str
+        :param max_bytes: Maximum total size of cached arrays, in bytes. If None, size is not bounded
+        :type max_bytes: int
+        :param max_entries: Maximum number of cached arrays. If None, the number of entries is not bounded
+        :type max_entries: int
+        """
+        if path is None:
+            path = tempfile.mkdtemp(prefix='keras_pandas_cache_')
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data_fingerprint, state_fingerprint):
+        """
+        Combine data and state fingerprints into a cache key
+
+        :return: A hex digest
+        :rtype: str
+        """
+        return hashlib.sha1('{}:{}'.format(data_fingerprint, state_fingerprint).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        Load a cached array, and mark it as recently used
+
+        :param key: A cache key, from `key`
+        :type key: str
+        :return: The cached array, or None if there is no entry for `key`
+        :rtype: numpy.ndarray
+        """
+        entry_path = self._entry_path(key)
+        try:
+            array = numpy.load(entry_path, allow_pickle=False)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+
+        # Update the modification time, which orders entries for LRU eviction
+        os.utime(entry_path, None)
+        self.hits += 1
+        return array
+
+    def put(self, key, array):
+        """
+        Cache an array, and evict entries if the cache is over its bounds. Object arrays are not cached, because they
+        can not be loaded w/o unpickling.
+
+        :param key: A cache key, from `key`
+        :type key: str
+        :param array: The array to cache
+        :type array: numpy.ndarray
+        :return: Whether the array was cached
+        :rtype: bool
+        """
+        array = numpy.asarray(array)
+        if array.dtype == object:
+            logging.debug('Not caching object array, for key: {}'.format(key))
+            return False
+
+        # Write to a temporary file, and then rename, so that readers never see a partially written entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            numpy.save(temp_file, array, allow_pickle=False)
+        os.rename(temp_path, self._entry_path(key))
+
+        self._evict()
+        return True
+
+    def clear(self):
+        """
+        Remove all cached entries
+        """
+        for _, _, entry_path in self._entries():
+            os.remove(entry_path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, '{}.npy'.format(key))
+
+    def _entries(self):
+        """
+        List cached entries, least recently used first
+
+        :return: A list of (modification time, size in bytes, path) tuples
+        :rtype: [(float, int, str)]
+        """
+        entries = list()
+        for file_name in os.listdir(self.path):
+            if not file_name.endswith('.npy'):
+                continue
+            entry_path = os.path.join(self.path, file_name)
+            try:
+                stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        return sorted(entries)
+
+    def _evict(self):
+        """
+        Remove least recently used entries, until the cache is within `max_bytes` and `max_entries`
+        """
+        if self.max_bytes is None and self.max_entries is None:
+            return
+
+        entries = self._entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and ((self.max_bytes is not None and total_bytes > self.max_bytes) or
+                           (self.max_entries is not None and len(entries) > self.max_entries)):
+            _, size, entry_path = entries.pop(0)
+            os.remove(entry_path)
+            total_bytes -= size
+            logging.debug('Evicted cache entry: {}'.format(entry_path))
+
+
+def fingerprint_dataframe(observations):
+    """
+    Fingerprint a DataFrame's columns, from a hash of each row's values. Column names and the index are not included,
+    so the same values under a different name or index have the same fingerprint.
+
+    :param observations: A pandas DataFrame
+    :type observations: pandas.DataFrame
+    :return: A hex digest
+    :rtype: str
+    """
+    hasher = hashlib.sha1()
+    for column in observations.columns:
+        values = observations[column]
+        hasher.update(str(values.dtype).encode('utf-8'))
+        try:
+            row_hashes = pandas.util.hash_pandas_object(values, index=False, categorize=False)
+        except (TypeError, ValueError):
+            # Unhashable cells (e.g. lists, for time series) are hashed from their repr
+            row_hashes = pandas.util.hash_pandas_object(values.map(repr), index=False, categorize=False)
+        hasher.update(row_hashes.values.tobytes())
+    hasher.update(str(observations.shape).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def fingerprint_state(obj):
+    """
+    Fingerprint a fitted object's state, such as a transformation pipeline. The fingerprint is canonical (e.g. sets and
+    dicts are sorted), so that the same state has the same fingerprint in every process, regardless of hash
+    randomization. Attributes beginning w/ an underscore are treated as private caches, and are not included.
+
+    :param obj: A fitted object
+    :return: A hex digest
+    :rtype: str
+    """
+    hasher = hashlib.sha1()
+    _update_state_hasher(hasher, obj)
+    return hasher.hexdigest()
+
+
+def _update_state_hasher(hasher, obj):
+    """
+    Recursively add a canonical representation of `obj` to `hasher`
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes, type)):
+        hasher.update(repr(obj).encode('utf-8'))
+    elif isinstance(obj, numpy.ndarray):
+        hasher.update('ndarray{}{}'.format(obj.dtype, obj.shape).encode('utf-8'))
+        if obj.dtype == object:
+            hasher.update(pandas.util.hash_array(obj.ravel()).tobytes())
+        else:
+            hasher.update(numpy.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, numpy.generic):
+        hasher.update(repr(obj.item()).encode('utf-8'))
+    elif isinstance(obj, (pandas.Series, pandas.Index)):
+        hasher.update(type(obj).__name__.encode('utf-8'))
+        hasher.update(pandas.util.hash_pandas_object(obj).values.tobytes())
+    elif isinstance(obj, dict):
+        hasher.update('dict{}'.format(len(obj)).encode('utf-8'))
+        for key in sorted(obj, key=repr):
+            _update_state_hasher(hasher, key)
+            _update_state_hasher(hasher, obj[key])
+    elif isinstance(obj, (set, frozenset)):
+        hasher.update('set{}'.format(len(obj)).encode('utf-8'))
+        for item in sorted(map(repr, obj)):
+            hasher.update(item.encode('utf-8'))
+    elif isinstance(obj, (list, tuple)):
+        hasher.update('{}{}'.format(type(obj).__name__, len(obj)).encode('utf-8'))
+        for item in obj:
+            _update_state_hasher(hasher, item)
+    elif hasattr(obj, '__dict__'):
+        hasher.update('{}.{}'.format(type(obj).__module__, type(obj).__name__).encode('utf-8'))
+        _update_state_hasher(hasher, {key: value for key, value in vars(obj).items() if not key.startswith('_')})
+    else:
+        hasher.update(pickle.dumps(obj, protocol=2))
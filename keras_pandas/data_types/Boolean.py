@@ -1,7 +1,3 @@
-import keras
-from keras import losses
-from keras.layers import Dense
-
 from keras_pandas import lib
 from keras_pandas.transformations import TypeConversionEncoder
 
@@ -29,6 +25,7 @@ class Boolean():
         :type transformed_obervations: pandas.DataFrame
         :return: A tuple containing the input layer, and the last layer of the nub
         """
+        import keras
 
         transformed = transformed_observations[variable].as_matrix()
 
@@ -58,6 +55,8 @@ class Boolean():
         :type input_observations: pandas.DataFrame
         :return: output_layer
         """
+        from keras.layers import Dense
+
         self._check_output_support()
         output_nub = Dense(units=1, activation='sigmoid')
 
@@ -78,6 +77,8 @@ class Boolean():
         return natural_scaled_vars
 
     def output_suggested_loss(self):
+        from keras import losses
+
         self._check_output_support()
         suggested_loss = losses.binary_crossentropy
         return suggested_loss
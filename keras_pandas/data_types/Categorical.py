@@ -1,29 +1,49 @@
 import logging
 
-import keras
 import numpy
-from keras import losses
-from keras.layers import Embedding, Flatten, Dense
 
 from keras_pandas import lib
-from keras_pandas.transformations import TypeConversionEncoder, CategoricalImputer, LabelEncoder
+from keras_pandas.transformations import TypeConversionEncoder, CategoricalImputer, LabelEncoder, \
+    HashingEncoder
 
 
 class Categorical():
     """
     Support for categorical variables, such as fruits: `['apple', 'banana', 'coconut']`, or home_ownership: `['rent',
     'own]`.
+
+    For variables w/ very many levels (such as IDs), `num_buckets` enables the hashing trick: each level is hashed into
+    one of `num_buckets` buckets, rather than learning a vocabulary. Hashed variables are not supported as output
+    variables, because hashing cannot be inverted.
+
+    Categorical variables from the same domain (e.g. origin_airport and dest_airport) can be grouped in the
+    Automater's `data_type_dict`, as `{'categorical': [{'airport': ['origin_airport', 'dest_airport']}]}`. A group's
+    variables are encoded w/ one shared vocabulary, as one stacked array, and share one embedding.
     """
 
-    def __init__(self):
-        self.supports_output = True
-        self.default_transformation_pipeline = [TypeConversionEncoder(str),
-                                                CategoricalImputer(strategy='constant', fill_value='UNK',
-                                                                   fill_unknown_labels=True),
-                                                LabelEncoder()]
+    def __init__(self, num_buckets=None, sketch_capacity=None):
+        """
+        :param num_buckets: If not None, the number of hash buckets levels are encoded into
+        :type num_buckets: int
+        :param sketch_capacity: If not None, levels are counted w/ bounded memory summaries when fitting on streams
+            (see `Automater.partial_fit`), and only the `sketch_capacity` most frequent levels are encoded
+        :type sketch_capacity: int
+        """
+        self.num_buckets = num_buckets
+        self.supports_output = num_buckets is None
+        self.supports_variable_groups = True
+        if num_buckets is None:
+            # TypeConversionEncoder always returns a new array, so the imputer can safely work in place
+            self.default_transformation_pipeline = [TypeConversionEncoder(str),
+                                                    CategoricalImputer(strategy='constant', fill_value='UNK',
+                                                                       fill_unknown_labels=True, copy=False,
+                                                                       sketch_capacity=sketch_capacity),
+                                                    LabelEncoder(sketch_capacity=sketch_capacity)]
+        else:
+            # Missing values are converted to strings, and hashed like any other level
+            self.default_transformation_pipeline = [TypeConversionEncoder(str), HashingEncoder(num_buckets)]
 
-    @staticmethod
-    def input_nub_generator(variable, transformed_observations):
+    def input_nub_generator(self, variable, transformed_observations):
         """
         Generate an input layer and input 'nub' for a Keras network.
 
@@ -37,8 +57,17 @@ class Categorical():
         :type transformed_observations: pandas.DataFrame
         :return: A tuple containing the input layer, and the last layer of the nub
         """
-        # Get transformed data for shaping
-        transformed = transformed_observations[variable].as_matrix()
+        import keras
+        from keras.layers import Embedding, Flatten
+
+        # Get transformed data for shaping. Variable groups have one column per grouped variable
+        if variable in transformed_observations.columns:
+            variable_list = [variable]
+        else:
+            variable_name_prefix = variable + '_'
+            variable_list = list(filter(lambda x: x.startswith(variable_name_prefix) and
+                                        x[len(variable_name_prefix):].isdigit(), transformed_observations.columns))
+        transformed = transformed_observations[variable_list].as_matrix()
 
         # Set up dimensions for input_layer layer
         if len(transformed.shape) >= 2:
@@ -46,8 +75,10 @@ class Categorical():
         else:
             input_sequence_length = 1
 
-        # TODO Convert below to numpy.max (?)
-        categorical_num_levels = int(max(transformed)) + 2
+        if self.num_buckets is not None:
+            categorical_num_levels = self.num_buckets
+        else:
+            categorical_num_levels = int(numpy.max(transformed)) + 2
         embedding_output_dim = int(min((categorical_num_levels + 1) / 2, 50))
 
         logging.info('Creating embedding for cat_var: {}, with input_sequence_length: {}, categorical_num_levels: {}, '
@@ -79,9 +110,11 @@ class Categorical():
         :type transformed_observations: pandas.DataFrame
         :return: output_layer
         """
+        from keras.layers import Dense
+
         self._check_output_support()
-        # +1 for UNK level
-        categorical_num_response_levels = len(set(transformed_observations[variable])) + 1
+        # Encodings run from 0 (UNK) to the largest index, and the observations may include exemplars for every level
+        categorical_num_response_levels = int(numpy.max(transformed_observations[variable])) + 1
         output_layer = Dense(units=categorical_num_response_levels, activation='softmax')
 
         return output_layer
@@ -106,6 +139,8 @@ class Categorical():
         return natural_scaled_vars
 
     def output_suggested_loss(self):
+        from keras import losses
+
         self._check_output_support()
         suggested_loss = losses.sparse_categorical_crossentropy
         return suggested_loss
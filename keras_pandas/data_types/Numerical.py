@@ -1,10 +1,9 @@
 import logging
 
-import keras
-from keras.layers import Dense
-from sklearn.preprocessing import Imputer, StandardScaler
+from sklearn.preprocessing import StandardScaler
 
 from keras_pandas import lib
+from keras_pandas.transformations import MeanImputer
 
 
 class Numerical():
@@ -15,7 +14,7 @@ class Numerical():
 
     def __init__(self):
         self.supports_output = True
-        self.default_transformation_pipeline = [Imputer(strategy='mean'), StandardScaler()]
+        self.default_transformation_pipeline = [MeanImputer(), StandardScaler()]
 
     @staticmethod
     def input_nub_generator(variable, transformed_observations):
@@ -32,6 +31,8 @@ class Numerical():
         :type transformed_observations: pandas.DataFrame
         :return: A tuple containing the input layer, and the last layer of the nub
         """
+        import keras
+
         # Get transformed data for shaping
         transformed = transformed_observations[variable].as_matrix()
 
@@ -62,6 +63,8 @@ class Numerical():
                 :type transformed_observations: pandas.DataFrame
                 :return: output_layer
                 """
+        from keras.layers import Dense
+
         self._check_output_support()
         output_nub = Dense(units=1, activation='linear')
         return output_nub
@@ -89,6 +92,8 @@ class Numerical():
         return natural_scaled_vars
 
     def output_suggested_loss(self):
+        import keras
+
         self._check_output_support()
         # TODO We can do better than this, if we are able to look at the response data
         suggested_loss = keras.losses.mean_squared_error
@@ -1,8 +1,6 @@
 import logging
 
-import keras
 import numpy
-from keras.layers import Bidirectional, LSTM, Embedding
 
 from keras_pandas import lib
 from keras_pandas.transformations import TypeConversionEncoder, EmbeddingVectorizer
@@ -15,12 +13,36 @@ class Text():
     life, the universe and everything according to a study by British ...']`
     """
 
-    def __init__(self):
+    def __init__(self, n_jobs=1, min_count=1, max_vocab_size=None, num_buckets=None, sketch_capacity=None,
+                 mask_padding=False):
+        """
+        :param n_jobs: The number of processes used to tokenize and vectorize text. -1 uses all CPUs
+        :type n_jobs: int
+        :param min_count: Tokens occurring fewer than `min_count` times are treated as unknown
+        :type min_count: int
+        :param max_vocab_size: If not None, only the `max_vocab_size` most frequent tokens are embedded. This bounds
+            the size of the embedding matrix
+        :type max_vocab_size: int
+        :param num_buckets: If not None, tokens are hashed into `num_buckets` buckets, rather than learning a
+            vocabulary
+        :type num_buckets: int
+        :param sketch_capacity: If not None, tokens and sequence lengths are summarized w/ bounded memory sketches
+            when fitting on streams (see `Automater.partial_fit`)
+        :type sketch_capacity: int
+        :param mask_padding: Whether the input nub masks padding tokens, so that the LSTM skips them. The input layer
+            then accepts sequences of any length, such as the batches from `sequences.BucketedSequence`
+        :type mask_padding: bool
+        """
+        self.num_buckets = num_buckets
+        self.mask_padding = mask_padding
         self.supports_output = False
-        self.default_transformation_pipeline = [TypeConversionEncoder(str), EmbeddingVectorizer()]
+        self.default_transformation_pipeline = [TypeConversionEncoder(str),
+                                                EmbeddingVectorizer(n_jobs=n_jobs, min_count=min_count,
+                                                                    max_vocab_size=max_vocab_size,
+                                                                    num_buckets=num_buckets,
+                                                                    sketch_capacity=sketch_capacity)]
 
-    @staticmethod
-    def input_nub_generator(variable, transformed_observations):
+    def input_nub_generator(self, variable, transformed_observations):
         """
         Generate an input layer and input 'nub' for a Keras network.
 
@@ -34,6 +56,9 @@ class Text():
         :type transformed_observations: pandas.DataFrame
         :return: A tuple containing the input layer, and the last layer of the nub
         """
+        import keras
+        from keras.layers import Bidirectional, LSTM, Embedding
+
         logging.info('Creating input nub for: {}'.format(variable))
         # Get transformed data for shaping. One column per token.
         if variable in transformed_observations.columns:
@@ -56,7 +81,11 @@ class Text():
 
         # Determine vocabulary size (number of rows in the embedding). The additional offsets are due to 1  for len
         # vs indexing w/ 0, 1 for unknown token, and the others for something else?
-        vocab_size = int(numpy.max(transformed)) + 4
+        if self.num_buckets is not None:
+            # Hash buckets, and the UNK and padding tokens
+            vocab_size = self.num_buckets + 2
+        else:
+            vocab_size = int(numpy.max(transformed)) + 4
 
         # Determine embedding output size
         # TODO There must be a better heuristic
@@ -67,11 +96,21 @@ class Text():
                                                            embedding_output_dim))
 
         # Create and stack layers
-        input_layer = keras.Input(shape=(input_sequence_length,),
-                                  name=lib.namespace_conversion('input_{}'.format(variable)))
-        x = input_layer
-        x = Embedding(input_dim=vocab_size, output_dim=embedding_output_dim, input_length=input_sequence_length,
-                      name=lib.namespace_conversion('embedding_{}'.format(variable)))(x)
+        if self.mask_padding:
+            from keras_pandas.layers import PaddingIndexShift
+
+            # Sequences of any length. The padding token (1, see EmbeddingVectorizer) is shifted to 0, for mask_zero
+            input_layer = keras.Input(shape=(None,), name=lib.namespace_conversion('input_{}'.format(variable)))
+            x = PaddingIndexShift(pad_index=1,
+                                  name=lib.namespace_conversion('padding_index_shift_{}'.format(variable)))(input_layer)
+            x = Embedding(input_dim=vocab_size + 1, output_dim=embedding_output_dim, mask_zero=True,
+                          name=lib.namespace_conversion('embedding_{}'.format(variable)))(x)
+        else:
+            input_layer = keras.Input(shape=(input_sequence_length,),
+                                      name=lib.namespace_conversion('input_{}'.format(variable)))
+            x = input_layer
+            x = Embedding(input_dim=vocab_size, output_dim=embedding_output_dim, input_length=input_sequence_length,
+                          name=lib.namespace_conversion('embedding_{}'.format(variable)))(x)
         x = Bidirectional(LSTM(128,
                                name=lib.namespace_conversion('lstm_{}'.format(variable))),
                           name=lib.namespace_conversion('bidirectiona_lstm_{}'.format(variable)))(x)
@@ -1,7 +1,6 @@
 import logging
 
-import keras
-from keras.layers import Reshape, Bidirectional, LSTM
+import numpy
 
 from keras_pandas import lib
 from keras_pandas.transformations import TimeSeriesVectorizer
@@ -12,12 +11,21 @@ class TimeSeries():
     Support for time series data, such as previous_day_closes: `[[123, 3, 0], [777, 42,
     0]]` or last_three_purchase_prices: `[[222, 111, 891], [12312312, 412412, 12]]`
     """
-    def __init__(self):
+    def __init__(self, mask_padding=False):
+        """
+        :param mask_padding: Whether the input nub masks the padding at the start of each sequence, so that the LSTM
+            skips it. The input layer then accepts sequences of any length, such as the batches from
+            `sequences.BucketedSequence`. Sequences are padded w/ NaN, so that genuine zeros are not masked
+        :type mask_padding: bool
+        """
+        self.mask_padding = mask_padding
         self.supports_output = False
-        self.default_transformation_pipeline = [TimeSeriesVectorizer()]
+        if mask_padding:
+            self.default_transformation_pipeline = [TimeSeriesVectorizer(pad_value=numpy.nan)]
+        else:
+            self.default_transformation_pipeline = [TimeSeriesVectorizer()]
 
-    @staticmethod
-    def input_nub_generator(variable, transformed_observations):
+    def input_nub_generator(self, variable, transformed_observations):
         """
         Generate an input layer and input 'nub' for a Keras network.
 
@@ -31,6 +39,8 @@ class TimeSeries():
         :type transformed_observations: pandas.DataFrame
         :return: A tuple containing the input layer, and the last layer of the nub
         """
+        import keras
+        from keras.layers import Reshape, Bidirectional, LSTM
 
         # Get transformed data for shaping
         if variable in transformed_observations.columns:
@@ -52,10 +62,21 @@ class TimeSeries():
                 variable, input_sequence_length))
 
         # Create and stack layers
-        input_layer = keras.Input(shape=(input_sequence_length,),
-                                  name=lib.namespace_conversion('input_{}'.format(variable)))
-        x = input_layer
-        x = Reshape((input_sequence_length, 1))(x)
+        if self.mask_padding:
+            from keras_pandas.layers import PaddedStepMasking
+
+            # Sequences of any length, padded consistent w/ the transformation pipeline
+            vectorizer = self.default_transformation_pipeline[-1]
+            padding = getattr(vectorizer, 'padding', 'pre')
+            pad_value = getattr(vectorizer, 'pad_value', 0.)
+            input_layer = keras.Input(shape=(None,), name=lib.namespace_conversion('input_{}'.format(variable)))
+            x = PaddedStepMasking(pad_value=pad_value, padding=padding,
+                                  name=lib.namespace_conversion('padded_step_masking_{}'.format(variable)))(input_layer)
+        else:
+            input_layer = keras.Input(shape=(input_sequence_length,),
+                                      name=lib.namespace_conversion('input_{}'.format(variable)))
+            x = input_layer
+            x = Reshape((input_sequence_length, 1))(x)
         x = Bidirectional(LSTM(32,
                                name=lib.namespace_conversion('lstm_{}'.format(variable))),
                           name=lib.namespace_conversion('bidirectional_lstm_{}'.format(variable)))(x)
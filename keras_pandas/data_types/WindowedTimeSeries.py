@@ -0,0 +1,45 @@
+from keras_pandas.data_types.TimeSeries import TimeSeries
+from keras_pandas.transformations import SlidingWindowVectorizer
+
+
+class WindowedTimeSeries(TimeSeries):
+    """
+    Support for time series stored as a flat numerical column, such as daily_close: `[123, 3, 0, 777]`. Each
+    observation's input is a window of the variable's previous values, built when transforming, rather than a
+    precomputed list per row (see `lib.load_instanbul_stocks(as_ts=True)`).
+
+    Windows are built within each group of `group_by` (e.g. a ticker), in order of `order_by` (e.g. a date). Both
+    columns must be present in the observations passed to the Automater, but are not themselves model inputs. Windows
+    at the start of each group (or of each transformed chunk) are padded.
+    """
+
+    def __init__(self, window_length, group_by=None, order_by=None, include_current=False):
+        """
+        :param window_length: Number of values in each window
+        :type window_length: int
+        :param group_by: Name of an optional column, whose values identify independent series
+        :type group_by: str
+        :param order_by: Name of an optional column to order each series by. If None, row order is used
+        :type order_by: str
+        :param include_current: Whether each observation's window ends w/ its own value
+        :type include_current: bool
+        """
+        super(WindowedTimeSeries, self).__init__()
+        self.group_by = group_by
+        self.order_by = order_by
+        self.default_transformation_pipeline = [SlidingWindowVectorizer(window_length,
+                                                                        grouped=group_by is not None,
+                                                                        ordered=order_by is not None,
+                                                                        include_current=include_current)]
+
+    def input_columns(self, variable):
+        """
+        The columns passed to the variable's transformation pipeline: the variable, and then the grouping and
+        ordering columns (if any)
+
+        :param variable: Name of the variable
+        :type variable: str
+        :return: A list of column names
+        :rtype: [str]
+        """
+        return [variable] + [column for column in [self.group_by, self.order_by] if column is not None]
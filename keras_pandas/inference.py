@@ -0,0 +1,223 @@
+"""
+Low latency transformation of small batches of observations (e.g. single rows, for online scoring), w/ a fitted
+Automater
+"""
+import numpy
+from sklearn.preprocessing import StandardScaler
+
+from keras_pandas.transformations import CategoricalImputer, EmbeddingVectorizer, HashingEncoder, LabelEncoder, \
+    MeanImputer, hash_buckets, tokenize, _pad_ragged, _stacked_labels
+
+
+class CompiledTransform(object):
+    """
+    A lightweight callable, which transforms small batches of observations into Keras-ready inputs. The output is
+    equivalent to `X` from `Automater.transform(observations, df_out=False)`, but avoids the fixed overhead of building
+    DataFrames, `DataFrameMapper`, input validation and per call logging.
+
+    Each variable's fitted pipeline is compiled into a chain of kernels. Common transformers (e.g. `LabelEncoder`,
+    `CategoricalImputer`, `MeanImputer`, `StandardScaler` and `EmbeddingVectorizer`) are compiled into plain dict
+    lookups and numpy operations, and other transformers fall back to their own `transform`.
+
+    Observations can be passed as a dict of columns (`{'variable': [value_1, value_2]}`), or as a list of records
+    (`[{'variable': value_1}, {'variable': value_2}]`). Values should have the same types as the data the Automater
+    was fit on (e.g. `1` and `1.0` are different categorical levels). The output variable is not transformed.
+
+    The compiled transform is a snapshot of the Automater's fitted state, so it should be recompiled after re-fitting.
+    """
+
+    def __init__(self, automater):
+        """
+        :param automater: A fitted Automater
+        :type automater: keras_pandas.Automater.Automater
+        """
+        self.columns = list()
+        self.kernels = list()
+        self.flatten = list()
+        self.dtypes = list()
+        for columns, pipeline, options in automater.input_mapper.built_features:
+            variable = options.get('alias', '_'.join(columns))
+            variable_slice = automater.input_variable_slices[variable]
+            self.columns.append(list(columns))
+            self.kernels.append(compile_pipeline(pipeline))
+            self.flatten.append(variable_slice.stop - variable_slice.start == 1)
+            self.dtypes.append(None if automater.variable_dtypes is None else automater.variable_dtypes[variable])
+
+    def __call__(self, observations):
+        """
+        Transform a batch of observations
+
+        :param observations: A dict of columns, or a list of records, containing every input variable (and any other
+            columns read by datatypes, e.g. `WindowedTimeSeries`'s grouping and ordering columns)
+        :type observations: {str: list} or [{str: object}]
+        :return: A list, containing one array for each input variable, consistent w/ Keras's input formatting
+        :rtype: [numpy.ndarray]
+        """
+        if isinstance(observations, dict):
+            def get_column(column):
+                return _as_column(observations[column])
+        else:
+            def get_column(column):
+                return _as_column([record[column] for record in observations])
+
+        # Features w/ several columns (e.g. windowed time series' grouping and ordering keys) are stacked
+        inputs = list()
+        for columns in self.columns:
+            if len(columns) == 1:
+                inputs.append(get_column(columns[0]))
+            else:
+                inputs.append(numpy.hstack([get_column(column).astype(object) for column in columns]))
+
+        X = list()
+        for transformed, kernels, flatten, dtype in zip(inputs, self.kernels, self.flatten, self.dtypes):
+            for kernel in kernels:
+                transformed = kernel(transformed)
+            transformed = numpy.asarray(transformed, dtype=dtype)
+            if flatten:
+                transformed = transformed.reshape(-1)
+            X.append(transformed)
+        return X
+
+
+def compile_pipeline(pipeline):
+    """
+    Compile a fitted pipeline into a list of kernels. Each kernel is a function, which takes and returns arrays w/ the
+    same shapes as the corresponding step's `transform`
+
+    :param pipeline: A fitted transformation pipeline, w/ a `steps` attribute
+    :return: A list of functions, one for each step
+    :rtype: [callable]
+    """
+    kernels = list()
+    for _, transformer in pipeline.steps:
+        kernel_compiler = KERNEL_COMPILERS.get(type(transformer))
+        if kernel_compiler is None:
+            kernels.append(transformer.transform)
+        else:
+            kernels.append(kernel_compiler(transformer))
+    return kernels
+
+
+def _as_column(values):
+    """
+    Format one variable's values as a 2d, single column array, consistent w/ `DataFrame[[variable]].values`. Values
+    that are themselves sequences (e.g. time series) are kept as single objects.
+    """
+    if isinstance(values, numpy.ndarray) and values.dtype != object:
+        return values.reshape(-1, 1)
+
+    column = numpy.empty((len(values), 1), dtype=object)
+    for row, value in enumerate(values):
+        column[row, 0] = value
+    return column
+
+
+def _is_null(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _compile_categorical_imputer(imputer):
+    if imputer.fill_ is None:
+        raise ValueError('CategoricalImputer has not been fitted yet')
+
+    fill = imputer.fill_
+    known_values = frozenset(imputer.known_values)
+    fill_unknown_labels = imputer.fill_unknown_labels
+    missing_values = imputer.missing_values
+    if missing_values == 'NaN' or missing_values is None or \
+            (isinstance(missing_values, float) and numpy.isnan(missing_values)):
+        is_missing = _is_null
+    else:
+        def is_missing(value):
+            return value == missing_values
+
+    def kernel(X):
+        imputed = [fill if is_missing(value) or (fill_unknown_labels and value not in known_values) else value
+                   for value in X.ravel().tolist()]
+        return numpy.array(imputed, dtype=object).reshape(X.shape)
+
+    return kernel
+
+
+def _compile_label_encoder(encoder):
+    lookup = {label: index for index, label in enumerate(encoder.classes_.tolist())}
+    unk_index = lookup['UNK']
+
+    def kernel(X):
+        labels, shape = _stacked_labels(X)
+        return numpy.array([lookup.get(label, unk_index) for label in labels.tolist()], dtype=numpy.intp).reshape(shape)
+
+    return kernel
+
+
+def _compile_hashing_encoder(encoder):
+    num_buckets = encoder.num_buckets
+    offset = encoder.offset
+
+    def kernel(X):
+        labels, shape = _stacked_labels(X)
+        return (hash_buckets(labels, num_buckets) + offset).reshape(shape)
+
+    return kernel
+
+
+def _compile_mean_imputer(imputer):
+    statistics = imputer.statistics_
+
+    def kernel(X):
+        X = numpy.array(X, dtype=float)
+        if len(X.shape) == 1:
+            X = X.reshape(-1, 1)
+        return numpy.where(numpy.isnan(X), statistics, X)
+
+    return kernel
+
+
+def _compile_standard_scaler(scaler):
+    mean = scaler.mean_ if scaler.with_mean else None
+    scale = scaler.scale_ if scaler.with_std else None
+
+    def kernel(X):
+        X = numpy.asarray(X, dtype=float)
+        if mean is not None:
+            X = X - mean
+        if scale is not None:
+            X = X / scale
+        return X
+
+    return kernel
+
+
+def _compile_embedding_vectorizer(vectorizer):
+    if vectorizer.partial_fit_pending:
+        raise ValueError('EmbeddingVectorizer has partial_fit chunks that have not been finalized. Please call '
+                         'finalize_partial_fit() (or Automater.finalize_fit()) before compiling')
+    max_sequence_length = vectorizer.max_sequence_length
+    pad_index = vectorizer.token_index_lookup['__PAD__']
+
+    if vectorizer.num_buckets is None:
+        lookup = dict(vectorizer.token_index_lookup)
+        unk_index = lookup['UNK']
+
+        def lookup_indices(tokens):
+            return numpy.fromiter((lookup.get(token, unk_index) for token in tokens), dtype=numpy.int32,
+                                  count=len(tokens))
+    else:
+        lookup_indices = vectorizer.lookup_indices
+
+    def kernel(X):
+        documents = [str(row[0]) for row in X]
+        tokens, sequence_lengths = tokenize(documents)
+        return _pad_ragged(lookup_indices(tokens), sequence_lengths, max_sequence_length, pad_value=pad_index,
+                           dtype=numpy.int32)
+
+    return kernel
+
+
+# Kernel compilers, keyed by the exact transformer class (subclasses may change `transform`, and fall back to it)
+KERNEL_COMPILERS = {CategoricalImputer: _compile_categorical_imputer,
+                    LabelEncoder: _compile_label_encoder,
+                    HashingEncoder: _compile_hashing_encoder,
+                    MeanImputer: _compile_mean_imputer,
+                    StandardScaler: _compile_standard_scaler,
+                    EmbeddingVectorizer: _compile_embedding_vectorizer}
@@ -0,0 +1,388 @@
+"""
+Keras layers, which reproduce fitted transformation pipelines inside a Keras model, so that preprocessing runs in the
+TensorFlow runtime (and is batched w/ inference), w/o pandas, sklearn or gensim
+
+Lookup layers are backed by TensorFlow hash tables. Tables are initialized by `export_pipeline`, and must be
+initialized again (w/ `initialize_tables`) after loading a saved model, e.g.:
+
+    model = keras.models.load_model('model.h5', custom_objects=CUSTOM_OBJECTS)
+    initialize_tables()
+"""
+import keras
+import numpy
+import tensorflow as tf
+from keras import backend as K
+from keras.layers import Layer
+from sklearn.preprocessing import StandardScaler
+
+from keras_pandas import lib
+from keras_pandas.transformations import CategoricalImputer, EmbeddingVectorizer, LabelEncoder, MeanImputer, \
+    TypeConversionEncoder
+
+
+class TypeConversion(Layer):
+    """
+    Convert values to `conversion_type`, consistent w/ `TypeConversionEncoder`. Booleans are True for any non-zero
+    value (including NaN), and are output as floats.
+    """
+
+    def __init__(self, conversion_type, **kwargs):
+        super(TypeConversion, self).__init__(**kwargs)
+        self.conversion_type = conversion_type
+
+    def call(self, inputs):
+        if self.conversion_type == 'bool':
+            return K.cast(tf.not_equal(inputs, 0), K.floatx())
+        return K.cast(inputs, self.conversion_type)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        config = {'conversion_type': self.conversion_type}
+        base_config = super(TypeConversion, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class MeanImputation(Layer):
+    """
+    Replace missing (NaN) values w/ each column's fill value, consistent w/ `MeanImputer`
+    """
+
+    def __init__(self, fill_values, **kwargs):
+        super(MeanImputation, self).__init__(**kwargs)
+        self.fill_values = list(fill_values)
+
+    def call(self, inputs):
+        inputs = K.cast(inputs, K.floatx())
+        fill_values = K.constant(self.fill_values, dtype=K.floatx()) * tf.ones_like(inputs)
+        return tf.where(tf.math.is_nan(inputs), fill_values, inputs)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        config = {'fill_values': self.fill_values}
+        base_config = super(MeanImputation, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class Standardization(Layer):
+    """
+    Center and scale each column, consistent w/ sklearn's `StandardScaler`
+    """
+
+    def __init__(self, mean=None, scale=None, **kwargs):
+        super(Standardization, self).__init__(**kwargs)
+        self.mean = list(mean) if mean is not None else None
+        self.scale = list(scale) if scale is not None else None
+
+    def call(self, inputs):
+        outputs = K.cast(inputs, K.floatx())
+        if self.mean is not None:
+            outputs = outputs - K.constant(self.mean, dtype=K.floatx())
+        if self.scale is not None:
+            outputs = outputs / K.constant(self.scale, dtype=K.floatx())
+        return outputs
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        config = {'mean': self.mean, 'scale': self.scale}
+        base_config = super(Standardization, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class CategoricalImputation(Layer):
+    """
+    Replace string labels that were not seen during fit w/ a fill value, consistent w/ `CategoricalImputer` w/
+    `fill_unknown_labels`. Inputs are strings (e.g. from `TypeConversionEncoder(str)`), so they can not be null.
+    """
+
+    def __init__(self, known_values, fill_value, **kwargs):
+        super(CategoricalImputation, self).__init__(**kwargs)
+        self.known_values = list(known_values)
+        self.fill_value = fill_value
+
+    def build(self, input_shape):
+        self.table = _hash_table(self.known_values, numpy.ones(len(self.known_values), dtype=numpy.int64), 0)
+        super(CategoricalImputation, self).build(input_shape)
+
+    def call(self, inputs):
+        is_known = tf.equal(self.table.lookup(inputs), 1)
+        return tf.where(is_known, inputs, tf.fill(tf.shape(inputs), self.fill_value))
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        config = {'known_values': self.known_values, 'fill_value': self.fill_value}
+        base_config = super(CategoricalImputation, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class StringLookup(Layer):
+    """
+    Convert string labels to indices, w/ a fixed vocabulary. Labels that are not in the vocabulary are converted to
+    `default_index`. This is consistent w/ `LabelEncoder`, w/ `vocabulary` as its `classes_`, and `default_index` as
+    the index of UNK.
+    """
+
+    def __init__(self, vocabulary, default_index, **kwargs):
+        super(StringLookup, self).__init__(**kwargs)
+        self.vocabulary = list(vocabulary)
+        self.default_index = default_index
+
+    def build(self, input_shape):
+        self.table = _hash_table(self.vocabulary, numpy.arange(len(self.vocabulary), dtype=numpy.int64),
+                                 self.default_index)
+        super(StringLookup, self).build(input_shape)
+
+    def call(self, inputs):
+        return K.cast(self.table.lookup(inputs), 'int32')
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        config = {'vocabulary': self.vocabulary, 'default_index': self.default_index}
+        base_config = super(StringLookup, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class TextVectorization(Layer):
+    """
+    Tokenize documents, convert tokens to indices, and pad (or truncate) the end of each sequence to
+    `max_sequence_length`, consistent w/ `EmbeddingVectorizer`.
+
+    Tokens are runs of 2 to 15 letters (or underscores), which do not start w/ an underscore, as w/ `tokenize`. If
+    the TensorFlow runtime does not support unicode case folding (`tf.strings.lower`), only ASCII letters are
+    lowercased.
+    """
+
+    def __init__(self, tokens, indices, unk_index, pad_index, max_sequence_length, **kwargs):
+        super(TextVectorization, self).__init__(**kwargs)
+        self.tokens = list(tokens)
+        self.indices = [int(index) for index in indices]
+        self.unk_index = unk_index
+        self.pad_index = pad_index
+        self.max_sequence_length = max_sequence_length
+
+    def build(self, input_shape):
+        self.table = _hash_table(self.tokens, numpy.array(self.indices, dtype=numpy.int64), self.unk_index)
+        super(TextVectorization, self).build(input_shape)
+
+    def call(self, inputs):
+        documents = _lowercase(tf.reshape(inputs, [-1]))
+
+        # Split on every run of characters that can not be part of a token, and drop tokens of the wrong length, or
+        # that start w/ an underscore
+        tokens = tf.string_split(tf.strings.regex_replace(documents, r'[^\pL_]+', ' '), delimiter=' ')
+        token_lengths = tf.strings.length(tokens.values, unit='UTF8_CHAR')
+        keep_mask = tf.logical_and(tf.logical_and(token_lengths >= 2, token_lengths <= 15),
+                                   tf.not_equal(tf.strings.substr(tokens.values, 0, 1), '_'))
+        token_rows = tf.boolean_mask(tokens.indices[:, 0], keep_mask)
+        token_indices = tf.boolean_mask(self.table.lookup(tokens.values), keep_mask)
+
+        # Position of each token in its document, from its offset to the document's first token
+        num_documents = tf.shape(documents, out_type=tf.int64)[0]
+        token_offsets = tf.range(tf.size(token_rows, out_type=tf.int64), dtype=tf.int64)
+        document_starts = tf.math.unsorted_segment_min(token_offsets, token_rows, num_documents)
+        token_columns = token_offsets - tf.gather(document_starts, token_rows)
+
+        # Scatter tokens into a padded array, dropping tokens past max_sequence_length
+        in_sequence_mask = token_columns < self.max_sequence_length
+        scatter_indices = tf.stack([tf.boolean_mask(token_rows, in_sequence_mask),
+                                    tf.boolean_mask(token_columns, in_sequence_mask)], axis=1)
+        scatter_updates = tf.boolean_mask(token_indices, in_sequence_mask) - self.pad_index
+        padded_shape = tf.stack([num_documents, tf.constant(self.max_sequence_length, dtype=tf.int64)])
+        padded = tf.scatter_nd(scatter_indices, scatter_updates, padded_shape) + self.pad_index
+        return K.cast(padded, 'int32')
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0], self.max_sequence_length
+
+    def get_config(self):
+        config = {'tokens': self.tokens, 'indices': self.indices, 'unk_index': self.unk_index,
+                  'pad_index': self.pad_index, 'max_sequence_length': self.max_sequence_length}
+        base_config = super(TextVectorization, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class PaddingIndexShift(Layer):
+    """
+    Remap token indices, so that the padding token is `0` and every other index is shifted up by one. This allows an
+    `Embedding(input_dim=vocab_size + 1, mask_zero=True)` layer to mask the padding produced by `EmbeddingVectorizer`
+    (where `0` is the UNK token)
+    """
+
+    def __init__(self, pad_index, **kwargs):
+        super(PaddingIndexShift, self).__init__(**kwargs)
+        self.pad_index = pad_index
+
+    def call(self, inputs):
+        inputs = K.cast(inputs, 'int32')
+        return tf.where(tf.equal(inputs, self.pad_index), tf.zeros_like(inputs), inputs + 1)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        config = {'pad_index': self.pad_index}
+        base_config = super(PaddingIndexShift, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+class PaddedStepMasking(Layer):
+    """
+    Convert a batch of padded sequences, w/ shape `(batch_size, steps)`, into `(batch_size, steps, 1)` for recurrent
+    layers, and mask the padding, consistent w/ `TimeSeriesVectorizer`.
+
+    Only the contiguous run of `pad_value` at the start (if `padding='pre'`) or end (if `padding='post'`) of each
+    sequence is masked. If `pad_value` can also occur in the data (e.g. 0), genuine values at the start (or end) of a
+    sequence are masked as well, so a `pad_value` outside the data's range (e.g. NaN) should be used. `pad_value` is
+    replaced w/ 0 in the output.
+    """
+
+    def __init__(self, pad_value=0., padding='pre', **kwargs):
+        super(PaddedStepMasking, self).__init__(**kwargs)
+        if padding not in ('pre', 'post'):
+            raise ValueError('padding must be \'pre\' or \'post\', got: {}'.format(padding))
+        self.pad_value = pad_value
+        self.padding = padding
+
+    def call(self, inputs):
+        inputs = K.cast(inputs, K.floatx())
+        inputs = tf.where(self._is_padding(inputs), tf.zeros_like(inputs), inputs)
+        return K.expand_dims(inputs, -1)
+
+    def compute_mask(self, inputs, mask=None):
+        is_value = K.cast(tf.logical_not(self._is_padding(K.cast(inputs, K.floatx()))), 'int32')
+        if self.padding == 'pre':
+            return K.greater(K.cumsum(is_value, axis=1), 0)
+        return K.reverse(K.greater(K.cumsum(K.reverse(is_value, axes=1), axis=1), 0), axes=1)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0], input_shape[1], 1
+
+    def _is_padding(self, inputs):
+        if numpy.isnan(self.pad_value):
+            return tf.math.is_nan(inputs)
+        return tf.equal(inputs, self.pad_value)
+
+    def get_config(self):
+        config = {'pad_value': self.pad_value, 'padding': self.padding}
+        base_config = super(PaddedStepMasking, self).get_config()
+        return dict(list(base_config.items()) + list(config.items()))
+
+
+# Custom layers, for `keras.models.load_model(..., custom_objects=CUSTOM_OBJECTS)`
+CUSTOM_OBJECTS = {layer_class.__name__: layer_class for layer_class in
+                  [TypeConversion, MeanImputation, Standardization, CategoricalImputation, StringLookup,
+                   TextVectorization, PaddingIndexShift, PaddedStepMasking]}
+
+
+def export_pipeline(pipeline, variable, num_columns=1):
+    """
+    Convert a variable's fitted transformation pipeline into a raw input layer, followed by one Keras layer for each
+    step. String pipelines (beginning w/ `TypeConversionEncoder(str)`) have a string input, and other pipelines have
+    a float input.
+
+    :param pipeline: A fitted transformation pipeline, w/ a `steps` attribute
+    :param variable: The variable's name, for layer names
+    :type variable: str
+    :param num_columns: Number of raw columns the pipeline reads (e.g. each variable in a variable group)
+    :type num_columns: int
+    :return: A tuple, containing the raw input layer, and the output of the last step
+    :rtype: (keras.Input, tensor)
+    """
+    steps = pipeline.steps
+    is_string = len(steps) > 0 and isinstance(steps[0][1], TypeConversionEncoder) and \
+        steps[0][1].conversion_type == str
+    raw_input = keras.Input(shape=(num_columns,), dtype='string' if is_string else K.floatx(),
+                            name=lib.namespace_conversion('raw_{}'.format(variable)))
+
+    x = raw_input
+    for name, transformer in steps:
+        layer = step_layer(transformer, name=lib.namespace_conversion('{}_{}'.format(name, variable)))
+        if layer is not None:
+            x = layer(x)
+    return raw_input, x
+
+
+def step_layer(transformer, name=None):
+    """
+    Create a Keras layer, bound to a fitted transformer's parameters
+
+    :param transformer: A fitted transformer
+    :param name: The layer's name
+    :type name: str
+    :return: A Keras layer, or None if the transformer does not change the (raw input) tensor
+    :rtype: keras.layers.Layer
+    """
+    if isinstance(transformer, TypeConversionEncoder):
+        if transformer.conversion_type == str:
+            return None
+        return TypeConversion(numpy.dtype(transformer.conversion_type).name, name=name)
+
+    elif isinstance(transformer, MeanImputer):
+        return MeanImputation(transformer.statistics_.tolist(), name=name)
+
+    elif isinstance(transformer, StandardScaler):
+        mean = transformer.mean_.tolist() if transformer.with_mean else None
+        scale = transformer.scale_.tolist() if transformer.with_std else None
+        return Standardization(mean=mean, scale=scale, name=name)
+
+    elif isinstance(transformer, CategoricalImputer):
+        if not transformer.fill_unknown_labels:
+            return None
+        return CategoricalImputation(sorted(map(str, transformer.known_values)), str(transformer.fill_), name=name)
+
+    elif isinstance(transformer, LabelEncoder):
+        vocabulary = transformer.classes_.astype(str).tolist()
+        return StringLookup(vocabulary, vocabulary.index('UNK'), name=name)
+
+    elif isinstance(transformer, EmbeddingVectorizer) and transformer.num_buckets is None:
+        if transformer.partial_fit_pending:
+            raise ValueError('EmbeddingVectorizer has partial_fit chunks that have not been finalized. Please call '
+                             'finalize_partial_fit() (or Automater.finalize_fit()) before exporting')
+        lookup = transformer.token_index_lookup
+        tokens = sorted(lookup.keys())
+        return TextVectorization(tokens, [lookup[token] for token in tokens], lookup['UNK'], lookup['__PAD__'],
+                                 transformer.max_sequence_length, name=name)
+
+    raise ValueError('Transformer: {} can not be exported as a Keras layer'.format(type(transformer).__name__))
+
+
+def initialize_tables():
+    """
+    Initialize the lookup tables of all layers in the current Keras session
+    """
+    K.get_session().run(tf.tables_initializer())
+
+
+def _hash_table(keys, values, default_value):
+    """
+    Create a static TensorFlow hash table, from string keys to int64 values
+    """
+    lookup = tf.lookup if hasattr(tf, 'lookup') and hasattr(tf.lookup, 'StaticHashTable') else None
+    if lookup is not None:
+        initializer = lookup.KeyValueTensorInitializer(keys, values, key_dtype=tf.string, value_dtype=tf.int64)
+        return lookup.StaticHashTable(initializer, default_value)
+
+    initializer = tf.contrib.lookup.KeyValueTensorInitializer(keys, values, key_dtype=tf.string, value_dtype=tf.int64)
+    return tf.contrib.lookup.HashTable(initializer, default_value)
+
+
+def _lowercase(strings):
+    """
+    Lowercase strings, w/ unicode case folding where supported, and otherwise ASCII case folding
+    """
+    if hasattr(tf.strings, 'lower'):
+        return tf.strings.lower(strings, encoding='utf-8')
+
+    codepoints = tf.strings.unicode_decode(strings, 'UTF-8')
+    lowercase_codepoints = tf.ragged.map_flat_values(
+        lambda values: tf.where(tf.logical_and(values >= 65, values <= 90), values + 32, values), codepoints)
+    return tf.strings.unicode_encode(lowercase_codepoints, 'UTF-8')
@@ -5,12 +5,13 @@ import inspect
 import logging
 import os
 import re
+import shutil
 import string
 import tempfile
+from contextlib import contextmanager
 
 import numpy
 import pandas
-import requests
 
 
 def check_variable_list_are_valid(variable_type_dict):
@@ -69,6 +70,8 @@ def download_file(url, local_file_path, filename):
     :return: The path to the file on the local machine (same as input `local_file_path`)
     :rtype: str
     """
+    import requests
+
     logging.info('Downloading file from url: {}, to path: {}'.format(url, local_file_path))
     # Reference variables
     chunk_count = 0
@@ -108,6 +111,40 @@ def get_temp_dir():
     return temp_dir
 
 
+@contextmanager
+def staged_directory(path):
+    """
+    Build a directory's contents in a temporary sibling directory, and move it into place at `path` once the block
+    completes. Any existing directory at `path` is replaced as a whole, so readers never see a mix of old and new
+    files, and files from an earlier write are not left behind. If the block raises, `path` is left unchanged.
+
+    :param path: Path to the directory, which will be created (or replaced)
+    :type path: str
+    :return: A context manager, yielding the path to the temporary directory to write into
+    """
+    path = os.path.abspath(path)
+    parent_dir, name = os.path.split(path)
+    if not os.path.exists(parent_dir):
+        os.makedirs(parent_dir)
+
+    staged_path = tempfile.mkdtemp(prefix='.{}.'.format(name), dir=parent_dir)
+    try:
+        yield staged_path
+    except BaseException:
+        shutil.rmtree(staged_path, ignore_errors=True)
+        raise
+
+    # Renaming is atomic within a file system, but a non-empty directory can not be renamed over, so the existing
+    # directory is moved aside first
+    replaced_path = None
+    if os.path.exists(path):
+        replaced_path = tempfile.mkdtemp(prefix='.{}.replaced.'.format(name), dir=parent_dir)
+        os.rename(path, os.path.join(replaced_path, name))
+    os.rename(staged_path, path)
+    if replaced_path is not None:
+        shutil.rmtree(replaced_path, ignore_errors=True)
+
+
 def load_titanic():
     """
     Load the titanic data set, as a pandas DataFrame
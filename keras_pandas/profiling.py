@@ -0,0 +1,194 @@
+"""
+Instrumentation for finding slow variables and transformers, when fitting and transforming w/ an Automater
+"""
+import logging
+import time
+import tracemalloc
+
+import numpy
+import pandas
+
+RECORD_FIELDS = ['phase', 'variable', 'step', 'transformer', 'num_rows', 'wall_time', 'rows_per_second',
+                 'peak_memory_delta', 'output_bytes']
+
+
+class Profiler(object):
+    """
+    Collects timing and memory records for each transformation pipeline step, for use w/
+    `Automater(profiler=...)`.
+
+    Each time a variable's pipeline is fit, partially fit or transformed, one record is collected for each of the
+    pipeline's steps, w/ the fields:
+
+     - `phase`: One of `fit`, `partial_fit` or `transform`
+     - `variable`: The variable's name
+     - `step`: The step's name in the pipeline, and `transformer`, the step's class name
+     - `num_rows`: Number of observations processed
+     - `wall_time`: Wall time, in seconds, and `rows_per_second`
+     - `peak_memory_delta`: Peak memory allocated by the step, in bytes, beyond what was allocated when it started
+       (from `tracemalloc`). None if memory is not traced
+     - `output_bytes`: Size of the step's output, in bytes. None if the step does not produce an output (e.g. the last
+       step, while fitting)
+    """
+
+    def __init__(self, trace_memory=True, callbacks=None):
+        """
+        :param trace_memory: Whether to trace peak memory w/ `tracemalloc`. Tracing memory slows down pipelines, so
+            wall times are most accurate w/o it
+        :type trace_memory: bool
+        :param callbacks: Callables, each called w/ every record (a dict) as it is collected
+        :type callbacks: [callable]
+        """
+        self.trace_memory = trace_memory
+        self.callbacks = list(callbacks) if callbacks is not None else list()
+        self.records = list()
+        self._num_runs = 0
+
+    def add_records(self, records):
+        """
+        Collect the records from one pipeline run, and pass each record to the callbacks
+
+        :param records: Records from `profile_pipeline`
+        :type records: [dict]
+        """
+        for record in records:
+            record['run'] = self._num_runs
+            self.records.append(record)
+            for callback in self.callbacks:
+                callback(record)
+        self._num_runs += 1
+
+    def report(self, level='variable'):
+        """
+        Summarize collected records, slowest first
+
+        :param level: One of `variable` (totals for each phase and variable), `step` (totals for each phase, variable
+            and pipeline step) or `record` (every collected record)
+        :type level: str
+        :return: A DataFrame, w/ one row per group
+        :rtype: pandas.DataFrame
+        """
+        records = pandas.DataFrame(self.records, columns=RECORD_FIELDS + ['run'])
+        if level == 'record':
+            return records
+
+        elif level == 'step':
+            grouped = records.groupby(['phase', 'variable', 'step', 'transformer'], sort=False).agg(
+                {'num_rows': 'sum', 'wall_time': 'sum', 'peak_memory_delta': 'max', 'output_bytes': 'sum'})
+
+        elif level == 'variable':
+            # Each pipeline run processes the same rows in every step, and its output is its last step's output
+            runs = records.groupby(['phase', 'variable', 'run'], sort=False).agg(
+                {'num_rows': 'first', 'wall_time': 'sum', 'peak_memory_delta': 'max', 'output_bytes': 'last'})
+            grouped = runs.groupby(['phase', 'variable'], sort=False).agg(
+                {'num_rows': 'sum', 'wall_time': 'sum', 'peak_memory_delta': 'max', 'output_bytes': 'sum'})
+
+        else:
+            raise ValueError('Unknown report level: {}. Please use one of: variable, step, record'.format(level))
+
+        grouped['rows_per_second'] = grouped['num_rows'] / grouped['wall_time']
+        return grouped.reset_index().sort_values('wall_time', ascending=False).reset_index(drop=True)
+
+    def clear(self):
+        """
+        Discard all collected records
+        """
+        self.records = list()
+        self._num_runs = 0
+
+
+def profile_pipeline(pipeline, observations, phase, variable, trace_memory=True):
+    """
+    Fit, partially fit or transform a single variable's pipeline one step at a time, and record each step's wall time
+    and memory use. This is a module level function, so that it can be sent to worker processes.
+
+    :param pipeline: A transformation pipeline, w/ a `steps` attribute
+    :param observations: The variable's observations
+    :type observations: numpy.ndarray
+    :param phase: One of `fit`, `partial_fit` or `transform`
+    :type phase: str
+    :param variable: The variable's name, for records
+    :type variable: str
+    :param trace_memory: Whether to trace peak memory w/ `tracemalloc`
+    :type trace_memory: bool
+    :return: A tuple, containing the pipeline (if fitting) or transformed observations (if transforming), and a list of
+        records
+    :rtype: (object, [dict])
+    """
+    if phase not in ('fit', 'partial_fit', 'transform'):
+        raise ValueError('Unknown phase: {}. Please use one of: fit, partial_fit, transform'.format(phase))
+
+    records = list()
+    num_rows = observations.shape[0]
+    transformed = observations
+    for step_index, (name, transformer) in enumerate(pipeline.steps):
+        is_last_step = step_index == len(pipeline.steps) - 1
+        if phase == 'partial_fit' and not hasattr(transformer, 'partial_fit'):
+            raise ValueError('Transformer: {} does not support partial_fit'.format(name))
+
+        memory_tracer = _MemoryTracer(trace_memory)
+        start = time.time()
+        if phase == 'fit' and is_last_step:
+            transformer.fit(transformed)
+            transformed = None
+        elif phase == 'fit':
+            transformed = transformer.fit_transform(transformed)
+        elif phase == 'partial_fit':
+            transformer.partial_fit(transformed)
+            transformed = transformer.transform(transformed) if not is_last_step else None
+        else:
+            transformed = transformer.transform(transformed)
+        wall_time = time.time() - start
+
+        records.append({'phase': phase,
+                        'variable': variable,
+                        'step': name,
+                        'transformer': type(transformer).__name__,
+                        'num_rows': num_rows,
+                        'wall_time': wall_time,
+                        'rows_per_second': num_rows / wall_time if wall_time > 0 else numpy.inf,
+                        'peak_memory_delta': memory_tracer.stop(),
+                        'output_bytes': getattr(transformed, 'nbytes', None)})
+
+    logging.debug('Profiled {} for variable: {}, wall_time: {}'.format(
+        phase, variable, sum(record['wall_time'] for record in records)))
+
+    if phase == 'transform':
+        return transformed, records
+    return pipeline, records
+
+
+class _MemoryTracer(object):
+    """
+    Measures peak memory allocated between construction and `stop`, w/ `tracemalloc`. If memory is already being
+    traced (e.g. by an outer tracer), the peak is reset rather than restarting tracing, where supported.
+    """
+
+    def __init__(self, trace_memory):
+        self.started_tracing = False
+        self.start_bytes = None
+        if not trace_memory:
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            return
+        self.start_bytes, _ = tracemalloc.get_traced_memory()
+
+    def stop(self):
+        """
+        :return: Peak memory allocated, in bytes, beyond what was allocated at construction. None if memory was not
+            traced
+        :rtype: int
+        """
+        if self.start_bytes is None:
+            return None
+
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        if self.started_tracing:
+            tracemalloc.stop()
+        return max(peak_bytes - self.start_bytes, 0)
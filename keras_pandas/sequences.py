@@ -0,0 +1,268 @@
+"""
+Keras Sequences, which feed observations into Keras models through a fitted Automater
+"""
+import logging
+
+import numpy
+from keras.utils import Sequence
+
+from keras_pandas.transformations import EmbeddingVectorizer, TimeSeriesVectorizer
+
+
+class AutomaterSequence(Sequence):
+    """
+    A Keras Sequence, which lazily transforms batches of observations with a fitted Automater. Only the current
+    batches are ever transformed and held in memory, rather than the full transformed data set.
+
+    Because this is a `keras.utils.Sequence`, it can be used with `model.fit_generator()` (and
+    `model.predict_generator()`), including with the `workers`, `use_multiprocessing` and `max_queue_size` arguments.
+    This allows batches to be transformed (and prefetched) in parallel, while the model trains. For example:
+
+    >>> sequence = AutomaterSequence(auto, train_observations, batch_size=32)
+    >>> model.fit_generator(sequence, epochs=10, workers=4, use_multiprocessing=True, max_queue_size=10)
+
+    If the response variable is not available (unsupervised Automater, or `output_var` is not in `observations`),
+    batches only contain `X`.
+    """
+
+    def __init__(self, automater, observations, batch_size=32, shuffle=True, seed=None):
+        """
+        :param automater: A fitted Automater
+        :type automater: keras_pandas.Automater.Automater
+        :param observations: A pandas DataFrame, containing all keras input variables (and optionally the response
+            variable)
+        :type observations: pandas.DataFrame
+        :param batch_size: Number of observations in each batch
+        :type batch_size: int
+        :param shuffle: Whether to shuffle the order of observations, at initialization and after every epoch
+        :type shuffle: bool
+        :param seed: Random seed for shuffling
+        :type seed: int
+        """
+        automater._check_fitted()
+        if batch_size < 1:
+            raise ValueError('batch_size must be a positive integer, got: {}'.format(batch_size))
+
+        self.automater = automater
+        self.observations = observations
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.random_state = numpy.random.RandomState(seed)
+
+        # Positional index of each observation, in the order they will be batched
+        self.index_array = numpy.arange(observations.shape[0])
+        if self.shuffle:
+            self.random_state.shuffle(self.index_array)
+
+        logging.info('Created AutomaterSequence with {} observations, and {} batches of batch_size: {}'.format(
+            len(self.index_array), len(self), self.batch_size))
+
+    def __len__(self):
+        return int(numpy.ceil(len(self.index_array) / float(self.batch_size)))
+
+    def __getitem__(self, index):
+        batch_index_array = self.index_array[index * self.batch_size:(index + 1) * self.batch_size]
+        batch_observations = self.observations.iloc[batch_index_array]
+
+        X, y = self.automater.transform(batch_observations)
+
+        if y is None:
+            return X
+        else:
+            return X, y
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.random_state.shuffle(self.index_array)
+
+
+class BucketedSequence(Sequence):
+    """
+    A Keras Sequence, which batches observations w/ similar sequence lengths together, and pads each batch only to
+    its longest sequence, rather than to each variable's `max_sequence_length`. For skewed lengths, this avoids
+    spending most of each recurrent layer's steps on padding.
+
+    Only `Text` and `TimeSeries` variables created w/ `mask_padding=True` are trimmed, because their input nubs accept
+    sequences of any length, and mask the remaining padding. For example:
+
+    >>> auto = Automater(data_type_dict={'text': ['description'], 'categorical': ['label']}, output_var='label',
+    ...                  datatype_handlers={'text': Text(mask_padding=True)})
+    >>> auto.fit(train_observations)
+    >>> sequence = BucketedSequence(auto, train_observations, batch_size=32, num_buckets=10)
+    >>> model.fit_generator(sequence, epochs=10)
+
+    Each observation's sequence length (the longest of its trimmed variables) is determined when the sequence is
+    created, by transforming `observations` in chunks of `chunk_size`. Observations are then split into `num_buckets`
+    buckets, at quantiles of the sequence lengths, and each batch is drawn from a single bucket. If `shuffle` is True,
+    observations are shuffled within each bucket, and the order of batches is shuffled, after every epoch.
+    """
+
+    def __init__(self, automater, observations, batch_size=32, num_buckets=10, shuffle=True, seed=None,
+                 chunk_size=10000):
+        """
+        :param automater: A fitted Automater
+        :type automater: keras_pandas.Automater.Automater
+        :param observations: A pandas DataFrame, containing all keras input variables (and optionally the response
+            variable)
+        :type observations: pandas.DataFrame
+        :param batch_size: Maximum number of observations in each batch
+        :type batch_size: int
+        :param num_buckets: Number of sequence length buckets
+        :type num_buckets: int
+        :param shuffle: Whether to shuffle observations within buckets, and the order of batches, at initialization
+            and after every epoch
+        :type shuffle: bool
+        :param seed: Random seed for shuffling
+        :type seed: int
+        :param chunk_size: Number of observations transformed at once, when determining sequence lengths
+        :type chunk_size: int
+        """
+        automater._check_fitted()
+        if batch_size < 1:
+            raise ValueError('batch_size must be a positive integer, got: {}'.format(batch_size))
+        if num_buckets < 1:
+            raise ValueError('num_buckets must be a positive integer, got: {}'.format(num_buckets))
+
+        self.automater = automater
+        self.observations = observations
+        self.batch_size = batch_size
+        self.num_buckets = num_buckets
+        self.shuffle = shuffle
+        self.random_state = numpy.random.RandomState(seed)
+
+        # Position in X, padding value and padding side of each trimmed variable
+        self.padded_variables = _padded_variables(automater)
+        if len(self.padded_variables) == 0:
+            raise ValueError('BucketedSequence requires at least one Text or TimeSeries variable, w/ '
+                             'mask_padding=True')
+
+        # Length of each trimmed variable's sequences, w/ shape (len(padded_variables), num_observations)
+        variable_lengths = [list() for _ in self.padded_variables]
+        for X, _ in automater.transform_iter(observations, chunk_size=chunk_size):
+            for lengths, (variable_index, pad_value, padding) in zip(variable_lengths, self.padded_variables):
+                lengths.append(_sequence_lengths(X[variable_index], pad_value, padding))
+        self.variable_lengths = numpy.array([numpy.concatenate(lengths) if len(lengths) > 0 else numpy.zeros(0, int)
+                                             for lengths in variable_lengths])
+        self.sequence_lengths = self.variable_lengths.max(axis=0)
+
+        # Bucket boundaries, at quantiles of the sequence lengths
+        if len(self.sequence_lengths) > 0:
+            quantiles = numpy.linspace(0, 100, num_buckets + 1)[1:-1]
+            self.bucket_boundaries = numpy.unique(numpy.percentile(self.sequence_lengths, quantiles))
+        else:
+            self.bucket_boundaries = numpy.zeros(0)
+        self.bucket_ids = numpy.searchsorted(self.bucket_boundaries, self.sequence_lengths, side='left')
+
+        self.batches = self._create_batches()
+
+        logging.info('Created BucketedSequence with {} observations, {} buckets w/ boundaries: {}, and {} batches of '
+                     'batch_size: {}'.format(len(self.sequence_lengths), len(self.bucket_boundaries) + 1,
+                                             list(self.bucket_boundaries), len(self), self.batch_size))
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __getitem__(self, index):
+        batch_index_array = self.batches[index]
+        batch_observations = self.observations.iloc[batch_index_array]
+
+        X, y = self.automater.transform(batch_observations)
+
+        # Trim each padded variable to the batch's longest sequence
+        for lengths, (variable_index, _, padding) in zip(self.variable_lengths, self.padded_variables):
+            if len(X[variable_index].shape) != 2:
+                continue
+            width = max(int(lengths[batch_index_array].max()), 1)
+            if padding == 'post':
+                X[variable_index] = X[variable_index][:, :width]
+            else:
+                X[variable_index] = X[variable_index][:, -width:]
+
+        if y is None:
+            return X
+        else:
+            return X, y
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.batches = self._create_batches()
+
+    def _create_batches(self):
+        """
+        Split observations into batches, w/ each batch drawn from a single bucket
+
+        :return: A list, containing the positional index of each batch's observations
+        :rtype: [numpy.ndarray]
+        """
+        if self.shuffle:
+            index_array = self.random_state.permutation(len(self.bucket_ids))
+        else:
+            index_array = numpy.arange(len(self.bucket_ids))
+
+        # Group observations by bucket, w/ a stable sort so that shuffled order is kept within each bucket
+        index_array = index_array[numpy.argsort(self.bucket_ids[index_array], kind='mergesort')]
+        bucket_ends = numpy.cumsum(numpy.bincount(self.bucket_ids, minlength=len(self.bucket_boundaries) + 1))
+
+        batches = list()
+        bucket_start = 0
+        for bucket_end in bucket_ends:
+            batches.extend(index_array[start:min(start + self.batch_size, bucket_end)]
+                           for start in range(bucket_start, bucket_end, self.batch_size))
+            bucket_start = bucket_end
+
+        if self.shuffle:
+            self.random_state.shuffle(batches)
+        return batches
+
+
+def _padded_variables(automater):
+    """
+    Find the input variables whose padding can be trimmed: `Text` and `TimeSeries` variables w/ `mask_padding=True`,
+    which are vectorized by an `EmbeddingVectorizer` or `TimeSeriesVectorizer`
+
+    :param automater: A fitted Automater
+    :type automater: keras_pandas.Automater.Automater
+    :return: A list of tuples, in the format `(position in X, pad_value, padding)`
+    :rtype: [(int, object, str)]
+    """
+    padded_variables = list()
+    for variable_index, (columns, pipeline, options) in enumerate(automater.input_mapper.built_features):
+        variable = options.get('alias', '_'.join(columns))
+        datatype = automater.variable_datatype_dict.get(variable)
+        if pipeline is None or not getattr(datatype, 'mask_padding', False):
+            continue
+
+        vectorizer = pipeline.steps[-1][1]
+        if isinstance(vectorizer, EmbeddingVectorizer):
+            padded_variables.append((variable_index, vectorizer.token_index_lookup['__PAD__'], 'post'))
+        elif isinstance(vectorizer, TimeSeriesVectorizer):
+            padded_variables.append((variable_index, vectorizer.pad_value, vectorizer.padding))
+    logging.info('Trimming padding for variables at positions: {}'.format(
+        [variable_index for variable_index, _, _ in padded_variables]))
+    return padded_variables
+
+
+def _sequence_lengths(padded, pad_value, padding):
+    """
+    Determine the length of each padded sequence, from the contiguous run of `pad_value` at its start (if
+    `padding='pre'`) or end (if `padding='post'`). `pad_value` may be NaN
+
+    :param padded: A 2d array of padded sequences
+    :type padded: numpy.ndarray
+    :param pad_value: Value used to pad sequences
+    :param padding: `'pre'` or `'post'`, whether sequences are padded at their start or end
+    :type padding: str
+    :return: A 1d array, containing the length of each sequence
+    :rtype: numpy.ndarray
+    """
+    if len(padded.shape) != 2:
+        return numpy.ones(padded.shape[0], dtype=int)
+
+    if numpy.isnan(pad_value):
+        is_value = ~numpy.isnan(padded)
+    else:
+        is_value = padded != pad_value
+    if padding == 'post':
+        is_value = is_value[:, ::-1]
+    lengths = padded.shape[1] - numpy.argmax(is_value, axis=1)
+    return numpy.where(is_value.any(axis=1), lengths, 0)
@@ -0,0 +1,263 @@
+"""
+A compact, array backed format for saving and loading fitted state (e.g. a fitted Automater's transformation
+pipelines), as a directory w/ a JSON manifest and `.npy` files
+
+Large numerical arrays (e.g. scaler parameters) are written as `.npy` files, and memory mapped when loaded. String
+collections (e.g. `LabelEncoder.classes_`, `CategoricalImputer.known_values` and
+`EmbeddingVectorizer.token_index_lookup`) are written as string tables: one UTF-8 buffer of every string, w/ an array
+of offsets, and (for vocabularies) an array of values. Loading a string table decodes the buffer once, and slices
+it, rather than unpickling one object per string.
+
+Objects are written as their class and their (public) attributes, so attributes beginning w/ an underscore, which
+transformers use for caches (e.g. lookup indices) and `partial_fit` accumulators, are not saved. Values that can not
+be represented otherwise are pickled.
+"""
+import importlib
+import json
+import logging
+import os
+import pickle
+from collections import Counter, defaultdict
+
+import numpy
+
+from keras_pandas import lib
+
+MANIFEST_NAME = 'manifest.json'
+
+FORMAT_VERSION = 1
+
+# Numerical arrays w/ at most this many elements are written inline in the manifest, rather than as `.npy` files
+MAX_INLINE_ARRAY_SIZE = 256
+
+
+def write_bundle(path, state):
+    """
+    Write state to a directory, which will be created (or replaced, if it exists). The bundle is written into a
+    temporary directory, and then moved to `path`, so incomplete bundles are never loaded, and files from an earlier
+    bundle are not left behind
+
+    :param path: Path to the bundle's directory
+    :type path: str
+    :param state: A dictionary w/ string keys. Values can be primitives, numpy arrays, string collections, containers
+        and objects
+    :type state: dict
+    :return: The path to the bundle's manifest
+    :rtype: str
+    """
+    with lib.staged_directory(path) as staged_path:
+        writer = _BundleWriter(staged_path)
+        manifest = {'format_version': FORMAT_VERSION, 'state': writer.encode(state)}
+        with open(os.path.join(staged_path, MANIFEST_NAME), 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    logging.info('Wrote bundle w/ {} files to: {}'.format(writer.num_files, path))
+    return manifest_path
+
+
+def read_bundle(path, mmap_mode='r'):
+    """
+    Read state from a directory written by `write_bundle`
+
+    :param path: Path to the bundle's directory
+    :type path: str
+    :param mmap_mode: Memory map mode for `.npy` files, passed to `numpy.load`. `'r'` is read only, `'c'` is copy on
+        write, and None reads arrays into memory
+    :type mmap_mode: str
+    :return: The state, as passed to `write_bundle`
+    :rtype: dict
+    """
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise ValueError('No bundle manifest at: {}'.format(manifest_path))
+    with open(manifest_path) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError('Unsupported bundle format_version: {}. Expected: {}'.format(manifest.get('format_version'),
+                                                                                       FORMAT_VERSION))
+    return _BundleReader(path, mmap_mode).decode(manifest['state'])
+
+
+def encode_strings(strings):
+    """
+    Encode strings as one UTF-8 buffer, and the character offset of each string
+
+    :param strings: A list of strings
+    :type strings: [str]
+    :return: A tuple, containing a 1d uint8 array, and a 1d int64 array w/ `len(strings) + 1` offsets
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    offsets = numpy.zeros(len(strings) + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum([len(string) for string in strings])
+    buffer = numpy.frombuffer(''.join(strings).encode('utf-8'), dtype=numpy.uint8)
+    return buffer, offsets
+
+
+def decode_strings(buffer, offsets):
+    """
+    Decode strings encoded by `encode_strings`
+
+    :return: A list of strings
+    :rtype: [str]
+    """
+    text = numpy.asarray(buffer).tobytes().decode('utf-8')
+    offsets = numpy.asarray(offsets).tolist()
+    return [text[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+
+
+def _class_path(cls):
+    return '{}.{}'.format(cls.__module__, cls.__name__)
+
+
+def _import_class(class_path):
+    module_name, _, class_name = class_path.rpartition('.')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _is_string(value):
+    return isinstance(value, str)
+
+
+class _BundleWriter(object):
+    """
+    Encodes values as JSON compatible objects, and writes arrays to the bundle's directory
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.num_files = 0
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        elif isinstance(value, numpy.generic):
+            return value.item()
+        elif isinstance(value, type):
+            return {'__type__': _class_path(value)}
+        elif isinstance(value, slice):
+            return {'__slice__': [value.start, value.stop, value.step]}
+        elif isinstance(value, numpy.ndarray):
+            return self._encode_array(value)
+        elif isinstance(value, dict):
+            return self._encode_dict(value)
+        elif isinstance(value, (set, frozenset)):
+            if all(map(_is_string, value)):
+                return {'__set__': self._write_strings(sorted(value)), 'frozen': isinstance(value, frozenset)}
+            return self._write_pickle(value)
+        elif isinstance(value, tuple):
+            return {'__tuple__': [self.encode(item) for item in value]}
+        elif isinstance(value, list):
+            return [self.encode(item) for item in value]
+        elif hasattr(value, '__dict__') and not hasattr(value, '__slots__') and \
+                _class_path(type(value)).split('.')[0] in ('keras_pandas', 'sklearn'):
+            state = {key: self.encode(attribute) for key, attribute in vars(value).items() if not key.startswith('_')}
+            return {'__object__': _class_path(type(value)), 'state': state}
+        return self._write_pickle(value)
+
+    def _encode_array(self, array):
+        if array.dtype.kind in 'biuf':
+            if array.size <= MAX_INLINE_ARRAY_SIZE:
+                return {'__inline_array__': array.tolist(), 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            return {'__array__': self._write_array(array)}
+        elif array.dtype.kind == 'U' or (array.dtype == object and all(map(_is_string, array.ravel()))):
+            return {'__string_array__': self._write_strings(array.ravel().tolist()), 'dtype': array.dtype.str,
+                    'shape': list(array.shape)}
+        return self._write_pickle(array)
+
+    def _encode_dict(self, dictionary):
+        if type(dictionary) in (dict, defaultdict, Counter) and all(map(_is_string, dictionary.keys())):
+            # String to integer mappings (e.g. vocabularies and counts) are written as a string table of keys, and an
+            # array of values
+            is_integer = [isinstance(value, (int, numpy.integer)) and not isinstance(value, bool)
+                          for value in dictionary.values()]
+            if isinstance(dictionary, defaultdict) and dictionary.default_factory not in (int, None):
+                return self._write_pickle(dictionary)
+            if len(dictionary) > 0 and all(is_integer):
+                keys = sorted(dictionary.keys())
+                values = numpy.array([dictionary[key] for key in keys], dtype=numpy.int64)
+                return {'__vocabulary__': self._write_strings(keys), 'values': self._encode_array(values),
+                        'kind': type(dictionary).__name__,
+                        'default_factory': getattr(getattr(dictionary, 'default_factory', None), '__name__', None)}
+            if type(dictionary) is dict:
+                return {'__dict__': {key: self.encode(value) for key, value in dictionary.items()}}
+        return self._write_pickle(dictionary)
+
+    def _write_array(self, array):
+        file_name = '{}.npy'.format(self.num_files)
+        numpy.save(os.path.join(self.path, file_name), array, allow_pickle=False)
+        self.num_files += 1
+        return file_name
+
+    def _write_strings(self, strings):
+        buffer, offsets = encode_strings([str(string) for string in strings])
+        return {'buffer': self._write_array(buffer), 'offsets': self._encode_array(offsets)}
+
+    def _write_pickle(self, value):
+        logging.warning('Pickling value of type: {}, which has no array backed representation'.format(type(value)))
+        file_name = '{}.pkl'.format(self.num_files)
+        with open(os.path.join(self.path, file_name), 'wb') as pickle_file:
+            pickle.dump(value, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.num_files += 1
+        return {'__pickle__': file_name}
+
+
+class _BundleReader(object):
+    """
+    Decodes values encoded by `_BundleWriter`, and loads arrays from the bundle's directory
+    """
+
+    def __init__(self, path, mmap_mode):
+        self.path = path
+        self.mmap_mode = mmap_mode
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        elif not isinstance(value, dict):
+            return value
+
+        if '__type__' in value:
+            return _import_class(value['__type__'])
+        elif '__slice__' in value:
+            return slice(*value['__slice__'])
+        elif '__inline_array__' in value:
+            return numpy.array(value['__inline_array__'], dtype=value['dtype']).reshape(value['shape'])
+        elif '__array__' in value:
+            return numpy.load(os.path.join(self.path, value['__array__']), mmap_mode=self.mmap_mode,
+                              allow_pickle=False)
+        elif '__string_array__' in value:
+            strings = self._read_strings(value['__string_array__'])
+            array = numpy.empty(len(strings), dtype=value['dtype'])
+            array[:] = strings
+            return array.reshape(value['shape'])
+        elif '__set__' in value:
+            strings = self._read_strings(value['__set__'])
+            return frozenset(strings) if value['frozen'] else set(strings)
+        elif '__vocabulary__' in value:
+            keys = self._read_strings(value['__vocabulary__'])
+            values = self.decode(value['values']).tolist()
+            if value['kind'] == 'defaultdict':
+                default_factory = int if value['default_factory'] == 'int' else None
+                return defaultdict(default_factory, zip(keys, values))
+            elif value['kind'] == 'Counter':
+                return Counter(dict(zip(keys, values)))
+            return dict(zip(keys, values))
+        elif '__dict__' in value:
+            return {key: self.decode(item) for key, item in value['__dict__'].items()}
+        elif '__tuple__' in value:
+            return tuple(self.decode(item) for item in value['__tuple__'])
+        elif '__object__' in value:
+            cls = _import_class(value['__object__'])
+            obj = cls.__new__(cls)
+            obj.__dict__.update({key: self.decode(item) for key, item in value['state'].items()})
+            return obj
+        elif '__pickle__' in value:
+            with open(os.path.join(self.path, value['__pickle__']), 'rb') as pickle_file:
+                return pickle.load(pickle_file)
+        raise ValueError('Unknown encoded value: {}'.format(list(value.keys())))
+
+    def _read_strings(self, table):
+        buffer = numpy.load(os.path.join(self.path, table['buffer']), mmap_mode=self.mmap_mode, allow_pickle=False)
+        return decode_strings(buffer, self.decode(table['offsets']))
@@ -0,0 +1,237 @@
+"""
+Bounded memory, mergeable summaries, for fitting transformers on streams of observations
+"""
+import logging
+
+import numpy
+import pandas
+
+
+class SpaceSaving(object):
+    """
+    Approximate item counts for the most frequent items (heavy hitters), in a space-saving style summary w/ at most
+    `capacity` items.
+
+    Each update adds a chunk's counts to the summary, and then evicts all but the `capacity` most frequent items.
+    Retained counts are lower bounds of the true counts, and undercount by at most `error_bound_` (the sum of the
+    largest evicted count from each update). Increasing `capacity` decreases the error.
+    """
+
+    def __init__(self, capacity):
+        """
+        :param capacity: The maximum number of items retained in the summary
+        :type capacity: int
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1, got: {}'.format(capacity))
+        self.capacity = capacity
+        self.counts_ = pandas.Series(dtype=numpy.int64)
+        self.error_bound_ = 0
+
+    def update(self, counts):
+        """
+        Add a chunk's item counts to the summary
+
+        :param counts: A mapping from item to count, such as a `collections.Counter`
+        :type counts: {object: int}
+        :return: self
+        :rtype: SpaceSaving
+        """
+        chunk_counts = pandas.Series(counts, dtype=numpy.int64)
+        merged = self.counts_.add(chunk_counts, fill_value=0).astype(numpy.int64)
+
+        if merged.shape[0] > self.capacity:
+            merged = self._rank(merged)
+            self.error_bound_ += int(merged.iloc[self.capacity])
+            merged = merged.iloc[:self.capacity]
+            logging.debug('Evicted items from summary, error_bound_: {}'.format(self.error_bound_))
+
+        self.counts_ = merged
+        return self
+
+    def most_common(self, n=None):
+        """
+        The `n` most frequent items, w/ ties broken by sort order
+
+        :param n: Number of items to return. If None, all retained items are returned
+        :type n: int
+        :return: A list of (item, count) tuples, most frequent first
+        :rtype: [(object, int)]
+        """
+        ranked = self._rank(self.counts_)
+        if n is not None:
+            ranked = ranked.iloc[:n]
+        return list(zip(ranked.index, ranked.values.tolist()))
+
+    def keys(self):
+        return list(self.counts_.index)
+
+    def __contains__(self, item):
+        return item in self.counts_.index
+
+    def __len__(self):
+        return self.counts_.shape[0]
+
+    @staticmethod
+    def _rank(counts):
+        """
+        Sort counts by count (descending), and then by item (ascending)
+        """
+        return counts.sort_index().sort_values(ascending=False, kind='mergesort')
+
+
+class TDigest(object):
+    """
+    Approximate quantiles, w/ a merging t-digest (Dunning & Ertl). Values are summarized as weighted centroids, which
+    are smaller near the tails, so quantile error is smallest for extreme quantiles. Memory is bounded by
+    `compression` centroids, and larger values of `compression` decrease the error.
+
+    Each centroid also tracks its smallest and largest value. Centroids of identical values (e.g. repeated sequence
+    lengths) therefore give exact quantiles.
+    """
+
+    def __init__(self, compression=100):
+        """
+        :param compression: Controls the number of centroids retained
+        :type compression: int
+        """
+        if compression < 1:
+            raise ValueError('compression must be at least 1, got: {}'.format(compression))
+        self.compression = compression
+        self.means_ = numpy.array([], dtype=float)
+        self.weights_ = numpy.array([], dtype=float)
+        self.mins_ = numpy.array([], dtype=float)
+        self.maxs_ = numpy.array([], dtype=float)
+
+    @property
+    def count_(self):
+        return float(numpy.sum(self.weights_))
+
+    def update(self, values, weights=None):
+        """
+        Add values to the digest
+
+        :param values: A 1d array of values
+        :type values: numpy.ndarray
+        :param weights: Optional weights for each value
+        :type weights: numpy.ndarray
+        :return: self
+        :rtype: TDigest
+        """
+        values = numpy.asarray(values, dtype=float).ravel()
+        if weights is None:
+            weights = numpy.ones(values.shape[0], dtype=float)
+        weights = numpy.asarray(weights, dtype=float).ravel()
+
+        observed_mask = (~numpy.isnan(values)) & (weights > 0)
+        values = values[observed_mask]
+        self._merge(numpy.concatenate([self.means_, values]),
+                    numpy.concatenate([self.weights_, weights[observed_mask]]),
+                    numpy.concatenate([self.mins_, values]),
+                    numpy.concatenate([self.maxs_, values]))
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate the `q` quantile, by interpolating between centroid means. Estimates are bounded by the smallest and
+        largest value of the centroid containing the quantile
+
+        :param q: A quantile, between 0 and 1
+        :type q: float
+        :return: The estimated quantile, or `numpy.nan` if the digest is empty
+        :rtype: float
+        """
+        if self.means_.shape[0] == 0:
+            return numpy.nan
+
+        cumulative_weights = numpy.cumsum(self.weights_)
+        target = q * cumulative_weights[-1]
+        centroid = min(int(numpy.searchsorted(cumulative_weights, target, side='left')), len(self.weights_) - 1)
+
+        # Each centroid is located at the center of its weight
+        estimate = numpy.interp(target, cumulative_weights - self.weights_ / 2, self.means_)
+        return float(numpy.clip(estimate, self.mins_[centroid], self.maxs_[centroid]))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def _merge(self, means, weights, mins, maxs):
+        """
+        Sort centroids, and merge neighbouring centroids whose quantiles fall into the same unit of the k1 scale
+        function. This is vectorized, w/ one pass over the sorted centroids.
+        """
+        if means.shape[0] == 0:
+            return
+
+        order = numpy.argsort(means, kind='mergesort')
+        means = means[order]
+        weights = weights[order]
+        mins = mins[order]
+        maxs = maxs[order]
+
+        # Quantile at the center of each centroid, mapped through k1(q) = compression / (2 pi) * asin(2q - 1)
+        total_weight = numpy.sum(weights)
+        q = (numpy.cumsum(weights) - weights / 2) / total_weight
+        k = self.compression / (2 * numpy.pi) * numpy.arcsin(2 * q - 1)
+        bins = numpy.floor(k - k[0]).astype(numpy.int64)
+
+        # Merge centroids in the same bin, w/ weighted means. Bins are contiguous, because centroids are sorted
+        merged_weights = numpy.bincount(bins, weights=weights)
+        merged_sums = numpy.bincount(bins, weights=means * weights)
+        non_empty = merged_weights > 0
+        self.weights_ = merged_weights[non_empty]
+        self.means_ = merged_sums[non_empty] / self.weights_
+
+        bin_starts = numpy.concatenate([[0], numpy.flatnonzero(numpy.diff(bins)) + 1])
+        self.mins_ = numpy.minimum.reduceat(mins, bin_starts)
+        self.maxs_ = numpy.maximum.reduceat(maxs, bin_starts)
+
+
+class RunningMoments(object):
+    """
+    Running count, mean and variance for each column, w/ Welford's algorithm (merged in chunks, w/ Chan et al.'s
+    parallel update). Missing (NaN) values are ignored. This is more numerically stable than accumulating sums of
+    values and squares.
+    """
+
+    def __init__(self):
+        self.count_ = None
+        self.mean_ = None
+        self.m2_ = None
+
+    def update(self, X):
+        """
+        Add a chunk of observations
+
+        :param X: A 2d array, w/ one column per variable
+        :type X: numpy.ndarray
+        :return: self
+        :rtype: RunningMoments
+        """
+        X = numpy.asarray(X, dtype=float)
+        if len(X.shape) == 1:
+            X = X.reshape(-1, 1)
+
+        observed_mask = ~numpy.isnan(X)
+        chunk_count = observed_mask.sum(axis=0)
+        chunk_mean = numpy.where(observed_mask, X, 0).sum(axis=0) / numpy.maximum(chunk_count, 1)
+        chunk_m2 = numpy.where(observed_mask, (X - chunk_mean) ** 2, 0).sum(axis=0)
+
+        if self.count_ is None:
+            self.count_, self.mean_, self.m2_ = chunk_count, chunk_mean, chunk_m2
+            return self
+
+        count = self.count_ + chunk_count
+        delta = chunk_mean - self.mean_
+        safe_count = numpy.maximum(count, 1)
+        self.mean_ = self.mean_ + delta * chunk_count / safe_count
+        self.m2_ = self.m2_ + chunk_m2 + delta ** 2 * self.count_ * chunk_count / safe_count
+        self.count_ = count
+        return self
+
+    @property
+    def variance_(self):
+        """
+        Population variance of each column
+        """
+        return self.m2_ / numpy.maximum(self.count_, 1)
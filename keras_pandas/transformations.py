@@ -1,16 +1,35 @@
 """
 SKLearn-compliant transformers, for use as part of pipelines
 """
+import itertools
 import logging
-from collections import defaultdict
+import os
+import re
+import shutil
+import tempfile
+from collections import defaultdict, Counter
 
 import numpy
 import pandas
-from gensim.utils import simple_preprocess
-from keras_preprocessing.sequence import pad_sequences
+from joblib import Parallel, delayed, effective_n_jobs
+from numpy.lib.stride_tricks import as_strided
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils.validation import check_is_fitted, column_or_1d
 
+from keras_pandas.sketches import SpaceSaving, TDigest, RunningMoments
+
+# Tokens are runs of 2 to 15 alphabetic characters (word characters, excluding digits) that do not start w/ an
+# underscore. This is consistent w/ gensim's `simple_preprocess`, w/ the length filter folded into the regex
+TOKEN_PATTERN = re.compile(r'(?<![^\W\d])(?!_)[^\W\d]{2,15}(?![^\W\d])', re.UNICODE)
+
+# Documents are joined w/ a separator that is never part of a token, and tokenized in one pass
+DOCUMENT_SEPARATOR = '\x1e'
+SEPARATED_TOKEN_PATTERN = re.compile(TOKEN_PATTERN.pattern + '|' + DOCUMENT_SEPARATOR, re.UNICODE)
+
+# Smallest number of documents worth sending to a worker process. Below this, pool startup and pickling outweigh the
+# tokenization time saved, so smaller batches are processed in-process
+MIN_DOCUMENTS_PER_SHARD = 10000
+
 
 class EmbeddingVectorizer(TransformerMixin, BaseEstimator):
     """
@@ -25,12 +44,43 @@ class EmbeddingVectorizer(TransformerMixin, BaseEstimator):
      - `0` is used for the UNK token (tokens which were not seen during training)
      - `1` is used for the padding token (to fill out sequences that shorter than `embedding_sequence_length`)
 
+    Text is tokenized in batches (see `tokenize`), and token indices are looked up w/ a vectorized index over
+    `token_index_lookup`, and written into a preallocated `int32` array.
+
+    If `n_jobs` is not 1, observations are split into shards of at least `MIN_DOCUMENTS_PER_SHARD` documents, which
+    are tokenized in a process pool (smaller batches are tokenized in-process). During fit, each shard's token counts
+    are merged. During transform, each worker writes its shard directly into a shared, memory mapped output array, so
+    transformed shards are not sent back to the parent process.
+
+    The vocabulary can be pruned w/ `min_count` and `max_vocab_size`. Tokens are ranked by frequency (ties broken
+    alphabetically), so that the most common tokens receive the lowest indices. Pruned tokens are transformed into
+    the UNK token.
+
+    If `num_buckets` is set, no vocabulary is learned. Instead, each token is hashed (see `hash_buckets`) into one of
+    `num_buckets` indices, starting after the sentinel values (`2` to `num_buckets + 1`).
+
+    If `sketch_capacity` is set, `partial_fit` uses bounded memory summaries: token counts are approximated w/ a
+    `sketches.SpaceSaving` summary of the `sketch_capacity` most frequent tokens, and the median sequence length w/ a
+    `sketches.TDigest`.
     """
 
-    def __init__(self, max_sequence_length=None):
+    def __init__(self, max_sequence_length=None, n_jobs=1, min_count=1, max_vocab_size=None, num_buckets=None,
+                 sketch_capacity=None):
         # TODO Allow for UNK 'dropout' rate
 
+        if min_count < 1:
+            raise ValueError('min_count must be at least 1, got: {}'.format(min_count))
+        if max_vocab_size is not None and max_vocab_size < 0:
+            raise ValueError('max_vocab_size must be non-negative, got: {}'.format(max_vocab_size))
+        if num_buckets is not None and num_buckets < 1:
+            raise ValueError('num_buckets must be at least 1, got: {}'.format(num_buckets))
+
         self.max_sequence_length = max_sequence_length
+        self.n_jobs = n_jobs
+        self.min_count = min_count
+        self.max_vocab_size = max_vocab_size
+        self.num_buckets = num_buckets
+        self.sketch_capacity = sketch_capacity
 
         # Create a dictionary, with default value 0 (corresponding to UNK token)
         self.token_index_lookup = defaultdict(int)
@@ -44,46 +94,254 @@ class EmbeddingVectorizer(TransformerMixin, BaseEstimator):
         # Format text for processing, by creating a list of strings
         observations = self.prepare_input(X)
 
-        # Preprocess & tokenize
-        observations = list(map(lambda x: simple_preprocess(x), observations))
+        # Hashed tokens do not require a vocabulary, only (possibly) a sequence length
+        if self.num_buckets is not None:
+            if self.max_sequence_length is None:
+                _, sequence_lengths = tokenize(observations)
+                self.max_sequence_length = self.generate_embedding_sequence_length(sequence_lengths)
+            return self
+
+        # Preprocess, tokenize & count tokens
+        token_counts, sequence_lengths = self.count_tokens(observations)
 
         # Generate embedding_sequence_length, if necessary
         if self.max_sequence_length is None:
-            self.max_sequence_length = self.generate_embedding_sequence_length(observations)
+            self.max_sequence_length = self.generate_embedding_sequence_length(sequence_lengths)
 
-        # Update index_lookup
-        tokens = set()
-        for observation in observations:
-            tokens.update(observation)
+        # Update index_lookup, w/ the most frequent tokens first
+        tokens = self.select_vocabulary(token_counts)
 
         logging.debug('Fitting with tokens: {}'.format(tokens))
 
+        self._add_tokens(tokens)
+        return self
+
+    def partial_fit(self, X, y=None):
+        """
+        Incrementally update token counts and sequence length statistics w/ a chunk of training data. The vocabulary
+        (and `max_sequence_length`, if it was not set) is derived from the counts over all chunks seen so far, and is
+        rebuilt by `finalize_partial_fit` (or before the next transform). Sequence lengths are stored as a histogram,
+        so memory use does not grow w/ the number of observations.
+
+        :param X: A chunk of training data
+        :type X: numpy.ndarray
+        :return: self
+        :rtype: EmbeddingVectorizer
+        """
+        observations = self.prepare_input(X)
+
+        if getattr(self, '_token_counts', None) is None:
+            if self.sketch_capacity is None:
+                self._token_counts = Counter()
+                self._sequence_length_counts = Counter()
+            else:
+                self._token_counts = SpaceSaving(self.sketch_capacity)
+                self._sequence_length_digest = TDigest()
+            self._learn_max_sequence_length = self.max_sequence_length is None
+
+        if self.num_buckets is None:
+            token_counts, sequence_lengths = self.count_tokens(observations)
+            self._token_counts.update(token_counts)
+        else:
+            # Hashed tokens do not require a vocabulary
+            _, sequence_lengths = tokenize(observations)
+
+        lengths, length_counts = numpy.unique(sequence_lengths, return_counts=True)
+        if self.sketch_capacity is None:
+            self._sequence_length_counts.update(dict(zip(lengths.tolist(), length_counts.tolist())))
+        else:
+            self._sequence_length_digest.update(lengths, weights=length_counts)
+        self._partial_fit_pending = True
+        return self
+
+    def transform(self, X):
+        self.finalize_partial_fit()
+        observations = self.prepare_input(X)
+
+        # Tokenize, and convert to embedding format
+        shard_boundaries = _shard_boundaries(len(observations), effective_n_jobs(self.n_jobs),
+                                             min_shard_size=MIN_DOCUMENTS_PER_SHARD)
+        if len(shard_boundaries) <= 1:
+            X = self.transform_documents(observations)
+        else:
+            X = self._parallel_transform(observations, shard_boundaries)
+
+        if X.size > 0:
+            logging.info('Transformed text, max index: {}'.format(numpy.max(X)))
+
+        return X
+
+    def transform_documents(self, documents):
+        """
+        Convert a list of documents into padded sequences of token indices
+
+        :param documents: A list of strings
+        :type documents: [str]
+        :return: An array of token indices, w/ shape `(len(documents), max_sequence_length)`
+        :rtype: numpy.ndarray
+        """
+        tokens, sequence_lengths = tokenize(documents)
+        indices = self.lookup_indices(tokens)
+        return _pad_ragged(indices, sequence_lengths, self.max_sequence_length,
+                           pad_value=self.token_index_lookup['__PAD__'], dtype=numpy.int32)
+
+    def count_tokens(self, documents):
+        """
+        Tokenize documents, and count how often each token occurs. If `n_jobs` is not 1 (and there are enough
+        documents to shard), shards of documents are counted in a process pool, and the counts are merged.
+
+        :param documents: A list of strings
+        :type documents: [str]
+        :return: A tuple, containing a Counter of tokens, and a 1d array containing the number of tokens in each
+            document
+        :rtype: (collections.Counter, numpy.ndarray)
+        """
+        shard_boundaries = _shard_boundaries(len(documents), effective_n_jobs(self.n_jobs),
+                                             min_shard_size=MIN_DOCUMENTS_PER_SHARD)
+        if len(shard_boundaries) <= 1:
+            shard_results = [_count_tokens(documents)]
+        else:
+            logging.info('Counting tokens in {} shards, w/ n_jobs: {}'.format(len(shard_boundaries), self.n_jobs))
+            shard_results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_count_tokens)(documents[start:stop]) for start, stop in shard_boundaries)
+
+        token_counts = Counter()
+        for shard_token_counts, _ in shard_results:
+            token_counts.update(shard_token_counts)
+        sequence_lengths = numpy.concatenate([shard_sequence_lengths for _, shard_sequence_lengths in shard_results])
+
+        return token_counts, sequence_lengths
+
+    @property
+    def max_index_(self):
+        """
+        The largest token index produced by this vectorizer
+        """
+        self.finalize_partial_fit()
+        if self.num_buckets is not None:
+            return self.token_index_lookup['__PAD__'] + self.num_buckets
+        return max(self.token_index_lookup.values())
+
+    def _add_tokens(self, tokens):
+        """
+        Add tokens to `token_index_lookup`, w/ indices following the current largest index
+        """
         current_max_index = max(self.token_index_lookup.values())
-        index_range = range(current_max_index, len(tokens) + current_max_index)
+        index_range = range(current_max_index + 1, len(tokens) + current_max_index + 1)
         learned_token_index_lookup = dict(zip(tokens, index_range))
         self.token_index_lookup.update(learned_token_index_lookup)
+        self._token_index = None
         new_max_token_index = max(self.token_index_lookup.values())
         logging.info('Learned tokens, new_max_token_index: {}'.format(new_max_token_index))
-        return self
 
-    def transform(self, X):
-        observations = self.prepare_input(X)
+    @property
+    def partial_fit_pending(self):
+        """
+        Whether there are `partial_fit` chunks that have not been incorporated into the vocabulary yet. See
+        `finalize_partial_fit`
+        """
+        return getattr(self, '_partial_fit_pending', False)
+
+    def finalize_partial_fit(self):
+        """
+        Rebuild the vocabulary and `max_sequence_length` from the counts accumulated by `partial_fit`, if there are
+        chunks that have not been incorporated yet
+
+        :return: self
+        :rtype: EmbeddingVectorizer
+        """
+        if not self.partial_fit_pending:
+            return self
+
+        if self._learn_max_sequence_length:
+            if self.sketch_capacity is None:
+                median_sequence_length = _weighted_median(list(self._sequence_length_counts.keys()),
+                                                          list(self._sequence_length_counts.values()))
+            else:
+                median_sequence_length = self._sequence_length_digest.median()
+            if not numpy.isnan(median_sequence_length):
+                self.max_sequence_length = max([int(median_sequence_length), 1])
+                logging.info('Generated embedding_sequence_length: {}'.format(self.max_sequence_length))
+
+        # Reset to the sentinel tokens, and index the vocabulary from all chunks
+        if self.sketch_capacity is None:
+            token_counts = self._token_counts
+        else:
+            token_counts = dict(self._token_counts.most_common())
+        self.token_index_lookup = defaultdict(int)
+        self.token_index_lookup['UNK'] = 0
+        self.token_index_lookup['__PAD__'] = 1
+        self._add_tokens(self.select_vocabulary(token_counts))
+        self._partial_fit_pending = False
+        return self
 
-        # Convert to embedding format
-        observations = list(map(self.process_string, observations))
+    def select_vocabulary(self, token_counts):
+        """
+        Rank tokens by frequency (ties broken alphabetically), and drop tokens that are already indexed, occur fewer
+        than `min_count` times, or fall outside of the `max_vocab_size` most frequent tokens.
 
-        # Redo numpy formatting
-        observations = list(map(lambda x: numpy.array(x), observations))
+        :param token_counts: A mapping from token to number of occurrences
+        :type token_counts: collections.Counter
+        :return: A list of tokens to add to the vocabulary, most frequent first
+        :rtype: [str]
+        """
+        ranked_tokens = sorted((token for token, count in token_counts.items()
+                                if count >= self.min_count and token not in self.token_index_lookup),
+                               key=lambda token: (-token_counts[token], token))
+        if self.max_vocab_size is not None:
+            ranked_tokens = ranked_tokens[:self.max_vocab_size]
 
-        X = numpy.matrix(observations)
-        logging.info('Transformed text, max index: {}'.format(numpy.max(X)))
+        logging.info('Selected {} of {} distinct tokens, w/ min_count: {}, and max_vocab_size: {}'.format(
+            len(ranked_tokens), len(token_counts), self.min_count, self.max_vocab_size))
+        return ranked_tokens
 
+    def _parallel_transform(self, documents, shard_boundaries):
+        """
+        Transform shards of documents in a process pool. Workers write directly into a memory mapped output array,
+        rather than returning (and pickling) their results.
+        """
+        logging.info('Transforming {} shards, w/ n_jobs: {}'.format(len(shard_boundaries), self.n_jobs))
+        temp_dir = tempfile.mkdtemp(prefix='keras_pandas_')
+        try:
+            output = numpy.memmap(os.path.join(temp_dir, 'embedding_vectorizer.mmap'), dtype=numpy.int32, mode='w+',
+                                  shape=(len(documents), self.max_sequence_length))
+            Parallel(n_jobs=self.n_jobs)(
+                delayed(_transform_documents_into)(self, documents[start:stop], output, start)
+                for start, stop in shard_boundaries)
+
+            # Copy out of the memory mapped file, so that it can be removed
+            X = numpy.array(output)
+            del output
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
         return X
 
+    def lookup_indices(self, tokens):
+        """
+        Convert tokens to token indices, in one vectorized pass. Tokens that were not seen during fit are converted to
+        the UNK index. If `num_buckets` is set, tokens are hashed instead.
+
+        :param tokens: A 1d array of tokens
+        :type tokens: numpy.ndarray
+        :return: A 1d array of token indices, w/ the same length as `tokens`
+        :rtype: numpy.ndarray
+        """
+        if self.num_buckets is not None:
+            first_index = self.token_index_lookup['__PAD__'] + 1
+            return (hash_buckets(tokens, self.num_buckets) + first_index).astype(numpy.int32)
+
+        if getattr(self, '_token_index', None) is None:
+            self._token_index = pandas.Index(list(self.token_index_lookup.keys()))
+            self._token_index_values = numpy.array(list(self.token_index_lookup.values()), dtype=numpy.int32)
+
+        positions = self._token_index.get_indexer(tokens)
+        indices = self._token_index_values[positions]
+        indices[positions == -1] = self.token_index_lookup['UNK']
+        return indices
+
     @staticmethod
-    def generate_embedding_sequence_length(observation_series):
-        lengths = list(map(len, observation_series))
-        embedding_sequence_length = max([int(numpy.median(lengths)), 1])
+    def generate_embedding_sequence_length(sequence_lengths):
+        embedding_sequence_length = max([int(numpy.median(sequence_lengths)), 1])
         logging.info('Generated embedding_sequence_length: {}'.format(embedding_sequence_length))
 
         return embedding_sequence_length
@@ -103,21 +361,7 @@ class EmbeddingVectorizer(TransformerMixin, BaseEstimator):
         """
         logging.debug('Processing string: {}'.format(input_string))
 
-        # Convert to tokens
-        tokens = simple_preprocess(input_string)
-        logging.debug('Tokens: {}'.format(tokens))
-
-        # Convert to indices
-        indices = list(map(lambda x: self.token_index_lookup[x], tokens))
-        logging.debug('Indices: {}'.format(indices))
-
-        # Pad indices
-        padding_index = self.token_index_lookup['__PAD__']
-        padding_length = self.max_sequence_length
-        padded_indices = self.pad(indices, length=padding_length, pad_char=padding_index)
-        logging.debug('Padded indices: {}'.format(padded_indices))
-
-        return padded_indices
+        return self.transform([[input_string]])[0].tolist()
 
     @staticmethod
     def pad(input_sequence, length, pad_char):
@@ -156,10 +400,224 @@ class EmbeddingVectorizer(TransformerMixin, BaseEstimator):
         # Undo Numpy formatting
         observations = list(map(lambda x: x[0], X))
 
-        observations = map(str, observations)
+        observations = list(map(str, observations))
         return observations
 
 
+def tokenize(documents):
+    """
+    Tokenize a batch of documents. Tokenization is consistent with gensim's `simple_preprocess`: documents are
+    lowercased, and tokens are runs of 2 to 15 alphabetic characters, which do not start with an underscore.
+
+    All documents are joined and tokenized w/ one pass of a compiled regex, rather than one call per document.
+
+    :param documents: A list of strings
+    :type documents: [str]
+    :return: A tuple, containing a 1d array of every document's tokens (in order), and a 1d array containing the number
+        of tokens in each document
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    num_documents = len(documents)
+    joined = DOCUMENT_SEPARATOR.join(documents).lower()
+
+    # If the separator appears in the documents themselves, fall back to tokenizing each document separately
+    if joined.count(DOCUMENT_SEPARATOR) != max(num_documents - 1, 0):
+        token_lists = [TOKEN_PATTERN.findall(document.lower()) for document in documents]
+        sequence_lengths = numpy.array(list(map(len, token_lists)), dtype=numpy.int64)
+        tokens = numpy.empty(int(sequence_lengths.sum()), dtype=object)
+        tokens[:] = list(itertools.chain.from_iterable(token_lists))
+        return tokens, sequence_lengths
+
+    matches = numpy.empty(0, dtype=object) if num_documents == 0 else \
+        numpy.array(SEPARATED_TOKEN_PATTERN.findall(joined) + [DOCUMENT_SEPARATOR], dtype=object)
+
+    # Documents are delimited by the separator matches. A trailing separator is added above, so each document is
+    # terminated by exactly one separator
+    separator_positions = numpy.flatnonzero(matches == DOCUMENT_SEPARATOR)
+    sequence_lengths = numpy.diff(numpy.concatenate([[-1], separator_positions])) - 1
+    tokens = numpy.delete(matches, separator_positions)
+    return tokens, sequence_lengths
+
+
+def hash_buckets(values, num_buckets):
+    """
+    Hash values into buckets `0` to `num_buckets - 1`. The hash is pandas' siphash w/ a fixed key, so the results are
+    stable across processes and sessions (unlike Python's builtin `hash` for strings).
+
+    :param values: A 1d array of strings
+    :type values: numpy.ndarray
+    :param num_buckets: Number of buckets
+    :type num_buckets: int
+    :return: A 1d array of bucket indices, w/ the same length as `values`
+    :rtype: numpy.ndarray
+    """
+    values = numpy.asarray(values, dtype=object)
+    hashes = pandas.util.hash_array(values, categorize=False)
+    return (hashes % numpy.uint64(num_buckets)).astype(numpy.int64)
+
+
+def compact_dtype(dtype, max_index=None):
+    """
+    The narrowest dtype that a transformer's output can be cast to, w/o losing information that Keras uses. Booleans
+    are cast to `uint8` and floats to `float32`. Integer indices are cast to `int16` or `int32`, depending on the
+    largest index. Other dtypes (e.g. strings, or integers w/o a known largest index) are unchanged.
+
+    :param dtype: The dtype of the transformer's output
+    :type dtype: numpy.dtype
+    :param max_index: The largest index produced by the transformer (e.g. its `max_index_`), if it is index encoded
+    :type max_index: int
+    :return: The compact dtype
+    :rtype: numpy.dtype
+    """
+    dtype = numpy.dtype(dtype)
+    if dtype.kind == 'b':
+        return numpy.dtype(numpy.uint8)
+    if dtype.kind == 'f':
+        return numpy.dtype(numpy.float32)
+    if dtype.kind in 'iu' and max_index is not None:
+        for candidate in [numpy.int16, numpy.int32]:
+            if max_index <= numpy.iinfo(candidate).max:
+                return numpy.dtype(candidate)
+    return dtype
+
+
+def _weighted_median(values, counts):
+    """
+    Median of `values`, where each value occurs `counts` times. This is consistent w/ `numpy.median` of the expanded
+    values, w/o expanding them.
+    """
+    order = numpy.argsort(values)
+    values = numpy.asarray(values, dtype=float)[order]
+    cumulative_counts = numpy.cumsum(numpy.asarray(counts)[order])
+    if len(values) == 0:
+        return numpy.nan
+    total = cumulative_counts[-1]
+    lower = values[numpy.searchsorted(cumulative_counts, (total - 1) // 2, side='right')]
+    upper = values[numpy.searchsorted(cumulative_counts, total // 2, side='right')]
+    return (lower + upper) / 2
+
+
+def _count_tokens(documents):
+    """
+    Tokenize a shard of documents, and count each token. This is a module level function, so that it can be sent to
+    worker processes.
+    """
+    tokens, sequence_lengths = tokenize(documents)
+    return Counter(tokens), sequence_lengths
+
+
+def _transform_documents_into(vectorizer, documents, output, start):
+    """
+    Transform a shard of documents w/ a fitted EmbeddingVectorizer, and write the results into `output`, starting at row
+    `start`. This is a module level function, so that it can be sent to worker processes.
+    """
+    output[start:start + len(documents)] = vectorizer.transform_documents(documents)
+
+
+def _shard_boundaries(num_items, num_shards, min_shard_size=1):
+    """
+    Split `num_items` into (at most) `num_shards` contiguous, similarly sized shards, each containing at least
+    `min_shard_size` items (unless there is only one shard)
+
+    :return: A list of (start, stop) tuples
+    :rtype: [(int, int)]
+    """
+    num_shards = max(min(num_shards, num_items // max(min_shard_size, 1)), 1)
+    boundaries = numpy.linspace(0, num_items, num_shards + 1).astype(int)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def _pad_ragged(values, sequence_lengths, max_sequence_length, pad_value, dtype, padding='post', truncating='post'):
+    """
+    Convert a ragged batch of sequences (all sequences' values concatenated, and each sequence's length) into a
+    padded, fixed-width array.
+
+    :param values: A 1d array, containing every sequence's values (in order)
+    :type values: numpy.ndarray
+    :param sequence_lengths: A 1d array, containing the length of each sequence
+    :type sequence_lengths: numpy.ndarray
+    :param max_sequence_length: Width of the output array
+    :type max_sequence_length: int
+    :param pad_value: Value used to fill out sequences that are shorter than `max_sequence_length`
+    :param dtype: dtype of the output array
+    :param padding: `'pre'` or `'post'`, whether to pad before or after each sequence
+    :type padding: str
+    :param truncating: `'pre'` or `'post'`, whether to remove values from the beginning or end of sequences that are
+        longer than `max_sequence_length`
+    :type truncating: str
+    :return: An array, w/ shape `(len(sequence_lengths), max_sequence_length)`
+    :rtype: numpy.ndarray
+    """
+    if padding not in ('pre', 'post'):
+        raise ValueError('padding must be \'pre\' or \'post\', got: {}'.format(padding))
+    if truncating not in ('pre', 'post'):
+        raise ValueError('truncating must be \'pre\' or \'post\', got: {}'.format(truncating))
+
+    num_sequences = len(sequence_lengths)
+    padded = numpy.full((num_sequences, max_sequence_length), pad_value, dtype=dtype)
+
+    # Compute the output row and column for each value, and drop values past max_sequence_length
+    rows = numpy.repeat(numpy.arange(num_sequences), sequence_lengths)
+    sequence_starts = numpy.cumsum(sequence_lengths) - sequence_lengths
+    columns = numpy.arange(len(values)) - numpy.repeat(sequence_starts, sequence_lengths)
+    if truncating == 'pre':
+        columns -= numpy.repeat(numpy.maximum(sequence_lengths - max_sequence_length, 0), sequence_lengths)
+    keep_mask = (columns >= 0) & (columns < max_sequence_length)
+    if padding == 'pre':
+        columns += numpy.repeat(numpy.maximum(max_sequence_length - sequence_lengths, 0), sequence_lengths)
+
+    padded[rows[keep_mask], columns[keep_mask]] = values[keep_mask]
+    return padded
+
+
+def _flatten_sequences(X, return_values=True):
+    """
+    Convert a batch of sequences into a ragged layout: all sequences' values concatenated, and each sequence's length
+
+    :param X: The sequences. Either a 2d object array w/ one sequence per row, in its first column (e.g.
+        `DataFrame[[variable]].values`), a 1d object array or list of sequences (e.g. lists or arrays), or a numeric
+        array, where each row is a sequence
+    :param return_values: Whether to concatenate the sequences' values. If False, only lengths are computed
+    :type return_values: bool
+    :return: A tuple, containing a 1d array of values (or None), and a 1d int64 array of sequence lengths
+    :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    if isinstance(X, numpy.ndarray) and X.dtype != object:
+        X = X.reshape(-1, 1) if len(X.shape) == 1 else X.reshape(X.shape[0], -1)
+        sequence_lengths = numpy.full(X.shape[0], X.shape[1], dtype=numpy.int64)
+        return (X.ravel() if return_values else None), sequence_lengths
+
+    if isinstance(X, numpy.ndarray) and len(X.shape) == 2:
+        X = X[:, 0]
+    sequence_lengths = numpy.fromiter(map(len, X), dtype=numpy.int64, count=len(X))
+    if not return_values:
+        return None, sequence_lengths
+
+    if sequence_lengths.sum() == 0:
+        return numpy.empty(0), sequence_lengths
+    return numpy.concatenate([numpy.ravel(sequence) for sequence in X]), sequence_lengths
+
+
+def _stacked_labels(y, warn=False):
+    """
+    Flatten labels for encoding. A single column (or 1d array) is encoded as a 1d array, consistent w/ `column_or_1d`,
+    and several columns (e.g. a group of variables w/ a shared vocabulary) are encoded together, and keep their 2d
+    shape.
+
+    :param y: A 1d array, or a 2d array w/ one column for each variable
+    :type y: numpy.ndarray
+    :param warn: Whether to warn when a single column is converted to a 1d array, as w/ `column_or_1d`
+    :type warn: bool
+    :return: A tuple, containing a 1d array of labels, and the shape of the encoded output
+    :rtype: (numpy.ndarray, tuple)
+    """
+    y = numpy.asarray(y)
+    if len(y.shape) == 2 and y.shape[1] > 1:
+        return y.ravel(), y.shape
+    y = column_or_1d(y, warn=warn)
+    return y, y.shape
+
+
 class CategoricalImputer(BaseEstimator, TransformerMixin):
     """
     Impute missing values from a categorical/string np.ndarray or pd.Series
@@ -171,7 +629,8 @@ class CategoricalImputer(BaseEstimator, TransformerMixin):
         `missing_values` will be imputed. None and np.nan are treated
         as being the same, use the string value "NaN" for them.
     copy : boolean, optional (default=True)
-        If True, a copy of X will be created.
+        If True, a copy of X will be created. If False, imputation is done in place, which avoids a copy for
+        callers that already own X (e.g. the output of a previous pipeline step).
     strategy : string, optional (default = 'most_frequent')
         The imputation strategy.
         - If "most_frequent", then replace missing using the most frequent
@@ -184,6 +643,10 @@ class CategoricalImputer(BaseEstimator, TransformerMixin):
         you don't want to impute with the mode, or if there are multiple
         modes in your data and you want to choose a particular one. If
         `strategy` is not set to `constant`, this parameter is ignored.
+    sketch_capacity : int, optional (default=None)
+        If set, `partial_fit` counts levels w/ a bounded memory
+        `sketches.SpaceSaving` summary, and only the `sketch_capacity`
+        most frequent levels are known values.
     Attributes
     ----------
     fill_ : str
@@ -196,9 +659,11 @@ class CategoricalImputer(BaseEstimator, TransformerMixin):
             strategy='most_frequent',
             fill_value='?',
             fill_unknown_labels=False,
-            copy=True
+            copy=True,
+            sketch_capacity=None
     ):
         self.missing_values = missing_values
+        self.sketch_capacity = sketch_capacity
         self.copy = copy
         self.fill_value = fill_value
         self.strategy = strategy
@@ -240,11 +705,55 @@ class CategoricalImputer(BaseEstimator, TransformerMixin):
             self.fill_ = modes[0]
 
         self.known_values.update(set(X))
+        self._known_values_index = None
 
         logging.info('Learned {} known_values: {}'.format(len(self.known_values), self.known_values))
 
         return self
 
+    def partial_fit(self, X, y=None):
+        """
+        Incrementally update the fill value and known values w/ a chunk of training data. Level counts are accumulated
+        across chunks, so that the most frequent value is over all chunks seen so far. Unlike `fit`, ties between
+        most frequent values are broken by sort order, rather than raising an error.
+        Parameters
+        ----------
+            X : np.ndarray or pd.Series
+                A chunk of training data.
+            y : Passthrough for ``Pipeline`` compatibility.
+        Returns
+        -------
+            self: CategoricalImputer
+        """
+        mask = self._get_null_mask(X, self.missing_values)
+        X = numpy.asarray(X)[~numpy.asarray(mask)]
+
+        if self.sketch_capacity is not None:
+            # Count levels in a bounded summary, and only retain its levels as known values
+            if getattr(self, '_level_sketch', None) is None:
+                self._level_sketch = SpaceSaving(self.sketch_capacity)
+            self._level_sketch.update(pandas.Series(X).value_counts())
+            if self.strategy == 'most_frequent' and len(self._level_sketch) > 0:
+                self.fill_ = self._level_sketch.most_common(1)[0][0]
+            self.known_values = {'UNK'}.union(self._level_sketch.keys())
+        else:
+            if self.strategy == 'most_frequent':
+                chunk_counts = pandas.Series(X).value_counts()
+                if getattr(self, '_value_counts', None) is None:
+                    self._value_counts = chunk_counts
+                else:
+                    self._value_counts = self._value_counts.add(chunk_counts, fill_value=0)
+                if self._value_counts.shape[0] > 0:
+                    modes = self._value_counts.index[self._value_counts == self._value_counts.max()]
+                    self.fill_ = sorted(modes)[0]
+            self.known_values.update(set(X))
+
+        if self.strategy == 'constant':
+            self.fill_ = self.fill_value
+        self._known_values_index = None
+
+        return self
+
     def transform(self, X):
         """
         Replaces missing values in the input data with the most frequent value
@@ -264,12 +773,11 @@ class CategoricalImputer(BaseEstimator, TransformerMixin):
         if self.copy:
             X = X.copy()
 
-        null_mask = self._get_null_mask(X, self.missing_values)
-        X[null_mask] = self.fill_
-
+        # Null values and unknown labels are both replaced w/ fill_, so build one mask and fill in a single pass
+        replace_mask = self._get_null_mask(X, self.missing_values)
         if self.fill_unknown_labels:
-            unknown_label_mask = self._get_unknown_label_mask(X)
-            X[unknown_label_mask] = self.fill_
+            replace_mask = replace_mask | self._get_unknown_label_mask(X)
+        X[replace_mask] = self.fill_
 
         return numpy.asarray(X)
 
@@ -287,15 +795,53 @@ class CategoricalImputer(BaseEstimator, TransformerMixin):
 
     def _get_unknown_label_mask(self, X):
         """
-        Compute the boolean mask X == missing_values.
+        Compute the boolean mask of values in X that were not seen during fit. This is a single vectorized lookup
+        against a hash index of known_values, and has the same shape as X.
         """
-        should_replace = list()
-        for element in X:
-            if element[0] in self.known_values:
-                should_replace.append(False)
-            else:
-                should_replace.append(True)
-        return should_replace
+        if getattr(self, '_known_values_index', None) is None:
+            self._known_values_index = pandas.Index(list(self.known_values))
+
+        values = numpy.asarray(X)
+        unknown_label_mask = self._known_values_index.get_indexer(values.ravel()) == -1
+        return unknown_label_mask.reshape(values.shape)
+
+
+class MeanImputer(BaseEstimator, TransformerMixin):
+    """
+    Impute missing (NaN) numerical values w/ the mean of each column. Unlike sklearn's `Imputer`, this imputer supports
+    `partial_fit`, by accumulating each column's running mean (see `sketches.RunningMoments`). Columns w/o any
+    non-missing values are imputed w/ 0.
+
+    Attributes
+    ----------
+    statistics_ : numpy.ndarray
+        The imputation fill value for each column
+    """
+
+    def __init__(self, copy=True):
+        self.copy = copy
+
+    def fit(self, X, y=None):
+        self.moments_ = None
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        if getattr(self, 'moments_', None) is None:
+            self.moments_ = RunningMoments()
+        self.moments_.update(X)
+
+        self.statistics_ = numpy.where(self.moments_.count_ > 0, self.moments_.mean_, 0)
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, 'statistics_')
+        X = numpy.array(X, dtype=float) if self.copy else numpy.asarray(X, dtype=float)
+        if len(X.shape) == 1:
+            X = X.reshape(-1, 1)
+
+        missing_rows, missing_columns = numpy.nonzero(numpy.isnan(X))
+        X[missing_rows, missing_columns] = self.statistics_[missing_columns]
+        return X
 
 
 class LabelEncoder(BaseEstimator, TransformerMixin):
@@ -336,12 +882,21 @@ class LabelEncoder(BaseEstimator, TransformerMixin):
     >>> list(le.inverse_transform([2, 2, 1]))
     ['tokyo', 'tokyo', 'paris']
 
+    If `sketch_capacity` is set, `partial_fit` counts labels w/ a bounded memory `sketches.SpaceSaving` summary, and
+    only the `sketch_capacity` most frequent labels are classes.
+
+    Labels may also be a 2d array w/ several columns (e.g. a group of variables from the same domain), in which case
+    one set of classes is learned over every column, and the encoding keeps the 2d shape.
+
     See also
     --------
     sklearn.preprocessing.OneHotEncoder : encode categorical integer features
         using a one-hot aka one-of-K scheme.
     """
 
+    def __init__(self, sketch_capacity=None):
+        self.sketch_capacity = sketch_capacity
+
     def fit(self, y):
         """Fit label encoder
 
@@ -354,11 +909,45 @@ class LabelEncoder(BaseEstimator, TransformerMixin):
         -------
         self : returns an instance of self.
         """
-        y = column_or_1d(y, warn=True)
+        y, _ = _stacked_labels(y, warn=True)
         y = numpy.append(y, ['UNK'])
         self.classes_ = numpy.unique(y)
+        self._class_index = None
+        return self
+
+    def partial_fit(self, y):
+        """Incrementally update the label encoder w/ a chunk of target values. Classes are the union of all chunks seen
+        so far. Adding classes may change the encoding of previously seen classes.
+
+        Parameters
+        ----------
+        y : array-like of shape (n_samples,)
+            A chunk of target values.
+
+        Returns
+        -------
+        self : returns an instance of self.
+        """
+        y, _ = _stacked_labels(y, warn=True)
+        if self.sketch_capacity is not None:
+            if getattr(self, '_label_sketch', None) is None:
+                self._label_sketch = SpaceSaving(self.sketch_capacity)
+            self._label_sketch.update(pandas.Series(y).value_counts())
+            self.classes_ = numpy.union1d(['UNK'], self._label_sketch.keys())
+        else:
+            classes = getattr(self, 'classes_', numpy.array(['UNK']))
+            self.classes_ = numpy.union1d(classes, y)
+        self._class_index = None
         return self
 
+    @property
+    def max_index_(self):
+        """
+        The largest encoding produced by this encoder
+        """
+        check_is_fitted(self, 'classes_')
+        return len(self.classes_) - 1
+
     def fit_transform(self, y, **kwargs):
         """Fit label encoder and return encoded labels
 
@@ -372,10 +961,11 @@ class LabelEncoder(BaseEstimator, TransformerMixin):
         y : array-like of shape [n_samples]
         :param **kwargs:
         """
-        y = column_or_1d(y, warn=True)
+        y, shape = _stacked_labels(y, warn=True)
         y = numpy.append(y, ['UNK'])
         self.classes_, y = numpy.unique(y, return_inverse=True)
-        return y
+        self._class_index = None
+        return y[:-1].reshape(shape)
 
     def transform(self, y):
         """Transform labels to normalized encoding.
@@ -390,14 +980,14 @@ class LabelEncoder(BaseEstimator, TransformerMixin):
         y : array-like of shape [n_samples]
         """
         check_is_fitted(self, 'classes_')
-        y = column_or_1d(y, warn=True)
-        y = numpy.array(list(map(lambda x: x if x in self.classes_ else 'UNK', y)))
+        y, shape = _stacked_labels(y, warn=True)
 
-        classes = numpy.unique(y)
-        if len(numpy.intersect1d(classes, self.classes_)) < len(classes):
-            diff = numpy.setdiff1d(classes, self.classes_)
-            raise ValueError("y contains new labels: %s" % str(diff))
-        return numpy.searchsorted(self.classes_, y)
+        # Look up all labels in one vectorized pass. Labels that were not seen during fit are not in the index (-1),
+        # and are encoded as the UNK class
+        class_index = self._get_class_index()
+        y = class_index.get_indexer(y)
+        y[y == -1] = self._unk_index
+        return y.reshape(shape)
 
     def inverse_transform(self, y):
         """Transform labels back to original encoding.
@@ -414,11 +1004,57 @@ class LabelEncoder(BaseEstimator, TransformerMixin):
         check_is_fitted(self, 'classes_')
 
         diff = numpy.setdiff1d(y, numpy.arange(len(self.classes_)))
-        if diff:
+        if len(diff) > 0:
             raise ValueError("y contains new labels: %s" % str(diff))
         y = numpy.asarray(y)
         return self.classes_[y]
 
+    def _get_class_index(self):
+        """
+        Build (and cache) a hash index over `classes_`, mapping each label to its encoding. Because `classes_` is
+        sorted, the positions in this index match the encoding produced by `numpy.searchsorted`.
+
+        :return: An index over the fitted classes
+        :rtype: pandas.Index
+        """
+        if getattr(self, '_class_index', None) is None:
+            self._class_index = pandas.Index(self.classes_)
+            self._unk_index = self._class_index.get_loc('UNK')
+        return self._class_index
+
+
+class HashingEncoder(BaseEstimator, TransformerMixin):
+    """
+    Encode labels into one of `num_buckets` buckets, w/ a stable hash (see `hash_buckets`). Bucket indices start at
+    `offset`.
+
+    No vocabulary is learned, so fitting is a no-op, memory use does not grow w/ the number of distinct labels, and
+    the encoding is identical across processes and chunks of data. Distinct labels may share a bucket.
+    """
+
+    def __init__(self, num_buckets, offset=0):
+        if num_buckets < 1:
+            raise ValueError('num_buckets must be at least 1, got: {}'.format(num_buckets))
+        self.num_buckets = num_buckets
+        self.offset = offset
+
+    def fit(self, X, y=None):
+        return self
+
+    def partial_fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        y, shape = _stacked_labels(X)
+        return (hash_buckets(y, self.num_buckets) + self.offset).reshape(shape)
+
+    @property
+    def max_index_(self):
+        """
+        The largest encoding produced by this encoder
+        """
+        return self.offset + self.num_buckets - 1
+
 
 class TypeConversionEncoder(BaseEstimator, TransformerMixin):
 
@@ -429,33 +1065,180 @@ class TypeConversionEncoder(BaseEstimator, TransformerMixin):
     def fit(self, X, y=None):
         return self
 
+    def partial_fit(self, X, y=None):
+        return self
+
     def transform(self, X):
         return X.astype(self.conversion_type)
 
 
 class TimeSeriesVectorizer(TransformerMixin, BaseEstimator):
+    """
+    Convert variable length sequences (e.g. sensor windows) into a fixed width float32 array, w/ shape
+    `(num_sequences, max_sequence_length)`.
+
+    Sequences are flattened into one buffer of values, w/ each sequence's length, and scattered into a preallocated
+    output array. `transform` accepts one sequence per row (e.g. lists or arrays, as in `DataFrame[[variable]].values`),
+    and `transform_ragged` accepts values and offsets directly (as in Arrow's list layout), w/o per sequence Python
+    objects.
 
-    def __init__(self, max_sequence_length=None):
+    Sequences shorter than `max_sequence_length` are padded w/ `pad_value`. To distinguish padding from genuine values
+    (e.g. leading zeros), set `pad_value` to a value outside the data's range, such as `numpy.nan`.
+    """
+
+    def __init__(self, max_sequence_length=None, padding='pre', truncating='pre', pad_value=0.):
+        """
+        :param max_sequence_length: Width of the output. If None, it is learned as the shortest sequence length
+        :type max_sequence_length: int
+        :param padding: `'pre'` or `'post'`, whether to pad before or after sequences that are shorter than
+            `max_sequence_length`
+        :type padding: str
+        :param truncating: `'pre'` or `'post'`, whether to remove values from the beginning or end of sequences that
+            are longer than `max_sequence_length`
+        :type truncating: str
+        :param pad_value: Value used to fill out sequences that are shorter than `max_sequence_length`
+        :type pad_value: float
+        """
         self.max_sequence_length = max_sequence_length
+        self.padding = padding
+        self.truncating = truncating
+        self.pad_value = pad_value
 
     def fit(self, X, y=None):
         if self.max_sequence_length is None:
-            sequence_lengths = list(map(lambda x: len(x[0]), X))
-            self.max_sequence_length = min(sequence_lengths)
+            _, sequence_lengths = _flatten_sequences(X, return_values=False)
+            self.max_sequence_length = int(sequence_lengths.min())
             logging.info('Set max_sequence_length to: {}'.format(self.max_sequence_length))
         return self
 
+    def partial_fit(self, X, y=None):
+        """
+        Incrementally update the sequence length w/ a chunk of training data. If `max_sequence_length` was not set, it
+        is the shortest sequence length over all chunks seen so far.
+        """
+        if getattr(self, '_learn_max_sequence_length', None) is None:
+            self._learn_max_sequence_length = self.max_sequence_length is None
+
+        if self._learn_max_sequence_length and len(X) > 0:
+            _, sequence_lengths = _flatten_sequences(X, return_values=False)
+            chunk_min_sequence_length = int(sequence_lengths.min())
+            if self.max_sequence_length is None:
+                self.max_sequence_length = chunk_min_sequence_length
+            else:
+                self.max_sequence_length = min(self.max_sequence_length, chunk_min_sequence_length)
+        return self
+
     def transform(self, X):
-        # Convert data types and reshape
-        # TODO There must be a way to do this w/o explicitly changing data types and unraveling
-        results = list()
-        for sequence in X:
-            sequence = sequence[0]
-            results.append(list(sequence))
-
-        # Covert outermost layer to a numpy array
-        X = numpy.array(results)
-
-        # Pad all of the sequences to be the same length
-        X = pad_sequences(X, maxlen=self.max_sequence_length)
-        return X
+        values, sequence_lengths = _flatten_sequences(X)
+        return _pad_ragged(values, sequence_lengths, self.max_sequence_length, pad_value=self.pad_value,
+                           dtype=numpy.float32, padding=self.padding, truncating=self.truncating)
+
+    def transform_ragged(self, values, offsets):
+        """
+        Transform sequences in a ragged layout, w/o building per sequence Python objects
+
+        :param values: A 1d array, containing every sequence's values (in order)
+        :type values: numpy.ndarray
+        :param offsets: A 1d array, w/ `num_sequences + 1` entries. Sequence `i` is `values[offsets[i]:offsets[i + 1]]`
+        :type offsets: numpy.ndarray
+        :return: A float32 array, w/ shape `(num_sequences, max_sequence_length)`
+        :rtype: numpy.ndarray
+        """
+        offsets = numpy.asarray(offsets, dtype=numpy.int64)
+        values = numpy.asarray(values)[offsets[0]:offsets[-1]]
+        return _pad_ragged(values, numpy.diff(offsets), self.max_sequence_length, pad_value=self.pad_value,
+                           dtype=numpy.float32, padding=self.padding, truncating=self.truncating)
+
+
+class SlidingWindowVectorizer(TransformerMixin, BaseEstimator):
+    """
+    Convert a flat numerical column into sliding windows of each row's previous values (lags), w/ shape
+    `(num_observations, window_length)`. Windows are ordered oldest to newest, and are padded w/ `pad_value` where
+    there is not enough history.
+
+    Input columns are the values, followed by an optional grouping key (if `grouped`), and an optional ordering key
+    (if `ordered`), e.g. `DataFrame[['price', 'ticker', 'date']].values`. Windows are built within each group, in order
+    of the ordering key (or in row order), and returned in the original row order.
+
+    Windows are built as a strided view over a padded copy of the values, rather than storing a list per row. If rows
+    are already in order, and there is a single group, the view is returned directly, w/o copying windows.
+    """
+
+    def __init__(self, window_length, grouped=False, ordered=False, include_current=False, pad_value=0.):
+        """
+        :param window_length: Number of values in each window
+        :type window_length: int
+        :param grouped: Whether the second input column is a grouping key (e.g. a ticker, or a sensor ID)
+        :type grouped: bool
+        :param ordered: Whether the last input column is an ordering key (e.g. a timestamp)
+        :type ordered: bool
+        :param include_current: Whether each row's window ends w/ its own value. If False, windows contain only
+            previous values, so that a row's value can be predicted w/o leaking it
+        :type include_current: bool
+        :param pad_value: Value used to fill out windows w/o enough history, and to replace missing values
+        :type pad_value: float
+        """
+        self.window_length = window_length
+        self.grouped = grouped
+        self.ordered = ordered
+        self.include_current = include_current
+        self.pad_value = pad_value
+
+    def fit(self, X, y=None):
+        if self.window_length < 1:
+            raise ValueError('window_length must be a positive integer, got: {}'.format(self.window_length))
+        return self
+
+    def partial_fit(self, X, y=None):
+        return self.fit(X, y)
+
+    def transform(self, X):
+        X = numpy.asarray(X)
+        if len(X.shape) == 1:
+            X = X.reshape(-1, 1)
+        num_observations = X.shape[0]
+        if num_observations == 0:
+            return numpy.empty((0, self.window_length), dtype=numpy.float32)
+
+        values = numpy.asarray(X[:, 0], dtype=numpy.float32)
+        values = numpy.where(numpy.isnan(values), numpy.float32(self.pad_value), values)
+
+        # Sort rows by group, and then by order, w/ a stable sort so that ties keep their row order
+        sort_keys = list()
+        if self.ordered:
+            sort_keys.append(pandas.factorize(X[:, -1], sort=True)[0])
+        if self.grouped:
+            sort_keys.append(pandas.factorize(X[:, 1], sort=True)[0])
+        order = numpy.lexsort(sort_keys) if len(sort_keys) > 0 else None
+        if order is not None and numpy.array_equal(order, numpy.arange(num_observations)):
+            order = None
+        sorted_values = values if order is None else values[order]
+
+        # Each group is preceded by window_length pad values, so that windows never span groups
+        if self.grouped:
+            group_keys = sort_keys[-1] if order is None else sort_keys[-1][order]
+            group_indices = numpy.cumsum(numpy.concatenate([[True], group_keys[1:] != group_keys[:-1]])) - 1
+            num_groups = int(group_indices[-1]) + 1
+        else:
+            group_indices = 0
+            num_groups = 1
+        positions = numpy.arange(num_observations) + self.window_length * (group_indices + 1)
+        padded = numpy.full(num_observations + self.window_length * num_groups, self.pad_value, dtype=numpy.float32)
+        padded[positions] = sorted_values
+
+        # Row r of the view is padded[r:r + window_length], so the window ending before position p starts at row
+        # p - window_length
+        itemsize = padded.strides[0]
+        all_windows = as_strided(padded, shape=(len(padded) - self.window_length + 1, self.window_length),
+                                 strides=(itemsize, itemsize), writeable=False)
+        rows = positions - self.window_length + int(self.include_current)
+
+        if order is None and num_groups <= 1:
+            start = int(self.include_current)
+            return all_windows[start:start + num_observations]
+
+        if order is not None:
+            inverse_order = numpy.empty_like(order)
+            inverse_order[order] = numpy.arange(num_observations)
+            rows = rows[inverse_order]
+        return all_windows[rows]
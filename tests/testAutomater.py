@@ -1,4 +1,7 @@
+import os
 import pandas
+import subprocess
+import sys
 from functools import reduce
 
 import numpy
@@ -9,6 +12,8 @@ from sklearn_pandas import DataFrameMapper
 
 from keras_pandas import lib
 from keras_pandas.Automater import Automater
+from keras_pandas.cache import TransformCache
+from keras_pandas.profiling import Profiler
 from tests.testbase import TestBase
 
 
@@ -70,6 +75,8 @@ class TestAutomater(TestBase):
 
         self.assertIsNotNone(auto.output_nub)
         self.assertIsNotNone(auto.output_mapper.built_features)
+        response_classes = auto.output_mapper.built_features[0][1].steps[-1][1].classes_
+        self.assertEqual(len(response_classes), auto.output_nub.units)
 
         # Test transform, df_out=False
         train_X, train_y = auto.transform(train_observations)
@@ -154,3 +161,440 @@ class TestAutomater(TestBase):
         transformed_observations = auto.transform(test_observations, df_out=True)
         self.assertTrue(isinstance(transformed_observations, pandas.DataFrame))
         self.assertEqual(test_observations.shape[0], transformed_observations.shape[0])  # Correct number of rows back
+
+    def test_transform_iter(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        auto.fit(observations)
+        X, y = auto.transform(observations)
+
+        # Chunks should cover all observations, and match the un-chunked transform
+        chunk_size = 100
+        batches = list(auto.transform_iter(observations, chunk_size=chunk_size))
+        self.assertEqual(int(numpy.ceil(observations.shape[0] / float(chunk_size))), len(batches))
+        for variable_index in range(len(X)):
+            chunked_variable = numpy.concatenate([batch_X[variable_index] for batch_X, _ in batches])
+            numpy.testing.assert_array_equal(X[variable_index], chunked_variable)
+        numpy.testing.assert_array_equal(y, numpy.concatenate([batch_y for _, batch_y in batches]))
+
+        # Chunks can also be provided by any iterable of DataFrames
+        chunks = [observations.iloc[:chunk_size], observations.iloc[chunk_size:]]
+        batches = list(auto.transform_chunks(chunks))
+        self.assertEqual(2, len(batches))
+        self.assertEqual(chunk_size, batches[0][0][0].shape[0])
+
+        self.assertRaises(ValueError, auto.transform_iter, observations, chunk_size=0)
+
+        # Unfitted Automaters fail when called, rather than when iterated
+        unfitted_auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        self.assertRaises(AssertionError, unfitted_auto.transform_chunks, chunks)
+        self.assertRaises(AssertionError, unfitted_auto.transform_iter, observations)
+
+    def test_n_jobs(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        serial_auto = Automater(data_type_dict=data_type_dict, output_var=output_var, n_jobs=1)
+        serial_X, serial_y = serial_auto.fit_transform(observations)
+        serial_df = serial_auto.transform(observations, df_out=True)
+
+        parallel_auto = Automater(data_type_dict=data_type_dict, output_var=output_var, n_jobs=2)
+        parallel_X, parallel_y = parallel_auto.fit_transform(observations)
+        parallel_df = parallel_auto.transform(observations, df_out=True)
+
+        # Output should be in the same order, with the same columns. Text token indices depend on the order tokens are
+        # learned, so only compare shapes for text
+        self.assertEqual(list(serial_df.columns), list(parallel_df.columns))
+        self.assertEqual(list(serial_df.dtypes), list(parallel_df.dtypes))
+        self.assertEqual(len(serial_X), len(parallel_X))
+        for variable, serial_variable_X, parallel_variable_X in zip(serial_auto.input_vars, serial_X, parallel_X):
+            if variable in data_type_dict['text']:
+                self.assertEqual(serial_variable_X.shape, parallel_variable_X.shape)
+            else:
+                numpy.testing.assert_array_equal(serial_variable_X, parallel_variable_X)
+        numpy.testing.assert_array_equal(serial_y, parallel_y)
+        self.assertEqual(len(serial_auto.input_layers), len(parallel_auto.input_layers))
+
+    def test_transform_direct_arrays(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        auto.fit(observations)
+        self.assertCountEqual(auto.input_vars, auto.input_variable_slices.keys())
+
+        # X should contain the same data as the DataFrame output, sliced by variable
+        X, y = auto.transform(observations)
+        transformed_observations = auto.transform(observations, df_out=True)
+        for variable, variable_X in zip(auto.input_vars, X):
+            variable_slice = auto.input_variable_slices[variable]
+            expected = transformed_observations.iloc[:, variable_slice].values
+            if variable_slice.stop - variable_slice.start == 1:
+                expected = expected.reshape(-1)
+            numpy.testing.assert_array_equal(expected, variable_X)
+
+        # Text variables have one column per token, and other variables a single column
+        self.assertEqual(2, len(X[auto.input_vars.index('name')].shape))
+        self.assertEqual(1, len(X[auto.input_vars.index('fare')].shape))
+        numpy.testing.assert_array_equal(transformed_observations[output_var].values, y)
+
+    def test_fit_stream(self):
+        observations = lib.load_titanic()
+
+        # A numerical variable w/ missing values in every chunk
+        observations['sparse_fare'] = observations['fare'].where(numpy.arange(observations.shape[0]) % 7 != 0)
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare',
+                                        'sparse_fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        X, y = auto.fit_transform(observations)
+
+        # Fit one chunk at a time
+        chunk_size = 100
+        chunks = (observations.iloc[start:start + chunk_size] for start in range(0, observations.shape[0], chunk_size))
+        stream_auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        stream_auto.fit_stream(chunks)
+        self.assertTrue(stream_auto.fitted)
+        self.assertEqual(len(auto.input_layers), len(stream_auto.input_layers))
+        self.assertIsNotNone(stream_auto.output_nub)
+
+        # Streamed statistics should match a fit on all observations. Variables w/ missing values are scaled after
+        # being imputed w/ each chunk's running mean, so they match to within a tolerance
+        stream_X, stream_y = stream_auto.transform(observations)
+        for variable, variable_X, stream_variable_X in zip(auto.input_vars, X, stream_X):
+            if variable == 'sparse_fare':
+                numpy.testing.assert_allclose(variable_X, stream_variable_X, atol=0.05)
+                self.assertFalse(numpy.allclose(variable_X, stream_variable_X))
+            elif variable in data_type_dict['numerical']:
+                numpy.testing.assert_allclose(variable_X, stream_variable_X)
+            else:
+                numpy.testing.assert_array_equal(variable_X, stream_variable_X)
+        numpy.testing.assert_array_equal(y, stream_y)
+
+        # Partially fit Automaters must be finalized before transforming
+        partial_auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        partial_auto.partial_fit(observations.iloc[:chunk_size])
+        self.assertRaises(AssertionError, partial_auto.transform, observations)
+        partial_auto.partial_fit(observations.iloc[chunk_size:]).finalize_fit()
+        partial_auto.transform(observations)
+
+    def test_transform_to_store(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        X, y = auto.fit_transform(observations)
+
+        # Write in several chunks, and reload as memory mapped arrays
+        path = os.path.join(lib.get_temp_dir(), 'transformed_store')
+        auto.transform_to_store(observations, path, chunk_size=100)
+        stored_X, stored_y = Automater.load_store(path)
+
+        self.assertEqual(len(X), len(stored_X))
+        for variable_X, stored_variable_X in zip(X, stored_X):
+            self.assertTrue(isinstance(stored_variable_X, numpy.memmap))
+            self.assertEqual(variable_X.dtype, stored_variable_X.dtype)
+            numpy.testing.assert_array_equal(variable_X, stored_variable_X)
+        numpy.testing.assert_array_equal(y, stored_y)
+
+        # Overwriting a store replaces it entirely. Stores w/o the output_var do not contain y
+        num_observations = 100
+        auto.transform_to_store(observations.iloc[:num_observations].drop(output_var, axis=1), path)
+        stored_X, stored_y = Automater.load_store(path)
+        self.assertIsNone(stored_y)
+        self.assertEqual(num_observations, stored_X[0].shape[0])
+        self.assertFalse(os.path.exists(os.path.join(path, 'y.npy')))
+        self.assertEqual(['transformed_store'], os.listdir(os.path.dirname(path)))
+
+        self.assertRaises(ValueError, Automater.load_store, os.path.join(path, 'missing'))
+
+    def test_transform_cache(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+        num_variables = 8
+
+        cache = TransformCache(path=os.path.join(lib.get_temp_dir(), 'transform_cache'))
+        cache.clear()
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var, transform_cache=cache)
+        X, y = auto.fit_transform(observations)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual(num_variables, cache.misses)
+
+        # Transforming the same data again should be served from the cache
+        cached_X, cached_y = auto.transform(observations)
+        self.assertEqual(num_variables, cache.hits)
+        for variable_X, cached_variable_X in zip(X, cached_X):
+            numpy.testing.assert_array_equal(variable_X, cached_variable_X)
+        numpy.testing.assert_array_equal(y, cached_y)
+
+        # Only variables whose data changed should be re-transformed
+        changed_observations = observations.copy()
+        changed_observations['fare'] = changed_observations['fare'] * 2
+        changed_X, _ = auto.transform(changed_observations)
+        self.assertEqual(2 * num_variables - 1, cache.hits)
+        self.assertEqual(num_variables + 1, cache.misses)
+        fare_index = auto.input_vars.index('fare')
+        self.assertFalse(numpy.allclose(X[fare_index], changed_X[fare_index]))
+
+        # Refitting should invalidate cached variables
+        auto.fit(observations.iloc[:100])
+        auto.transform(observations)
+        self.assertEqual(2 * num_variables - 1, cache.hits)
+
+    def test_profiler(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        # Profiling should not change the transformed data
+        X, y = Automater(data_type_dict=data_type_dict, output_var=output_var).fit_transform(observations)
+        collected = list()
+        profiler = Profiler(callbacks=[collected.append])
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var, profiler=profiler)
+        profiled_X, profiled_y = auto.fit_transform(observations)
+        for variable_X, profiled_variable_X in zip(X, profiled_X):
+            numpy.testing.assert_array_equal(variable_X, profiled_variable_X)
+        numpy.testing.assert_array_equal(y, profiled_y)
+
+        # Each variable should be profiled while fitting and transforming
+        self.assertEqual(len(collected), len(profiler.records))
+        report = profiler.report()
+        self.assertEqual(set(auto.input_vars + [output_var]), set(report['variable']))
+        self.assertEqual({'fit', 'transform'}, set(report['phase']))
+        fit_report = report[report['phase'] == 'fit']
+        self.assertEqual({observations.shape[0]}, set(fit_report['num_rows']))
+
+        step_report = profiler.report(level='step')
+        name_steps = step_report[(step_report['variable'] == 'name') & (step_report['phase'] == 'fit')]
+        self.assertIn('EmbeddingVectorizer', name_steps['transformer'].tolist())
+
+    def test_compile_transform(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        auto.fit(observations)
+        compiled_transform = auto.compile_transform()
+
+        # Compiled transforms should match transform, for records and for dicts of columns
+        batch = observations.iloc[:50]
+        X, _ = auto.transform(batch)
+        records = batch.to_dict(orient='records')
+        columns = {variable: batch[variable].values for variable in auto.input_vars}
+        for compiled_X in [compiled_transform(records), compiled_transform(columns)]:
+            self.assertEqual(len(X), len(compiled_X))
+            for variable_X, compiled_variable_X in zip(X, compiled_X):
+                self.assertEqual(variable_X.shape, compiled_variable_X.shape)
+                numpy.testing.assert_allclose(variable_X, compiled_variable_X)
+
+        # Single rows
+        compiled_X = compiled_transform(records[:1])
+        for variable_X, compiled_variable_X in zip(X, compiled_X):
+            numpy.testing.assert_allclose(variable_X[:1], compiled_variable_X)
+
+        # Unfitted Automaters can not be compiled
+        self.assertRaises(AssertionError, Automater(data_type_dict=data_type_dict).compile_transform)
+
+    def test_export_preprocessing_model(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        X, y = auto.fit_transform(observations)
+
+        # Raw inputs are strings for categorical and text variables, and floats otherwise
+        preprocessing_model = auto.export_preprocessing_model()
+        raw_X = [observations[variable].values.astype(str if variable in ['pclass', 'sex', 'name'] else float)
+                 for variable in auto.input_vars]
+        preprocessed_X = preprocessing_model.predict(raw_X)
+        for variable_X, preprocessed_variable_X in zip(X, preprocessed_X):
+            numpy.testing.assert_allclose(variable_X.reshape(preprocessed_variable_X.shape), preprocessed_variable_X,
+                                          rtol=1e-5)
+
+        # Preprocessing layers should be prepended to a model
+        x = auto.input_nub
+        x = Dense(30)(x)
+        x = auto.output_nub(x)
+        model = Model(inputs=auto.input_layers, outputs=x)
+        model.compile(optimizer='Adam', loss=auto.suggest_loss())
+        serving_model = auto.export_preprocessing_model(model)
+        numpy.testing.assert_allclose(model.predict(X), serving_model.predict(raw_X), rtol=1e-4)
+
+    def test_save_load(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+        path = os.path.join(lib.get_temp_dir(), 'test_save_load')
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        X, y = auto.fit_transform(observations)
+        auto.save(path)
+
+        loaded_auto = Automater.load(path)
+        self.assertTrue(loaded_auto.fitted)
+        self.assertEqual(auto.input_vars, loaded_auto.input_vars)
+        self.assertEqual(auto.input_variable_slices, loaded_auto.input_variable_slices)
+
+        # Loaded Automaters should transform identically
+        loaded_X, loaded_y = loaded_auto.transform(observations)
+        for variable_X, loaded_variable_X in zip(X, loaded_X):
+            numpy.testing.assert_array_equal(variable_X, loaded_variable_X)
+        numpy.testing.assert_array_equal(y, loaded_y)
+
+        # Nubs should be re-created w/ the same shapes
+        for input_layer, loaded_input_layer in zip(auto.input_layers, loaded_auto.input_layers):
+            self.assertEqual(input_layer.shape.as_list(), loaded_input_layer.shape.as_list())
+        x = loaded_auto.input_nub
+        x = Dense(30)(x)
+        x = loaded_auto.output_nub(x)
+        model = Model(inputs=loaded_auto.input_layers, outputs=x)
+        model.compile(optimizer='Adam', loss=loaded_auto.suggest_loss())
+        model.fit(loaded_X, loaded_y)
+
+        # Unfitted Automaters can not be saved
+        self.assertRaises(AssertionError, Automater(data_type_dict=data_type_dict).save, path)
+
+    def test_dtype_policy(self):
+        observations = lib.load_titanic()
+        observations['is_adult'] = observations['age'] >= 18
+
+        data_type_dict = {'numerical': ['age', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'boolean': ['is_adult'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        X, y = auto.fit_transform(observations)
+
+        compact_auto = Automater(data_type_dict=data_type_dict, output_var=output_var, dtype_policy='compact')
+        compact_X, compact_y = compact_auto.fit_transform(observations)
+
+        # Numerics are float32, booleans uint8, and indices are sized from each vocabulary
+        expected_dtypes = {'age': numpy.float32, 'fare': numpy.float32, 'pclass': numpy.int16, 'sex': numpy.int16,
+                           'is_adult': numpy.uint8, 'name': numpy.int16}
+        for variable, variable_X, compact_variable_X in zip(compact_auto.input_vars, X, compact_X):
+            self.assertEqual(expected_dtypes[variable], compact_variable_X.dtype)
+            numpy.testing.assert_allclose(variable_X.astype(float), compact_variable_X, rtol=1e-6)
+        self.assertEqual(numpy.int16, compact_y.dtype)
+        numpy.testing.assert_array_equal(y, compact_y)
+
+        # DataFrames, compiled transforms and loaded Automaters use the same dtypes
+        transformed_df = compact_auto.transform(observations, df_out=True)
+        self.assertEqual(numpy.float32, transformed_df['fare'].dtype)
+        for compact_variable_X, compiled_variable_X in zip(compact_X, compact_auto.compile_transform()(
+                observations.iloc[:10].to_dict(orient='records'))):
+            self.assertEqual(compact_variable_X.dtype, compiled_variable_X.dtype)
+
+        path = os.path.join(lib.get_temp_dir(), 'test_dtype_policy')
+        compact_auto.save(path)
+        loaded_X, _ = Automater.load(path).transform(observations)
+        for compact_variable_X, loaded_variable_X in zip(compact_X, loaded_X):
+            self.assertEqual(compact_variable_X.dtype, loaded_variable_X.dtype)
+
+        # Unknown policies are not supported
+        self.assertRaises(ValueError, Automater, data_type_dict=data_type_dict, dtype_policy='tiny')
+
+    def test_variable_groups(self):
+        random_state = numpy.random.RandomState(0)
+        airports = numpy.array(['lax', 'sea', 'jfk', 'ord', 'sfo'])
+        observations = pandas.DataFrame({'origin_airport': random_state.choice(airports, size=500),
+                                         'dest_airport': random_state.choice(airports[:4], size=500),
+                                         'carrier': random_state.choice(['aa', 'dl', 'ua'], size=500),
+                                         'delay': random_state.normal(size=500)})
+
+        data_type_dict = {'categorical': ['carrier', {'airport': ['origin_airport', 'dest_airport']}],
+                          'numerical': ['delay']}
+        auto = Automater(data_type_dict=data_type_dict, output_var='delay')
+        self.assertEqual(['carrier', 'airport'], auto.input_vars)
+        self.assertEqual({'airport': ['origin_airport', 'dest_airport']}, auto.variable_groups)
+        X, y = auto.fit_transform(observations)
+
+        # Grouped variables are one stacked array, w/ one vocabulary
+        airport_X = X[auto.input_vars.index('airport')]
+        self.assertEqual((500, 2), airport_X.shape)
+        encoder = auto.input_mapper.built_features[1][1].steps[-1][1]
+        self.assertEqual(['UNK'] + sorted(airports), list(encoder.classes_))
+        numpy.testing.assert_array_equal(observations['dest_airport'].values, encoder.classes_[airport_X[:, 1]])
+
+        # Grouped variables share one embedding
+        x = auto.input_nub
+        x = Dense(1)(x)
+        model = Model(auto.input_layers, x)
+        embedding = model.get_layer('embedding_airport')
+        self.assertEqual(2, embedding.input_length)
+        self.assertEqual(len(airports) + 2, embedding.input_dim)
+        model.compile(optimizer='adam', loss='mse')
+        model.fit(X, y)
+
+        # Compiled transforms, and saved Automaters, are consistent w/ transform
+        compiled_X = auto.compile_transform()(observations.iloc[:10].to_dict(orient='records'))
+        numpy.testing.assert_array_equal(airport_X[:10], compiled_X[auto.input_vars.index('airport')])
+
+        path = os.path.join(lib.get_temp_dir(), 'test_variable_groups')
+        auto.save(path)
+        loaded_X, _ = Automater.load(path).transform(observations)
+        numpy.testing.assert_array_equal(airport_X, loaded_X[auto.input_vars.index('airport')])
+
+        # Groups can not be the response variable, or use datatypes w/o group support
+        self.assertRaises(ValueError, Automater, data_type_dict=data_type_dict, output_var='airport')
+        self.assertRaises(ValueError, Automater, data_type_dict={'numerical': [{'delays': ['delay', 'delay_2']}]})
+        self.assertRaises(ValueError, Automater, data_type_dict={'categorical': [{'airport': []}]})
+
+    def test_lazy_imports(self):
+        # Fitting and transforming should not import Keras, until nubs are used
+        script = """
+import sys
+import numpy, pandas
+from keras_pandas.Automater import Automater
+observations = pandas.DataFrame({'numerical': numpy.arange(10.), 'categorical': ['a', 'b'] * 5})
+auto = Automater(data_type_dict={'numerical': ['numerical'], 'categorical': ['categorical']},
+                 output_var='categorical')
+auto.fit_transform(observations)
+assert 'keras' not in sys.modules, 'keras imported by fit_transform'
+assert 'tensorflow' not in sys.modules, 'tensorflow imported by fit_transform'
+assert auto.input_nub is not None
+assert auto.output_nub is not None
+assert 'keras' in sys.modules
+"""
+        subprocess.check_call([sys.executable, '-c', script])
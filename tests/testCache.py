@@ -0,0 +1,67 @@
+import os
+
+import numpy
+import pandas
+
+from keras_pandas import lib
+from keras_pandas.cache import TransformCache, fingerprint_dataframe, fingerprint_state
+from keras_pandas.transformations import EmbeddingVectorizer, LabelEncoder
+from tests.testbase import TestBase
+
+
+class TestCache(TestBase):
+
+    def test_transform_cache(self):
+        cache = TransformCache(path=os.path.join(lib.get_temp_dir(), 'test_transform_cache'), max_entries=2)
+        cache.clear()
+        array = numpy.arange(10)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.misses)
+        self.assertTrue(cache.put('a', array))
+        numpy.testing.assert_array_equal(array, cache.get('a'))
+        self.assertEqual(1, cache.hits)
+
+        # The least recently used entry should be evicted
+        cache.put('b', array * 2)
+        os.utime(cache._entry_path('a'), (0, 0))
+        cache.put('c', array * 3)
+        self.assertIsNone(cache.get('a'))
+        numpy.testing.assert_array_equal(array * 2, cache.get('b'))
+
+        # Object arrays are not cached
+        self.assertFalse(cache.put('d', numpy.array(['a', 'b'], dtype=object)))
+        self.assertIsNone(cache.get('d'))
+
+        # Entries should be evicted to stay within max_bytes
+        cache = TransformCache()
+        cache.put('a', array)
+        entry_bytes = os.path.getsize(cache._entry_path('a'))
+        cache.max_bytes = entry_bytes + 1
+        cache.put('b', array)
+        self.assertEqual([entry_bytes], [size for _, size, _ in cache._entries()])
+
+    def test_fingerprints(self):
+        observations = pandas.DataFrame({'text': ['the cat', 'a dog', None],
+                                         'sequence': [[1, 2], [3], []],
+                                         'number': [1., numpy.nan, 3.]})
+
+        # Fingerprints depend on values, but not column names or indices
+        self.assertEqual(fingerprint_dataframe(observations[['number']]),
+                         fingerprint_dataframe(observations[['number']].rename(columns={'number': 'other'})))
+        self.assertEqual(fingerprint_dataframe(observations[['text']]),
+                         fingerprint_dataframe(observations[['text']].set_index(pandas.Index([3, 4, 5]))))
+        self.assertNotEqual(fingerprint_dataframe(observations[['number']]),
+                            fingerprint_dataframe(observations[['number']] * 2))
+        self.assertNotEqual(fingerprint_dataframe(observations[['sequence']]),
+                            fingerprint_dataframe(observations[['sequence']].iloc[::-1]))
+
+        # State fingerprints depend on fitted state
+        encoder = LabelEncoder().fit(numpy.array(['a', 'b']))
+        self.assertEqual(fingerprint_state(encoder), fingerprint_state(LabelEncoder().fit(numpy.array(['b', 'a']))))
+        self.assertNotEqual(fingerprint_state(encoder), fingerprint_state(LabelEncoder().fit(numpy.array(['a', 'c']))))
+
+        vectorizer = EmbeddingVectorizer().fit(numpy.array([['the cat'], ['a dog']], dtype=object))
+        fingerprint = fingerprint_state(vectorizer)
+        vectorizer.transform(numpy.array([['the dog']], dtype=object))
+        self.assertEqual(fingerprint, fingerprint_state(vectorizer))
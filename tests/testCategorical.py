@@ -38,3 +38,22 @@ class TestCategorical(TestBase):
 
         model = Model(input_layer, x)
         model.compile(optimizer='adam', loss=datatype.output_suggested_loss())
+
+    def test_hashing(self):
+        # Create datatype
+        datatype = Categorical(num_buckets=32)
+        lib.check_valid_datatype(datatype)
+        self.assertFalse(datatype.supports_output)
+
+        # Load observations
+        observations = lib.load_mushroom()
+
+        # Transform observations
+        mapper = DataFrameMapper([(['cap-shape'], datatype.default_transformation_pipeline)], df_out=True)
+        transformed_df = mapper.fit_transform(observations)
+        self.assertTrue(transformed_df['cap-shape'].between(0, 31).all())
+
+        # Create network. The embedding is sized by the number of buckets
+        input_layer, input_nub = datatype.input_nub_generator('cap-shape', transformed_df)
+        model = Model(input_layer, input_nub)
+        self.assertEqual(32, model.get_layer(index=1).input_dim)
@@ -0,0 +1,105 @@
+import numpy
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from keras_pandas.inference import compile_pipeline, _as_column
+from keras_pandas.transformations import CategoricalImputer, EmbeddingVectorizer, HashingEncoder, LabelEncoder, \
+    MeanImputer, TypeConversionEncoder
+from tests.testbase import TestBase
+
+
+class TestInference(TestBase):
+
+    @staticmethod
+    def fit_steps(pipeline, observations):
+        transformed = observations
+        for _, transformer in pipeline.steps:
+            transformed = transformer.fit(transformed).transform(transformed)
+        return pipeline
+
+    @staticmethod
+    def transform_steps(pipeline, observations):
+        transformed = observations
+        for _, transformer in pipeline.steps:
+            transformed = transformer.transform(transformed)
+        return transformed
+
+    @staticmethod
+    def transform_compiled(kernels, observations):
+        transformed = observations
+        for kernel in kernels:
+            transformed = kernel(transformed)
+        return transformed
+
+    def test_compile_categorical(self):
+        train_observations = numpy.array([['a'], ['b'], [None], ['a'], ['c']], dtype=object)
+        observations = _as_column(['a', 'd', None, float('nan'), 'c'])
+
+        for fill_unknown_labels in [True, False]:
+            pipeline = self.fit_steps(make_pipeline(
+                TypeConversionEncoder(str),
+                CategoricalImputer(strategy='constant', fill_value='UNK', fill_unknown_labels=fill_unknown_labels),
+                LabelEncoder()), train_observations)
+            kernels = compile_pipeline(pipeline)
+            numpy.testing.assert_array_equal(self.transform_steps(pipeline, observations),
+                                             self.transform_compiled(kernels, observations))
+
+        # Nulls should be imputed before type conversion
+        pipeline = self.fit_steps(make_pipeline(CategoricalImputer(), LabelEncoder()), train_observations)
+        numpy.testing.assert_array_equal(self.transform_steps(pipeline, observations),
+                                         self.transform_compiled(compile_pipeline(pipeline), observations))
+
+        pipeline = self.fit_steps(make_pipeline(TypeConversionEncoder(str), HashingEncoder(10, offset=1)),
+                                  train_observations)
+        numpy.testing.assert_array_equal(self.transform_steps(pipeline, observations),
+                                         self.transform_compiled(compile_pipeline(pipeline), observations))
+
+        # Variable groups are encoded as one stacked array, w/ one column per variable
+        train_observations = numpy.array([['a', 'b'], ['b', None], ['c', 'a']], dtype=object)
+        observations = numpy.array([['a', 'd'], [None, 'c']], dtype=object)
+        for encoder in [LabelEncoder(), HashingEncoder(10, offset=1)]:
+            pipeline = self.fit_steps(make_pipeline(
+                TypeConversionEncoder(str),
+                CategoricalImputer(strategy='constant', fill_value='UNK', fill_unknown_labels=True),
+                encoder), train_observations)
+            transformed = self.transform_compiled(compile_pipeline(pipeline), observations)
+            self.assertEqual((2, 2), transformed.shape)
+            numpy.testing.assert_array_equal(self.transform_steps(pipeline, observations), transformed)
+
+    def test_compile_numerical(self):
+        train_observations = numpy.array([[1.], [2.], [numpy.nan], [7.]])
+        observations = _as_column([3, None, 2.5])
+
+        pipeline = self.fit_steps(make_pipeline(MeanImputer(), StandardScaler()), train_observations)
+        transformed = self.transform_compiled(compile_pipeline(pipeline), observations)
+        expected = self.transform_steps(pipeline, numpy.array([[3.], [numpy.nan], [2.5]]))
+        numpy.testing.assert_allclose(expected, transformed)
+        self.assertEqual((3, 1), transformed.shape)
+
+    def test_compile_text(self):
+        train_observations = numpy.array([['the cat sat'], ['the dog ran away'], ['a cat']], dtype=object)
+        observations = _as_column(['the bird sat', '', 'cat cat cat cat cat'])
+
+        for num_buckets in [None, 50]:
+            pipeline = self.fit_steps(make_pipeline(TypeConversionEncoder(str),
+                                                    EmbeddingVectorizer(num_buckets=num_buckets)), train_observations)
+            transformed = self.transform_compiled(compile_pipeline(pipeline), observations)
+            numpy.testing.assert_array_equal(self.transform_steps(pipeline, observations), transformed)
+            self.assertEqual(numpy.int32, transformed.dtype)
+
+        # Compiling does not finalize partially fit vectorizers
+        vectorizer = EmbeddingVectorizer().partial_fit(train_observations)
+        pipeline = make_pipeline(vectorizer)
+        self.assertRaises(ValueError, compile_pipeline, pipeline)
+        self.assertTrue(vectorizer.partial_fit_pending)
+        vectorizer.finalize_partial_fit()
+        numpy.testing.assert_array_equal(vectorizer.transform(observations),
+                                         self.transform_compiled(compile_pipeline(pipeline), observations))
+
+    def test_as_column(self):
+        self.assertEqual((2, 1), _as_column(numpy.array([1., 2.])).shape)
+
+        # Sequences should be kept as single values
+        column = _as_column([[1, 2], [3, 4]])
+        self.assertEqual((2, 1), column.shape)
+        self.assertEqual([1, 2], column[0, 0])
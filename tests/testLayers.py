@@ -0,0 +1,77 @@
+import keras
+import numpy
+from keras import Model
+from keras import backend as K
+from sklearn.preprocessing import StandardScaler
+from sklearn_pandas.pipeline import make_transformer_pipeline
+
+from keras_pandas.layers import PaddedStepMasking, PaddingIndexShift, export_pipeline, initialize_tables
+from keras_pandas.transformations import CategoricalImputer, EmbeddingVectorizer, HashingEncoder, LabelEncoder, \
+    MeanImputer, TypeConversionEncoder
+from tests.testbase import TestBase
+
+
+class TestLayers(TestBase):
+
+    @staticmethod
+    def predict_exported(pipeline, observations):
+        raw_input, x = export_pipeline(pipeline, 'variable')
+        initialize_tables()
+        return Model(raw_input, x).predict(observations)
+
+    def test_export_numerical(self):
+        train_observations = numpy.array([[1.], [2.], [numpy.nan], [7.]])
+        observations = numpy.array([[3.], [numpy.nan], [2.5]])
+
+        pipeline = make_transformer_pipeline(MeanImputer(), StandardScaler()).fit(train_observations)
+        numpy.testing.assert_allclose(pipeline.transform(observations), self.predict_exported(pipeline, observations),
+                                      rtol=1e-5)
+
+    def test_export_categorical(self):
+        train_observations = numpy.array([['a'], ['b'], ['a'], ['c']], dtype=object)
+        observations = numpy.array([['a'], ['d'], ['None'], ['c']], dtype=object)
+
+        pipeline = make_transformer_pipeline(
+            TypeConversionEncoder(str),
+            CategoricalImputer(strategy='constant', fill_value='UNK', fill_unknown_labels=True),
+            LabelEncoder()).fit(train_observations)
+        numpy.testing.assert_array_equal(pipeline.transform(observations),
+                                         self.predict_exported(pipeline, observations).ravel())
+
+        # Hashing is not exportable
+        pipeline = make_transformer_pipeline(TypeConversionEncoder(str), HashingEncoder(10)).fit(train_observations)
+        self.assertRaises(ValueError, export_pipeline, pipeline, 'variable')
+
+    def test_export_text(self):
+        train_observations = numpy.array([['The cat sat'], ['the dog ran away'], ['a cat, a hat']], dtype=object)
+        observations = numpy.array([['the bird sat'], [''], ['Cat cat cat cat cat'], ['x_y _under 2cats']],
+                                   dtype=object)
+
+        pipeline = make_transformer_pipeline(TypeConversionEncoder(str), EmbeddingVectorizer()).fit(train_observations)
+        numpy.testing.assert_array_equal(pipeline.transform(observations),
+                                         self.predict_exported(pipeline, observations))
+
+    def test_padding_masks(self):
+        # Padding tokens are shifted to 0, and other indices up by one
+        indices = numpy.array([[2, 0, 5, 1, 1]])
+        input_layer = keras.Input(shape=(None,))
+        model = Model(input_layer, PaddingIndexShift(pad_index=1)(input_layer))
+        numpy.testing.assert_array_equal([[3, 1, 6, 0, 0]], model.predict(indices))
+
+        # Only the contiguous padding at the start (or end) of each sequence is masked
+        sequences = numpy.array([[0., 0., 3., 0., 4.], [1., 0., 2., 0., 0.]])
+        for padding, expected_mask in [('pre', [[False, False, True, True, True], [True, True, True, True, True]]),
+                                       ('post', [[True, True, True, True, True], [True, True, True, False, False]])]:
+            layer = PaddedStepMasking(pad_value=0., padding=padding)
+            self.assertEqual((None, 5, 1), layer.compute_output_shape((None, 5)))
+            numpy.testing.assert_array_equal(expected_mask, K.eval(layer.compute_mask(K.constant(sequences))))
+
+        self.assertRaises(ValueError, PaddedStepMasking, padding='middle')
+
+        # NaN padding is masked, and replaced w/ 0, while genuine leading zeros are kept
+        sequences = numpy.array([[numpy.nan, 0., 3.], [0., 0., 1.]])
+        layer = PaddedStepMasking(pad_value=numpy.nan, padding='pre')
+        numpy.testing.assert_array_equal([[False, True, True], [True, True, True]],
+                                         K.eval(layer.compute_mask(K.constant(sequences))))
+        numpy.testing.assert_array_equal([[[0.], [0.], [3.]], [[0.], [0.], [1.]]],
+                                         K.eval(layer.call(K.constant(sequences))))
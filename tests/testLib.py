@@ -1,3 +1,5 @@
+import os
+
 from keras.backend import placeholder
 
 from keras_pandas import lib
@@ -14,3 +16,26 @@ class TestLib(TestBase):
         for var in iris_vars:
             placeholder(name=lib.namespace_conversion(var))
         pass
+
+    def test_staged_directory(self):
+        parent_dir = lib.get_temp_dir()
+        path = os.path.join(parent_dir, 'staged')
+
+        with lib.staged_directory(path) as staged_path:
+            self.assertFalse(os.path.exists(path))
+            for name in ['a', 'b']:
+                open(os.path.join(staged_path, name), 'w').close()
+        self.assertCountEqual(['a', 'b'], os.listdir(path))
+
+        # Replacing a directory removes its earlier files
+        with lib.staged_directory(path) as staged_path:
+            open(os.path.join(staged_path, 'c'), 'w').close()
+        self.assertEqual(['c'], os.listdir(path))
+
+        # Failed writes leave the existing directory unchanged
+        with self.assertRaises(RuntimeError):
+            with lib.staged_directory(path) as staged_path:
+                open(os.path.join(staged_path, 'd'), 'w').close()
+                raise RuntimeError()
+        self.assertEqual(['c'], os.listdir(path))
+        self.assertEqual(['staged'], os.listdir(parent_dir))
@@ -0,0 +1,66 @@
+import numpy
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from keras_pandas.profiling import Profiler, profile_pipeline
+from keras_pandas.transformations import CategoricalImputer, LabelEncoder, MeanImputer, TypeConversionEncoder
+from tests.testbase import TestBase
+
+
+class TestProfiling(TestBase):
+
+    def test_profile_pipeline(self):
+        observations = numpy.array([['a'], ['b'], [None], ['a']], dtype=object)
+        pipeline = make_pipeline(TypeConversionEncoder(str), CategoricalImputer(strategy='constant', fill_value='UNK'),
+                                 LabelEncoder())
+
+        # Fitting should return the fitted pipeline, w/ one record per step
+        fitted_pipeline, records = profile_pipeline(pipeline, observations, 'fit', 'letter')
+        self.assertIs(pipeline, fitted_pipeline)
+        self.assertEqual(['typeconversionencoder', 'categoricalimputer', 'labelencoder'],
+                         [record['step'] for record in records])
+        self.assertEqual({'fit'}, set(record['phase'] for record in records))
+        self.assertEqual({4}, set(record['num_rows'] for record in records))
+        self.assertIsNone(records[-1]['output_bytes'])
+        for record in records:
+            self.assertTrue(record['wall_time'] >= 0)
+            self.assertTrue(record['peak_memory_delta'] >= 0)
+
+        # Transforming should match the pipeline's own transform
+        transformed, records = profile_pipeline(pipeline, observations, 'transform', 'letter', trace_memory=False)
+        numpy.testing.assert_array_equal(pipeline.transform(observations), transformed)
+        self.assertEqual(transformed.nbytes, records[-1]['output_bytes'])
+        self.assertIsNone(records[-1]['peak_memory_delta'])
+
+        self.assertRaises(ValueError, profile_pipeline, pipeline, observations, 'predict', 'letter')
+
+    def test_profiler(self):
+        observations = numpy.random.RandomState(0).normal(size=(1000, 1))
+        collected = list()
+        profiler = Profiler(callbacks=[collected.append])
+
+        for variable in ['x', 'y']:
+            pipeline = make_pipeline(MeanImputer(), StandardScaler())
+            profiler.add_records(profile_pipeline(pipeline, observations, 'fit', variable)[1])
+            for chunk in numpy.array_split(observations, 2):
+                profiler.add_records(profile_pipeline(pipeline, chunk, 'transform', variable)[1])
+
+        # Callbacks should see every record
+        self.assertEqual(12, len(collected))
+        self.assertEqual(12, len(profiler.report(level='record')))
+
+        # Variable totals should sum over runs, but not over steps
+        variable_report = profiler.report()
+        self.assertEqual(4, len(variable_report))
+        transform_report = variable_report[variable_report['phase'] == 'transform']
+        self.assertEqual([1000, 1000], transform_report['num_rows'].tolist())
+        self.assertEqual([8000, 8000], transform_report['output_bytes'].tolist())
+        self.assertEqual(sorted(variable_report['wall_time'], reverse=True), variable_report['wall_time'].tolist())
+
+        step_report = profiler.report(level='step')
+        self.assertEqual(8, len(step_report))
+        self.assertEqual({'MeanImputer', 'StandardScaler'}, set(step_report['transformer']))
+
+        self.assertRaises(ValueError, profiler.report, 'column')
+        profiler.clear()
+        self.assertEqual(0, len(profiler.report(level='record')))
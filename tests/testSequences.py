@@ -0,0 +1,120 @@
+import numpy
+import pandas
+from keras import Model
+from keras.layers import Dense
+
+from keras_pandas import lib
+from keras_pandas.Automater import Automater
+from keras_pandas.data_types.Text import Text
+from keras_pandas.data_types.TimeSeries import TimeSeries
+from keras_pandas.sequences import AutomaterSequence, BucketedSequence, _sequence_lengths
+from tests.testbase import TestBase
+
+
+class TestSequences(TestBase):
+
+    def test_automater_sequence(self):
+        observations = lib.load_titanic()
+
+        data_type_dict = {'numerical': ['age', 'siblings_spouses_aboard', 'parents_children_aboard', 'fare'],
+                          'categorical': ['survived', 'pclass', 'sex'],
+                          'text': ['name']}
+        output_var = 'survived'
+
+        auto = Automater(data_type_dict=data_type_dict, output_var=output_var)
+        auto.fit(observations)
+
+        # Batches should match the un-batched transform, when not shuffled
+        batch_size = 64
+        sequence = AutomaterSequence(auto, observations, batch_size=batch_size, shuffle=False)
+        self.assertEqual(int(numpy.ceil(observations.shape[0] / float(batch_size))), len(sequence))
+
+        X, y = auto.transform(observations)
+        batch_X, batch_y = sequence[1]
+        self.assertEqual(len(X), len(batch_X))
+        numpy.testing.assert_array_equal(X[0][batch_size:2 * batch_size], batch_X[0])
+        numpy.testing.assert_array_equal(y[batch_size:2 * batch_size], batch_y)
+
+        # The last batch may be smaller than batch_size
+        last_X, last_y = sequence[len(sequence) - 1]
+        self.assertEqual(observations.shape[0] - (len(sequence) - 1) * batch_size, last_y.shape[0])
+
+        # Shuffling should cover every observation exactly once per epoch
+        sequence = AutomaterSequence(auto, observations, batch_size=batch_size, shuffle=True, seed=0)
+        sequence.on_epoch_end()
+        self.assertCountEqual(range(observations.shape[0]), sequence.index_array)
+
+        # Sequence should be usable for training
+        x = auto.input_nub
+        x = Dense(32)(x)
+        x = auto.output_nub(x)
+        model = Model(inputs=auto.input_layers, outputs=x)
+        model.compile(optimizer='adam', loss=auto.suggest_loss())
+        model.fit_generator(sequence, epochs=1, workers=2)
+
+        # Without the response variable, batches only contain X
+        sequence = AutomaterSequence(auto, observations.drop(output_var, axis=1), batch_size=batch_size)
+        self.assertTrue(isinstance(sequence[0], list))
+
+    def test_bucketed_sequence(self):
+        observations = lib.load_titanic()
+        random_state = numpy.random.RandomState(0)
+        observations['history'] = [list(random_state.normal(size=random_state.randint(1, 20)))
+                                   for _ in range(observations.shape[0])]
+
+        data_type_dict = {'numerical': ['fare'], 'categorical': ['survived'], 'text': ['name'],
+                          'timeseries': ['history']}
+        datatype_handlers = {'text': Text(mask_padding=True), 'timeseries': TimeSeries(mask_padding=True)}
+        auto = Automater(data_type_dict=data_type_dict, output_var='survived', datatype_handlers=datatype_handlers)
+        auto.fit(observations)
+
+        batch_size = 64
+        sequence = BucketedSequence(auto, observations, batch_size=batch_size, num_buckets=4, shuffle=True, seed=0)
+
+        # Every observation is batched exactly once per epoch, and batches do not exceed batch_size
+        sequence.on_epoch_end()
+        self.assertCountEqual(range(observations.shape[0]), numpy.concatenate(sequence.batches))
+        self.assertTrue(all(len(batch) <= batch_size for batch in sequence.batches))
+
+        # Batches are trimmed to their longest sequence, and otherwise match the un-batched transform
+        X, y = auto.transform(observations)
+        batch_X, batch_y = sequence[0]
+        batch = sequence.batches[0]
+        numpy.testing.assert_array_equal(y[batch], batch_y)
+        for lengths, (variable_index, _, padding) in zip(sequence.variable_lengths, sequence.padded_variables):
+            width = batch_X[variable_index].shape[1]
+            self.assertLessEqual(width, X[variable_index].shape[1])
+            self.assertEqual(max(lengths[batch].max(), 1), width)
+            expected = X[variable_index][batch, :width] if padding == 'post' else X[variable_index][batch, -width:]
+            numpy.testing.assert_array_equal(expected, batch_X[variable_index])
+
+        # Sequence should be usable for training, w/ masking nubs that accept any sequence length
+        x = auto.input_nub
+        x = Dense(32)(x)
+        x = auto.output_nub(x)
+        model = Model(inputs=auto.input_layers, outputs=x)
+        model.compile(optimizer='adam', loss=auto.suggest_loss())
+        model.fit_generator(sequence, epochs=1)
+
+        # At least one masking variable is required
+        auto = Automater(data_type_dict={'numerical': ['fare']})
+        auto.fit(observations)
+        self.assertRaises(ValueError, BucketedSequence, auto, observations)
+
+    def test_sequence_lengths(self):
+        padded = numpy.array([[numpy.nan, 0., 0., 3.], [numpy.nan, numpy.nan, numpy.nan, numpy.nan], [0., 1., 2., 3.]])
+        numpy.testing.assert_array_equal([3, 0, 4], _sequence_lengths(padded, numpy.nan, 'pre'))
+        numpy.testing.assert_array_equal([2, 0], _sequence_lengths(numpy.array([[2, 3, 1, 1], [1, 1, 1, 1]]), 1,
+                                                                   'post'))
+
+        # Masked TimeSeries variables are padded w/ NaN, so series starting w/ 0 keep their leading zeros
+        observations = pandas.DataFrame({'history': [[0., 0., 1.], [0., 2.], [3.]]})
+        datatype = TimeSeries(mask_padding=True)
+        datatype.default_transformation_pipeline[-1].max_sequence_length = 3
+        auto = Automater(data_type_dict={'timeseries': ['history']}, datatype_handlers={'timeseries': datatype})
+        auto.fit(observations)
+
+        sequence = BucketedSequence(auto, observations, batch_size=1, shuffle=False)
+        numpy.testing.assert_array_equal([3, 2, 1], sequence.sequence_lengths)
+        batches = [sequence[index][0] for index in range(len(sequence))]
+        self.assertCountEqual([[[0., 0., 1.]], [[0., 2.]], [[3.]]], [batch.tolist() for batch in batches])
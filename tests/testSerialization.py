@@ -0,0 +1,113 @@
+import os
+import shutil
+from collections import Counter, defaultdict
+
+import numpy
+from sklearn.preprocessing import StandardScaler
+
+from keras_pandas import lib
+from keras_pandas.serialization import decode_strings, encode_strings, read_bundle, write_bundle
+from keras_pandas.transformations import CategoricalImputer, EmbeddingVectorizer, LabelEncoder, MeanImputer, \
+    TypeConversionEncoder
+from tests.testbase import TestBase
+
+
+class TestSerialization(TestBase):
+
+    @staticmethod
+    def bundle_path(name):
+        path = os.path.join(lib.get_temp_dir(), name)
+        shutil.rmtree(path, ignore_errors=True)
+        return path
+
+    def test_strings(self):
+        strings = ['b', '', 'café', 'a b', '日本']
+        buffer, offsets = encode_strings(strings)
+        self.assertEqual(numpy.uint8, buffer.dtype)
+        self.assertEqual(len(strings) + 1, len(offsets))
+        self.assertEqual(strings, decode_strings(buffer, offsets))
+        self.assertEqual(list(), decode_strings(*encode_strings(list())))
+
+    def test_round_trip(self):
+        path = self.bundle_path('test_serialization_round_trip')
+        state = {'none': None,
+                 'primitives': [1, 2.5, 'a', True],
+                 'tuple': ('a', 1),
+                 'type': str,
+                 'slice': slice(0, 3),
+                 'small_array': numpy.arange(5, dtype=numpy.float32),
+                 'large_array': numpy.arange(1000, dtype=numpy.int64).reshape(100, 10),
+                 'string_array': numpy.array(['UNK', 'a', 'b']),
+                 'object_array': numpy.array(['a', 'b'], dtype=object),
+                 'set': {'a', 'b'},
+                 'vocabulary': defaultdict(int, {'a': 2, 'b': 3}),
+                 'counter': Counter({'a': 5}),
+                 'dict': {'a': 1.5, 'b': [1]},
+                 'mixed_set': {1, 'a'}}
+        write_bundle(path, state)
+        loaded = read_bundle(path)
+
+        self.assertEqual(set(state.keys()), set(loaded.keys()))
+        for key in ['none', 'primitives', 'tuple', 'type', 'slice', 'set', 'vocabulary', 'counter', 'dict',
+                    'mixed_set']:
+            self.assertEqual(state[key], loaded[key])
+            self.assertEqual(type(state[key]), type(loaded[key]))
+        self.assertEqual(int, loaded['vocabulary'].default_factory)
+
+        for key in ['small_array', 'large_array', 'string_array', 'object_array']:
+            numpy.testing.assert_array_equal(state[key], loaded[key])
+            self.assertEqual(state[key].dtype, loaded[key].dtype)
+
+        # Large arrays should be memory mapped, unless mmap_mode is None
+        self.assertIsInstance(loaded['large_array'], numpy.memmap)
+        self.assertNotIsInstance(read_bundle(path, mmap_mode=None)['large_array'], numpy.memmap)
+
+        # Saving to the same path replaces the bundle, w/o leaving files from the earlier bundle
+        new_state = {'large_array': numpy.ones((200, 3), dtype=numpy.float32)}
+        write_bundle(path, new_state)
+        new_loaded = read_bundle(path)
+        self.assertEqual(['large_array'], list(new_loaded.keys()))
+        numpy.testing.assert_array_equal(new_state['large_array'], new_loaded['large_array'])
+        self.assertEqual(numpy.float32, new_loaded['large_array'].dtype)
+        self.assertCountEqual(['manifest.json', '0.npy'], os.listdir(path))
+
+        # Arrays loaded from the earlier bundle are unchanged
+        numpy.testing.assert_array_equal(state['large_array'], loaded['large_array'])
+
+    def test_transformers(self):
+        path = self.bundle_path('test_serialization_transformers')
+        categorical = numpy.array([['a'], ['b'], [None], ['a']], dtype=object)
+        labels = numpy.array(['a', 'b', 'UNK', 'a'], dtype=object)
+        numerical = numpy.array([[1.], [2.], [numpy.nan], [7.]])
+        text = numpy.array([['the quick brown fox'], ['jumped over the lazy dog'], ['the end']], dtype=object)
+
+        transformers = {'conversion': TypeConversionEncoder(str).fit(categorical),
+                        'imputer': CategoricalImputer(strategy='constant', fill_value='UNK',
+                                                      fill_unknown_labels=True).fit(categorical),
+                        'encoder': LabelEncoder().fit(labels),
+                        'mean_imputer': MeanImputer().fit(numerical),
+                        'scaler': StandardScaler().fit(numpy.nan_to_num(numerical)),
+                        'vectorizer': EmbeddingVectorizer().fit(text)}
+        write_bundle(path, transformers)
+        loaded = read_bundle(path)
+
+        self.assertEqual(str, loaded['conversion'].conversion_type)
+        numpy.testing.assert_array_equal(transformers['imputer'].transform(categorical),
+                                         loaded['imputer'].transform(categorical))
+        numpy.testing.assert_array_equal(transformers['encoder'].transform(['a', 'c']),
+                                         loaded['encoder'].transform(['a', 'c']))
+        numpy.testing.assert_array_equal(transformers['mean_imputer'].transform(numerical),
+                                         loaded['mean_imputer'].transform(numerical))
+        numpy.testing.assert_array_equal(transformers['scaler'].transform(numpy.nan_to_num(numerical)),
+                                         loaded['scaler'].transform(numpy.nan_to_num(numerical)))
+        numpy.testing.assert_array_equal(transformers['vectorizer'].transform(text),
+                                         loaded['vectorizer'].transform(text))
+        self.assertEqual(dict(transformers['vectorizer'].token_index_lookup),
+                         dict(loaded['vectorizer'].token_index_lookup))
+
+        # Nothing should need to be pickled
+        self.assertFalse([file_name for file_name in os.listdir(path) if file_name.endswith('.pkl')])
+
+    def test_missing_bundle(self):
+        with self.assertRaises(ValueError):
+            read_bundle(self.bundle_path('test_serialization_missing'))
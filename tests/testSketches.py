@@ -0,0 +1,58 @@
+from collections import Counter
+
+import numpy
+
+from keras_pandas.sketches import SpaceSaving, TDigest, RunningMoments
+from tests.testbase import TestBase
+
+
+class TestSketches(TestBase):
+
+    def test_space_saving(self):
+        observations = numpy.random.RandomState(0).zipf(1.5, size=50000)
+
+        sketch = SpaceSaving(capacity=100)
+        for chunk in numpy.array_split(observations, 10):
+            sketch.update(Counter(chunk.tolist()))
+        self.assertEqual(100, len(sketch))
+
+        # Heavy hitters should be retained, w/ counts that undercount by at most error_bound_
+        expected = Counter(observations.tolist()).most_common(5)
+        self.assertEqual([item for item, _ in expected], [item for item, _ in sketch.most_common(5)])
+        for (_, expected_count), (_, count) in zip(expected, sketch.most_common(5)):
+            self.assertTrue(expected_count - sketch.error_bound_ <= count <= expected_count)
+
+        self.assertRaises(ValueError, SpaceSaving, 0)
+
+    def test_t_digest(self):
+        observations = numpy.random.RandomState(0).lognormal(size=100000)
+
+        digest = TDigest(compression=100)
+        for chunk in numpy.array_split(observations, 20):
+            digest.update(chunk)
+
+        # Memory is bounded by compression, and quantiles should be close
+        self.assertTrue(len(digest.means_) <= 100)
+        self.assertEqual(observations.shape[0], digest.count_)
+        for q in [0.01, 0.5, 0.9]:
+            expected = numpy.quantile(observations, q)
+            self.assertAlmostEqual(expected, digest.quantile(q), delta=0.05 * expected)
+
+        # Integer values w/ many duplicates, such as sequence lengths, should have a close median
+        lengths = numpy.random.RandomState(0).poisson(12, size=100000)
+        values, counts = numpy.unique(lengths, return_counts=True)
+        digest = TDigest().update(values, weights=counts)
+        self.assertEqual(int(numpy.median(lengths)), int(digest.median()))
+        self.assertTrue(numpy.isnan(TDigest().median()))
+
+    def test_running_moments(self):
+        observations = numpy.random.RandomState(0).normal(5, 3, size=(1000, 2))
+        observations[::7, 0] = numpy.nan
+
+        moments = RunningMoments()
+        for chunk in numpy.array_split(observations, 7):
+            moments.update(chunk)
+
+        numpy.testing.assert_allclose(numpy.nanmean(observations, axis=0), moments.mean_)
+        numpy.testing.assert_allclose(numpy.nanvar(observations, axis=0), moments.variance_)
+        self.assertEqual([1000 - 143, 1000], list(moments.count_))
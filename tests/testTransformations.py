@@ -0,0 +1,311 @@
+import numpy
+import pandas
+from gensim.utils import simple_preprocess
+
+from keras_pandas import lib
+from keras_pandas.transformations import LabelEncoder, CategoricalImputer, EmbeddingVectorizer, tokenize, \
+    HashingEncoder, MeanImputer, SlidingWindowVectorizer, TimeSeriesVectorizer, compact_dtype, \
+    MIN_DOCUMENTS_PER_SHARD, _shard_boundaries
+from tests.testbase import TestBase
+
+
+class TestTransformations(TestBase):
+
+    def test_label_encoder_transform(self):
+        encoder = LabelEncoder()
+        encoder.fit(numpy.array(['banana', 'apple', 'coconut', 'apple']))
+        self.assertCountEqual(['UNK', 'apple', 'banana', 'coconut'], encoder.classes_)
+
+        # Unseen labels should be encoded as UNK
+        transformed = encoder.transform(numpy.array(['coconut', 'durian', 'apple', 'banana', 'eggplant']))
+        expected = numpy.searchsorted(encoder.classes_, ['coconut', 'UNK', 'apple', 'banana', 'UNK'])
+        self.assertEqual(list(expected), list(transformed))
+        self.assertEqual(['coconut', 'UNK', 'apple'], list(encoder.classes_[transformed[:3]]))
+
+    def test_categorical_imputer_transform(self):
+        imputer = CategoricalImputer(strategy='constant', fill_value='UNK', fill_unknown_labels=True)
+        imputer.fit(numpy.array([['apple'], ['banana'], [None]], dtype=object))
+
+        # Null values and unknown labels should both be filled
+        observations = numpy.array([['apple'], [None], ['durian'], ['banana']], dtype=object)
+        transformed = imputer.transform(observations)
+        self.assertEqual(['apple', 'UNK', 'UNK', 'banana'], list(transformed[:, 0]))
+
+        # By default, the input should not be modified
+        self.assertIsNone(observations[1, 0])
+
+        # In place imputation should modify the input
+        imputer.copy = False
+        imputer.transform(observations)
+        self.assertEqual('UNK', observations[2, 0])
+
+    def test_tokenize(self):
+        documents = ['The count of Monte Cristo', '', 'Alice in Wonderland, 2nd edition!', '_private a_b x',
+                     'ÉCOLE d\'été ΟΔΟΣ', 'supercalifragilisticexpialidocious is long', 'tab\tand\x1eseparator']
+        documents += list(map(str, lib.load_titanic()['name']))
+
+        # Tokens should be consistent w/ gensim's simple_preprocess
+        tokens, sequence_lengths = tokenize(documents)
+        self.assertEqual(len(documents), len(sequence_lengths))
+        offsets = numpy.concatenate([[0], numpy.cumsum(sequence_lengths)])
+        for document_index, document in enumerate(documents):
+            document_tokens = list(tokens[offsets[document_index]:offsets[document_index + 1]])
+            self.assertEqual(simple_preprocess(document), document_tokens)
+
+    def test_embedding_vectorizer_transform(self):
+        vectorizer = EmbeddingVectorizer(max_sequence_length=4)
+        vectorizer.fit(numpy.array([['the fat cat'], ['the cat sat on the mat']], dtype=object))
+
+        transformed = vectorizer.transform(numpy.array([['the fat dog'], ['the cat sat on the mat'], ['']],
+                                                       dtype=object))
+        self.assertEqual((3, 4), transformed.shape)
+        self.assertEqual(numpy.int32, transformed.dtype)
+
+        # Unseen tokens are UNK (0), short sequences are padded (1), and long sequences are truncated
+        index = vectorizer.token_index_lookup
+        self.assertEqual([index['the'], index['fat'], 0, 1], list(transformed[0]))
+        self.assertEqual([index['the'], index['cat'], index['sat'], index['on']], list(transformed[1]))
+        self.assertEqual([1, 1, 1, 1], list(transformed[2]))
+        self.assertEqual(list(transformed[0]), vectorizer.process_string('the fat dog'))
+
+    def test_embedding_vectorizer_vocabulary_pruning(self):
+        observations = numpy.array([['the cat sat on the mat'], ['the cat ate'], ['a dog ate the hat']], dtype=object)
+
+        # Tokens are indexed by frequency (ties broken alphabetically), after the UNK and PAD tokens
+        vectorizer = EmbeddingVectorizer(min_count=2).fit(observations)
+        self.assertEqual({'UNK': 0, '__PAD__': 1, 'the': 2, 'ate': 3, 'cat': 4}, dict(vectorizer.token_index_lookup))
+
+        vectorizer = EmbeddingVectorizer(max_sequence_length=3, max_vocab_size=2).fit(observations)
+        self.assertEqual({'UNK': 0, '__PAD__': 1, 'the': 2, 'ate': 3}, dict(vectorizer.token_index_lookup))
+
+        # Pruned tokens are UNK
+        transformed = vectorizer.transform(numpy.array([['the cat ate']], dtype=object))
+        self.assertEqual([2, 0, 3], list(transformed[0]))
+
+        with self.assertRaises(ValueError):
+            EmbeddingVectorizer(min_count=0)
+
+    def test_partial_fit(self):
+        categorical_observations = numpy.array([['banana'], ['apple'], [None], ['banana'], ['coconut']], dtype=object)
+        numerical_observations = numpy.array([[1.], [numpy.nan], [2.], [6.], [numpy.nan]])
+        text_observations = numpy.array([['the fat cat'], ['the cat'], [''], ['a dog'], ['the dog sat']], dtype=object)
+        chunks = [slice(0, 2), slice(2, 3), slice(3, 5)]
+
+        # Partially fitting chunks should match fitting all observations
+        encoder = LabelEncoder()
+        imputer = CategoricalImputer()
+        mean_imputer = MeanImputer()
+        vectorizer = EmbeddingVectorizer()
+        for chunk in chunks:
+            encoder.partial_fit(categorical_observations[chunk][:, 0].astype(str))
+            imputer.partial_fit(categorical_observations[chunk])
+            mean_imputer.partial_fit(numerical_observations[chunk])
+            vectorizer.partial_fit(text_observations[chunk])
+
+        self.assertEqual(list(LabelEncoder().fit(categorical_observations[:, 0].astype(str)).classes_),
+                         list(encoder.classes_))
+        self.assertEqual('banana', imputer.fill_)
+        self.assertEqual({'UNK', 'banana', 'apple', 'coconut'}, imputer.known_values)
+        self.assertEqual([1., 3., 2., 6., 3.], list(mean_imputer.transform(numerical_observations)[:, 0]))
+
+        # The vocabulary is rebuilt from all chunks when finalized
+        self.assertTrue(vectorizer.partial_fit_pending)
+        self.assertIs(vectorizer, vectorizer.finalize_partial_fit())
+        self.assertFalse(vectorizer.partial_fit_pending)
+
+        full_vectorizer = EmbeddingVectorizer().fit(text_observations)
+        self.assertEqual(full_vectorizer.max_index_, vectorizer.max_index_)
+        self.assertEqual(full_vectorizer.max_sequence_length, vectorizer.max_sequence_length)
+        self.assertEqual(dict(full_vectorizer.token_index_lookup), dict(vectorizer.token_index_lookup))
+        self.assertTrue(numpy.array_equal(full_vectorizer.transform(text_observations),
+                                          vectorizer.transform(text_observations)))
+
+    def test_partial_fit_sketches(self):
+        categorical_observations = numpy.array([['banana'], ['apple'], ['banana'], ['coconut'], ['banana'],
+                                                ['apple']], dtype=object)
+        text_observations = numpy.array([['the fat cat'], ['the cat'], ['the dog sat'], ['a dog']], dtype=object)
+
+        # Only the sketch_capacity most frequent levels should be retained
+        encoder = LabelEncoder(sketch_capacity=2)
+        imputer = CategoricalImputer(sketch_capacity=2)
+        vectorizer = EmbeddingVectorizer(sketch_capacity=2)
+        for chunk in [slice(0, 2), slice(2, 4), slice(4, 6)]:
+            encoder.partial_fit(categorical_observations[chunk][:, 0].astype(str))
+            imputer.partial_fit(categorical_observations[chunk])
+            vectorizer.partial_fit(text_observations[chunk])
+
+        self.assertEqual(['UNK', 'apple', 'banana'], list(encoder.classes_))
+        self.assertEqual({'UNK', 'apple', 'banana'}, imputer.known_values)
+        self.assertEqual('banana', imputer.fill_)
+        self.assertEqual(3, vectorizer.max_index_)
+        self.assertEqual({'UNK': 0, '__PAD__': 1, 'the': 2, 'cat': 3}, dict(vectorizer.token_index_lookup))
+        self.assertEqual(2, vectorizer.max_sequence_length)
+
+    def test_label_encoder_stacked(self):
+        # Several columns share one set of classes, and keep their shape
+        observations = numpy.array([['lax', 'sea'], ['sea', 'jfk'], ['jfk', 'lax']], dtype=object)
+        encoder = LabelEncoder().fit(observations)
+        self.assertEqual(['UNK', 'jfk', 'lax', 'sea'], list(encoder.classes_))
+
+        transformed = encoder.transform(numpy.array([['sea', 'lax'], ['ord', 'jfk']], dtype=object))
+        numpy.testing.assert_array_equal([[3, 2], [0, 1]], transformed)
+        numpy.testing.assert_array_equal(encoder.transform(observations), LabelEncoder().fit_transform(observations))
+        numpy.testing.assert_array_equal([['sea', 'lax'], ['UNK', 'jfk']], encoder.inverse_transform(transformed))
+
+        # Single columns are still encoded as a 1d array
+        self.assertEqual((3,), encoder.transform(observations[:, :1]).shape)
+        self.assertEqual((3,), LabelEncoder().fit_transform(observations[:, :1]).shape)
+
+        # Hashed columns are consistent w/ hashing each column separately
+        hashing_encoder = HashingEncoder(num_buckets=16)
+        transformed = hashing_encoder.transform(observations)
+        self.assertEqual((3, 2), transformed.shape)
+        numpy.testing.assert_array_equal(hashing_encoder.transform(observations[:, 1:]), transformed[:, 1])
+
+    def test_hashing_encoder(self):
+        encoder = HashingEncoder(num_buckets=16, offset=1)
+        observations = numpy.array([['apple'], ['banana'], ['apple'], ['durian']], dtype=object)
+
+        # No vocabulary is learned, and encodings are in [offset, offset + num_buckets)
+        transformed = encoder.fit_transform(observations)
+        self.assertEqual((4,), transformed.shape)
+        self.assertEqual(transformed[0], transformed[2])
+        self.assertTrue(numpy.all((transformed >= 1) & (transformed < 17)))
+
+        # Encodings are stable across instances, and across chunks
+        self.assertEqual(list(transformed[2:]), list(HashingEncoder(num_buckets=16, offset=1).transform(
+            observations[2:])))
+
+    def test_embedding_vectorizer_hashing(self):
+        vectorizer = EmbeddingVectorizer(max_sequence_length=4, num_buckets=8)
+        vectorizer.fit(numpy.array([['the fat cat']], dtype=object))
+        self.assertEqual({'UNK': 0, '__PAD__': 1}, dict(vectorizer.token_index_lookup))
+
+        # Unseen tokens are hashed like any other token, and sequences are still padded
+        transformed = vectorizer.transform(numpy.array([['the fat dog'], ['dog']], dtype=object))
+        self.assertEqual(1, transformed[0, 3])
+        self.assertEqual(transformed[0, 2], transformed[1, 0])
+        self.assertTrue(numpy.all((transformed[0, :3] >= 2) & (transformed[0, :3] < 10)))
+
+    def test_shard_boundaries(self):
+        self.assertEqual([(0, 5), (5, 10)], _shard_boundaries(10, 2))
+        self.assertEqual([(0, 3)], _shard_boundaries(3, 4, min_shard_size=2))
+
+        # Small batches should not be sharded
+        self.assertEqual([(0, 100)], _shard_boundaries(100, 8, min_shard_size=MIN_DOCUMENTS_PER_SHARD))
+        self.assertEqual(3, len(_shard_boundaries(3 * MIN_DOCUMENTS_PER_SHARD, 8,
+                                                  min_shard_size=MIN_DOCUMENTS_PER_SHARD)))
+
+    def test_embedding_vectorizer_n_jobs(self):
+        # Repeat names, so that there are enough documents to shard
+        names = numpy.array(list(map(str, lib.load_titanic()['name'])), dtype=object)
+        num_repeats = 2 * MIN_DOCUMENTS_PER_SHARD // len(names) + 1
+        observations = numpy.tile(names, num_repeats).reshape(-1, 1)
+
+        serial_vectorizer = EmbeddingVectorizer().fit(observations)
+        parallel_vectorizer = EmbeddingVectorizer(n_jobs=2).fit(observations)
+
+        # Sharded fitting should find the same tokens, and the same sequence length
+        self.assertCountEqual(serial_vectorizer.token_index_lookup.keys(),
+                              parallel_vectorizer.token_index_lookup.keys())
+        self.assertEqual(serial_vectorizer.max_sequence_length, parallel_vectorizer.max_sequence_length)
+
+        # Sharded transforms should match serial transforms, given the same vocabulary
+        parallel_vectorizer.token_index_lookup = serial_vectorizer.token_index_lookup
+        parallel_vectorizer._token_index = None
+        serial_transformed = serial_vectorizer.transform(observations)
+        parallel_transformed = parallel_vectorizer.transform(observations)
+        self.assertEqual(numpy.int32, parallel_transformed.dtype)
+        self.assertTrue(numpy.array_equal(serial_transformed, parallel_transformed))
+
+    def test_time_series_vectorizer(self):
+        sequences = [[1, 2, 3], numpy.array([4., 5.]), [6, 7, 8, 9], []]
+        observations = numpy.empty((len(sequences), 1), dtype=object)
+        for row, sequence in enumerate(sequences):
+            observations[row, 0] = sequence
+
+        # max_sequence_length is learned as the shortest sequence length
+        self.assertEqual(2, TimeSeriesVectorizer().fit(observations[:3]).max_sequence_length)
+
+        expected = {('pre', 'pre'): [[0, 1, 2, 3], [0, 0, 4, 5], [6, 7, 8, 9], [0, 0, 0, 0]],
+                    ('post', 'post'): [[1, 2, 3, 0], [4, 5, 0, 0], [6, 7, 8, 9], [0, 0, 0, 0]],
+                    ('pre', 'post'): [[0, 1, 2, 3], [0, 0, 4, 5], [6, 7, 8, 9], [0, 0, 0, 0]]}
+        for (padding, truncating), expected_transformed in expected.items():
+            vectorizer = TimeSeriesVectorizer(max_sequence_length=4, padding=padding, truncating=truncating)
+            transformed = vectorizer.fit_transform(observations)
+            self.assertEqual(numpy.float32, transformed.dtype)
+            numpy.testing.assert_array_equal(expected_transformed, transformed)
+
+        # Truncation
+        vectorizer = TimeSeriesVectorizer(max_sequence_length=2, truncating='pre')
+        numpy.testing.assert_array_equal([[2, 3], [4, 5], [8, 9], [0, 0]], vectorizer.fit_transform(observations))
+        vectorizer = TimeSeriesVectorizer(max_sequence_length=2, padding='post', truncating='post')
+        numpy.testing.assert_array_equal([[1, 2], [4, 5], [6, 7], [0, 0]], vectorizer.fit_transform(observations))
+
+        # Ragged layouts and lists of sequences should match
+        vectorizer = TimeSeriesVectorizer(max_sequence_length=3).fit(observations)
+        values = numpy.array([1, 2, 3, 4, 5, 6, 7, 8, 9], dtype=numpy.float32)
+        offsets = numpy.array([0, 3, 5, 9, 9])
+        numpy.testing.assert_array_equal(vectorizer.transform(observations),
+                                         vectorizer.transform_ragged(values, offsets))
+        numpy.testing.assert_array_equal(vectorizer.transform(observations), vectorizer.transform(sequences))
+
+        # Numerical arrays contain one sequence per row
+        numpy.testing.assert_array_equal([[0, 1, 2], [0, 3, 4]], vectorizer.transform(numpy.array([[1, 2], [3, 4]])))
+
+        self.assertRaises(ValueError, TimeSeriesVectorizer(max_sequence_length=2, padding='middle').fit_transform,
+                          observations)
+
+        # Padding w/ a value outside the data's range keeps genuine leading zeros distinguishable
+        vectorizer = TimeSeriesVectorizer(max_sequence_length=4, pad_value=numpy.nan)
+        numpy.testing.assert_array_equal([[numpy.nan, 0, 0, 1], [numpy.nan, numpy.nan, numpy.nan, numpy.nan]],
+                                         vectorizer.fit_transform([[0, 0, 1], []]))
+
+    def test_sliding_window_vectorizer(self):
+        values = numpy.arange(1., 7.).reshape(-1, 1)
+
+        # Windows are ordered oldest to newest, and padded where there is not enough history
+        transformed = SlidingWindowVectorizer(3).fit_transform(values)
+        self.assertEqual(numpy.float32, transformed.dtype)
+        numpy.testing.assert_array_equal([[0, 0, 0], [0, 0, 1], [0, 1, 2], [1, 2, 3], [2, 3, 4], [3, 4, 5]],
+                                         transformed)
+        numpy.testing.assert_array_equal([[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [5, 6]],
+                                         SlidingWindowVectorizer(2, include_current=True).fit_transform(values))
+
+        # Rows in order, w/ one group, should be a view
+        self.assertFalse(transformed.flags.owndata)
+
+        # Grouped and ordered windows should match shifting each group, and be in the original row order
+        random_state = numpy.random.RandomState(0)
+        observations = pandas.DataFrame({'value': random_state.normal(size=100),
+                                         'group': random_state.choice(['a', 'b', 'c'], size=100),
+                                         'order': random_state.permutation(100)})
+        observations.loc[3, 'value'] = numpy.nan
+        vectorizer = SlidingWindowVectorizer(4, grouped=True, ordered=True)
+        transformed = vectorizer.fit_transform(observations[['value', 'group', 'order']].values)
+
+        ordered_observations = observations.fillna(0).sort_values('order')
+        expected = numpy.stack([ordered_observations.groupby('group')['value'].shift(lag).reindex(observations.index)
+                                for lag in [4, 3, 2, 1]], axis=1)
+        numpy.testing.assert_allclose(numpy.nan_to_num(expected), transformed, rtol=1e-6)
+
+        self.assertEqual((0, 4), vectorizer.transform(observations.values[:0]).shape)
+        self.assertRaises(ValueError, SlidingWindowVectorizer(0).fit, values)
+
+    def test_compact_dtype(self):
+        self.assertEqual(numpy.uint8, compact_dtype(bool))
+        self.assertEqual(numpy.float32, compact_dtype(numpy.float64))
+        self.assertEqual(numpy.float32, compact_dtype(numpy.float32))
+
+        # Indices are sized from the largest index, and other integers are unchanged
+        self.assertEqual(numpy.int16, compact_dtype(numpy.int64, max_index=32767))
+        self.assertEqual(numpy.int32, compact_dtype(numpy.int64, max_index=32768))
+        self.assertEqual(numpy.int64, compact_dtype(numpy.int64, max_index=2 ** 40))
+        self.assertEqual(numpy.int64, compact_dtype(numpy.int64))
+
+        # Strings are unchanged
+        self.assertEqual(numpy.dtype(object), compact_dtype(object, max_index=10))
+
+        # Encoders' outputs are sized from their vocabularies
+        encoder = LabelEncoder().fit(numpy.array(['a', 'b', 'c']))
+        self.assertEqual(numpy.int16, compact_dtype(encoder.transform(numpy.array(['a'])).dtype, encoder.max_index_))
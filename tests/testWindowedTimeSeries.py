@@ -0,0 +1,57 @@
+import numpy
+import pandas
+from keras import Model
+from keras.layers import Dense
+
+from keras_pandas import lib
+from keras_pandas.Automater import Automater
+from keras_pandas.data_types.WindowedTimeSeries import WindowedTimeSeries
+from tests.testbase import TestBase
+
+
+class TestWindowedTimeSeries(TestBase):
+
+    def test_init(self):
+        # Create datatype
+        datatype = WindowedTimeSeries(window_length=3)
+
+        # Check for output support (or not)
+        self.assertFalse(datatype.supports_output)
+        self.assertEqual(['close'], datatype.input_columns('close'))
+        self.assertEqual(['close', 'ticker', 'date'],
+                         WindowedTimeSeries(window_length=3, group_by='ticker', order_by='date').input_columns('close'))
+
+    def test_datatype_signature(self):
+        # Create datatype
+        datatype = WindowedTimeSeries(window_length=3)
+
+        # Check valid datatype
+        lib.check_valid_datatype(datatype)
+
+    def test_whole(self):
+        # Create observations, w/ two tickers
+        random_state = numpy.random.RandomState(0)
+        observations = pandas.DataFrame({'close': random_state.normal(size=200),
+                                         'ticker': ['a', 'b'] * 100,
+                                         'date': numpy.repeat(numpy.arange(100), 2),
+                                         'volume': random_state.normal(size=200)})
+
+        data_type_dict = {'windowed': ['close'], 'numerical': ['volume']}
+        datatype_handlers = {'windowed': WindowedTimeSeries(window_length=5, group_by='ticker', order_by='date')}
+        auto = Automater(data_type_dict=data_type_dict, output_var='volume', datatype_handlers=datatype_handlers)
+        X, y = auto.fit_transform(observations)
+
+        # Grouping and ordering columns are not model inputs
+        self.assertEqual(['close'], auto.input_vars)
+        self.assertEqual((200, 5), X[0].shape)
+
+        # Each ticker's first window is padded, and later windows contain the ticker's previous closes
+        numpy.testing.assert_array_equal(numpy.zeros(5), X[0][0])
+        numpy.testing.assert_allclose(observations['close'].values[0:10:2], X[0][10], rtol=1e-6)
+
+        # Create network
+        x = auto.input_nub
+        x = Dense(1)(x)
+        model = Model(auto.input_layers, x)
+        model.compile(optimizer='adam', loss='mse')
+        model.fit(X, y)